@@ -0,0 +1,209 @@
+from fastapi import Request, Response
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from dataclasses import dataclass, field
+from core.compression import available_encodings, compress, is_compressible, negotiate
+from core.serialization import dumps
+from core.resilience import CircuitBreaker
+from core.singleflight import SingleFlight
+from core.metrics import registry, Counter
+from core.timeouts import detached_context
+from urllib.parse import quote, urlencode
+import asyncio
+import time
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+CATALOG_CACHE_TTL = float(os.environ.get('CATALOG_CACHE_TTL', '60'))
+CATALOG_CACHE_SIZE = int(os.environ.get('CATALOG_CACHE_SIZE', '512'))
+# Past the TTL an entry is served while a background refresh runs...
+CATALOG_STALE_TTL = float(os.environ.get('CATALOG_STALE_TTL', '600'))
+# ...and it is kept this long as a fallback for when the database is failing
+CATALOG_FALLBACK_TTL = float(os.environ.get('CATALOG_FALLBACK_TTL', str(24 * 3600)))
+# Property pages are keyed on the listing's updated_at, so this only bounds how stale the related content gets
+PROPERTY_PAGE_CACHE_TTL = float(os.environ.get('PROPERTY_PAGE_CACHE_TTL', '30'))
+# Query params whose filters match case-insensitively
+CASE_INSENSITIVE_PARAMS = frozenset({"type"})
+
+cache_requests_total = registry.register(Counter(
+    "response_cache_requests_total", "Response cache lookups by outcome", ("cache", "result")))
+cache_refresh_failures_total = registry.register(Counter(
+    "response_cache_refresh_failures_total", "Failed background refreshes", ("cache",)))
+
+MEDIA_TYPE = "application/json"
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    created: float
+    variants: Dict[str, bytes] = field(default_factory=dict)
+
+
+def encode_content(content: Any) -> bytes:
+    """Serialize models (or lists of models) exactly like response_model does"""
+    if isinstance(content, list):
+        content = [_to_jsonable(item) for item in content]
+    else:
+        content = _to_jsonable(content)
+    return dumps(content)
+
+
+def _to_jsonable(item: Any) -> Any:
+    if hasattr(item, "model_dump"):
+        return item.model_dump(mode="json", by_alias=True)
+    return item
+
+
+class ResponseCache:
+    """In-process LRU cache of serialized responses with precompressed variants.
+
+    Serves stale entries while revalidating in the background, and falls back
+    to the last good response when the database is failing or the breaker is open.
+    """
+
+    def __init__(self, name: str = "catalog", ttl: float = CATALOG_CACHE_TTL,
+                 max_entries: int = CATALOG_CACHE_SIZE, stale_ttl: float = CATALOG_STALE_TTL,
+                 fallback_ttl: float = CATALOG_FALLBACK_TTL):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self.fallback_ttl = fallback_ttl
+        self.breaker = CircuitBreaker(name)
+        self.flights = SingleFlight()
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[CachedResponse]:
+        """Return an entry no older than max_age (the TTL by default) or None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        age = time.monotonic() - entry.created
+        if age > self.fallback_ttl:
+            del self._entries[key]
+            return None
+        if age > (self.ttl if max_age is None else max_age):
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, body: bytes) -> CachedResponse:
+        """Store raw bytes plus every compressed variant worth keeping"""
+        entry = CachedResponse(body=body, created=time.monotonic())
+        if is_compressible(MEDIA_TYPE, len(body)):
+            for encoding in available_encodings():
+                entry.variants[encoding] = compress(body, encoding)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, prefix: str = "") -> None:
+        """Drop every entry whose key starts with prefix"""
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            del self._entries[key]
+
+    def build_response(self, request: Request, entry: CachedResponse) -> Response:
+        """Pick the precompressed variant the client accepts, if any"""
+        encoding = negotiate(request.headers.get("accept-encoding"))
+        if encoding in entry.variants:
+            return Response(
+                content=entry.variants[encoding],
+                media_type=MEDIA_TYPE,
+                headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"},
+            )
+        return Response(content=entry.body, media_type=MEDIA_TYPE)
+
+    def fallback(self, request: Request, key: str) -> Optional[Response]:
+        """Newest entry for key or any versioned key under it, for when picking the version fails"""
+        now = time.monotonic()
+        entries = [
+            entry for k, entry in self._entries.items()
+            if (k == key or k.startswith(key + ":")) and now - entry.created <= self.fallback_ttl
+        ]
+        if not entries:
+            return None
+        cache_requests_total.inc(self.name, "fallback")
+        logger.warning(f"Serving last good response for {key}")
+        return self.build_response(request, max(entries, key=lambda entry: entry.created))
+
+    async def _produce(self, key: str, producer: Callable[[], Awaitable[Any]]) -> CachedResponse:
+        """Query, serialize and compress once, however many requests are waiting on key"""
+        async def produce() -> CachedResponse:
+            content = await self.breaker.call(producer)
+            return self.set(key, encode_content(content))
+
+        return await self.flights.do(key, produce)
+
+    async def _refresh(self, key: str, producer: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await self._produce(key, producer)
+        except Exception as e:
+            cache_refresh_failures_total.inc(self.name)
+            logger.warning(f"Background refresh of {key} failed: {e}")
+        finally:
+            self._refreshing.pop(key, None)
+
+    def _schedule_refresh(self, key: str, producer: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        # Detached context: the refresh keeps the route's budget but not the request tag
+        self._refreshing[key] = detached_context().run(
+            asyncio.create_task, self._refresh(key, producer)
+        )
+
+    async def respond(
+        self,
+        request: Request,
+        key: str,
+        producer: Callable[[], Awaitable[Any]],
+    ) -> Response:
+        """Serve key from cache, revalidating stale entries and falling back when the database fails"""
+        entry = self.get(key)
+        if entry is not None:
+            cache_requests_total.inc(self.name, "hit")
+            return self.build_response(request, entry)
+
+        entry = self.get(key, max_age=self.stale_ttl)
+        if entry is not None:
+            cache_requests_total.inc(self.name, "stale")
+            self._schedule_refresh(key, producer)
+            return self.build_response(request, entry)
+
+        try:
+            entry = await self._produce(key, producer)
+            cache_requests_total.inc(self.name, "miss")
+        except Exception:
+            entry = self.get(key, max_age=self.fallback_ttl)
+            if entry is None:
+                raise
+            cache_requests_total.inc(self.name, "fallback")
+            logger.warning(f"Serving last good response for {key}")
+        return self.build_response(request, entry)
+
+
+def make_key(*parts: Any, **params: Any) -> str:
+    """Build a normalized cache key from path parts and query params"""
+    # Parts and values are percent-encoded, so a value containing ":", "=" or "&" cannot
+    # impersonate another key
+    items: List[str] = [quote(str(p), safe="") for p in parts]
+    query = urlencode([
+        # The type filter matches case-insensitively, so ?type=Cottage and ?type=cottage share a key;
+        # other values such as search regexes are case-sensitive
+        (k, params[k].lower() if k in CASE_INSENSITIVE_PARAMS and isinstance(params[k], str) else params[k])
+        for k in sorted(params) if params[k] is not None
+    ])
+    if query:
+        items.append(query)
+    return ":".join(items)
+
+
+# Shared cache for public catalog reads (properties, experiences, testimonials)
+catalog_cache = ResponseCache("catalog")
+# Short-lived cache for the property page bundle
+property_page_cache = ResponseCache("property_page", ttl=PROPERTY_PAGE_CACHE_TTL, stale_ttl=4 * PROPERTY_PAGE_CACHE_TTL)
@@ -0,0 +1,216 @@
+from fastapi.responses import JSONResponse
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional
+from core.metrics import registry, Counter, Gauge, Histogram
+import asyncio
+import math
+import time
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_READ, PUBLIC_WRITE, TELEMETRY, ADMIN = "public_read", "public_write", "telemetry", "admin"
+
+# Public submissions that must keep flowing when the catalog is overloaded
+PUBLIC_WRITE_PATHS = ("/api/bookings/inquiry", "/api/contact", "/api/testimonials")
+# Unauthenticated status pings; kept apart so a flood of them, or their 503s, cannot shed bookings
+TELEMETRY_PATHS = ("/api/status",)
+ADMIN_PREFIXES = (
+    "/api/admin",
+    "/api/bookings/inquiries",
+    "/api/contact/messages",
+    "/api/testimonials/all",
+)
+
+
+@dataclass
+class LimitSettings:
+    initial: int
+    min_limit: int
+    max_limit: int
+    queue_size: int
+    queue_timeout: float  # seconds a request may wait for a slot
+    target_latency: float  # seconds; slower responses shrink the limit
+
+
+LIMIT_SETTINGS: Dict[str, LimitSettings] = {
+    PUBLIC_READ: LimitSettings(initial=32, min_limit=4, max_limit=128, queue_size=64,
+                               queue_timeout=1.0, target_latency=0.25),
+    # Writes keep a high floor and a long queue so bookings are never starved
+    PUBLIC_WRITE: LimitSettings(initial=16, min_limit=8, max_limit=64, queue_size=256,
+                                queue_timeout=5.0, target_latency=0.5),
+    # Best effort: a short queue and quick shedding
+    TELEMETRY: LimitSettings(initial=8, min_limit=2, max_limit=32, queue_size=32,
+                             queue_timeout=0.5, target_latency=0.25),
+    ADMIN: LimitSettings(initial=4, min_limit=1, max_limit=8, queue_size=16,
+                         queue_timeout=10.0, target_latency=2.0),
+}
+# Overrides such as CONCURRENCY_LIMITS="public_read=256,admin=2" set the upper limit
+for _item in filter(None, os.environ.get('CONCURRENCY_LIMITS', '').split(',')):
+    _name, _, _limit = _item.partition('=')
+    _settings = LIMIT_SETTINGS[_name.strip()]
+    _settings.max_limit = int(_limit)
+    _settings.initial = min(_settings.initial, _settings.max_limit)
+    _settings.min_limit = min(_settings.min_limit, _settings.max_limit)
+
+# Multiplicative decrease applied when responses exceed the latency target
+BACKOFF_RATIO = 0.9
+
+concurrency_limit = registry.register(Gauge(
+    "concurrency_limit", "Current adaptive concurrency limit", ("route_class",)))
+concurrency_in_flight = registry.register(Gauge(
+    "concurrency_in_flight", "Requests holding a concurrency slot", ("route_class",)))
+concurrency_queued = registry.register(Gauge(
+    "concurrency_queued", "Requests waiting for a concurrency slot", ("route_class",)))
+concurrency_shed_total = registry.register(Counter(
+    "concurrency_shed_total", "Requests rejected with 503", ("route_class", "reason")))
+concurrency_queue_wait_seconds = registry.register(Histogram(
+    "concurrency_queue_wait_seconds", "Time spent waiting for a concurrency slot", ("route_class",)))
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """Limiter class for a request, or None for paths outside the API"""
+    if not path.startswith("/api"):
+        return None
+    if method == "POST" and path.rstrip("/") in PUBLIC_WRITE_PATHS:
+        return PUBLIC_WRITE
+    if method == "POST" and path.rstrip("/") in TELEMETRY_PATHS:
+        return TELEMETRY
+    if path.startswith(ADMIN_PREFIXES) or method not in ("GET", "HEAD"):
+        return ADMIN
+    return PUBLIC_READ
+
+
+class LoadShedError(Exception):
+    def __init__(self, name: str, reason: str, retry_after: int):
+        super().__init__(f"Limiter '{name}' shed request: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit with a bounded FIFO queue of waiting requests"""
+
+    def __init__(self, name: str, settings: LimitSettings):
+        self.name = name
+        self.settings = settings
+        self.limit = float(settings.initial)
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        concurrency_limit.set(name, value=settings.initial)
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.settings.queue_timeout))
+
+    def _shed(self, reason: str) -> LoadShedError:
+        concurrency_shed_total.inc(self.name, reason)
+        return LoadShedError(self.name, reason, self.retry_after())
+
+    async def acquire(self) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            concurrency_in_flight.set(self.name, value=self.in_flight)
+            return
+        if len(self._waiters) >= self.settings.queue_size:
+            raise self._shed("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        concurrency_queued.set(self.name, value=len(self._waiters))
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.settings.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self._release_slot()
+            else:
+                waiter.cancel()
+                self._remove_waiter(waiter)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise self._shed("deadline") from None
+        finally:
+            concurrency_queue_wait_seconds.observe(time.monotonic() - started, self.name)
+
+    def release(self, latency: float, overloaded: bool) -> None:
+        """Return a slot, adjusting the limit from the observed latency"""
+        self._adjust(latency, overloaded)
+        self._release_slot()
+
+    def _adjust(self, latency: float, overloaded: bool) -> None:
+        settings = self.settings
+        now = time.monotonic()
+        if overloaded or latency > settings.target_latency:
+            # At most one decrease per target interval, or a burst of slow
+            # responses would collapse the limit straight to the floor
+            if now - self._last_decrease >= settings.target_latency:
+                self.limit = max(settings.min_limit, self.limit * BACKOFF_RATIO)
+                self._last_decrease = now
+        elif self.in_flight >= int(self.limit) // 2:
+            # Only grow while the limit is actually being used
+            self.limit = min(settings.max_limit, self.limit + 1 / self.limit)
+        concurrency_limit.set(self.name, value=int(self.limit))
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+        concurrency_in_flight.set(self.name, value=self.in_flight)
+        concurrency_queued.set(self.name, value=len(self._waiters))
+
+    def _remove_waiter(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        concurrency_queued.set(self.name, value=len(self._waiters))
+
+
+class ConcurrencyLimitMiddleware:
+    """Separate adaptive limits for public reads, public writes, telemetry and admin calls"""
+
+    def __init__(self, app):
+        self.app = app
+        self.limiters = {name: AdaptiveLimiter(name, settings) for name, settings in LIMIT_SETTINGS.items()}
+
+    async def __call__(self, scope, receive, send):
+        name = route_class(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters[name]
+        try:
+            await limiter.acquire()
+        except LoadShedError as e:
+            logger.warning(f"Shedding {scope['method']} {scope['path']}: {e.reason}")
+            response = JSONResponse(
+                {"detail": "Server busy, please retry shortly"},
+                status_code=503,
+                headers={"Retry-After": str(e.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        status_code = None
+        started = time.monotonic()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # 5xx and 504s mean the backend is struggling, not the client
+            limiter.release(time.monotonic() - started, overloaded=status_code is not None and status_code >= 500)
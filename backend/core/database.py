@@ -0,0 +1,18 @@
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+from pathlib import Path
+from core.metrics import CommandMetricsListener, PoolMetricsListener
+from core.profiler import slow_query_profiler
+import os
+
+# Load environment variables
+ROOT_DIR = Path(__file__).parent.parent
+load_dotenv(ROOT_DIR / '.env')
+
+# Shared MongoDB connection; every route and the app lifecycle use this client
+mongo_url = os.environ['MONGO_URL']
+client = AsyncIOMotorClient(
+    mongo_url,
+    event_listeners=[CommandMetricsListener(), PoolMetricsListener(), slow_query_profiler]
+)
+db = client[os.environ['DB_NAME']]
@@ -0,0 +1,104 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import BulkWriteError
+from typing import Any, Dict, List, Optional
+from core.timeouts import query_options
+from datetime import datetime, timedelta
+import hashlib
+import time
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Explicit Idempotency-Key headers are honoured for this long
+IDEMPOTENCY_TTL = int(os.environ.get('IDEMPOTENCY_TTL', str(24 * 3600)))
+# Identical submissions without a header are merged within this window
+IDEMPOTENCY_WINDOW = int(os.environ.get('IDEMPOTENCY_WINDOW', '600'))
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+def content_keys(scope: str, *parts: Any) -> List[str]:
+    """Content-hash keys for the current and previous time window"""
+    digest = hashlib.sha256(
+        "|".join("" if p is None else str(p).strip().lower() for p in parts).encode("utf-8")
+    ).hexdigest()[:32]
+    bucket = int(time.time() // IDEMPOTENCY_WINDOW)
+    return [f"{scope}:hash:{digest}:{bucket}", f"{scope}:hash:{digest}:{bucket - 1}"]
+
+
+def header_key(scope: str, key: Optional[str]) -> Optional[str]:
+    """Namespace a client-supplied Idempotency-Key"""
+    key = (key or "").strip()
+    return f"{scope}:key:{key[:128]}" if key else None
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    return "".join(ch for ch in phone or "" if ch.isdigit())[-10:]
+
+
+class IdempotencyStore:
+    """Maps idempotency keys to the response of the request that first used them"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db.idempotency_keys
+
+    async def ensure_indexes(self) -> None:
+        # Keys are the _id, so lookups and uniqueness need no extra index
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def replay(self, header_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """The original response for a retried Idempotency-Key, if it is still held"""
+        if not header_key:
+            return None
+        doc = await self.collection.find_one(
+            {"_id": header_key, "expires_at": {"$gt": datetime.utcnow()}}, {"response": 1}, **query_options()
+        )
+        return doc["response"] if doc else None
+
+    async def claim(self, header_key: Optional[str], hash_keys: List[str], response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Reserve the keys for response; returns the original response if any key is already taken.
+
+        Inserting is the lookup: a new submission costs one write, and a retry finds
+        the original through the duplicate key error.
+        """
+        now = datetime.utcnow()
+        docs = [{
+            "_id": key,
+            "response": response,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=IDEMPOTENCY_WINDOW * 2),
+        } for key in hash_keys]
+        if header_key:
+            docs.append({
+                "_id": header_key,
+                "response": response,
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=IDEMPOTENCY_TTL),
+            })
+
+        for _ in range(2):
+            try:
+                await self.collection.insert_many(docs, ordered=False)
+                return None
+            except BulkWriteError as e:
+                if any(err.get("code") != DUPLICATE_KEY_ERROR for err in e.details.get("writeErrors", [])):
+                    raise
+                conflicting = [err["op"]["_id"] for err in e.details["writeErrors"]]
+                # Give back the keys we did get so they point at the winner only
+                inserted = [d["_id"] for d in docs if d["_id"] not in conflicting]
+                if inserted:
+                    await self.collection.delete_many({"_id": {"$in": inserted}, "response._id": response["_id"]})
+                winner = await self.collection.find_one(
+                    {"_id": {"$in": conflicting}, "expires_at": {"$gt": now}}, {"response": 1}
+                )
+                if winner:
+                    return winner["response"]
+                # Only expired keys the TTL monitor has not removed yet; clear them and try once more
+                await self.collection.delete_many({"_id": {"$in": conflicting}, "expires_at": {"$lte": now}})
+        return None
+
+    async def release(self, keys: List[str], response_id: str) -> None:
+        """Forget keys whose request failed after claiming them"""
+        await self.collection.delete_many({"_id": {"$in": [k for k in keys if k]}, "response._id": response_id})
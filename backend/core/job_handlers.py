@@ -0,0 +1,99 @@
+from typing import Any, Dict
+from datetime import datetime
+from core.jobs import JobQueue, register
+from core import notifications
+
+
+def _format_stay(payload: Dict[str, Any]) -> str:
+    check_in = payload.get("check_in_date")
+    check_out = payload.get("check_out_date")
+    if check_in and check_out:
+        return f"{check_in:%d %b %Y} to {check_out:%d %b %Y}"
+    return "dates not specified"
+
+
+@register("inquiry.created")
+async def inquiry_created(payload: Dict[str, Any], queue: JobQueue) -> None:
+    """Fan out side effects of a new booking inquiry as independent jobs"""
+    key = f"inquiry:{payload['inquiry_id']}"
+    await queue.enqueue("inquiry.notify_owner", payload, idempotency_key=f"{key}:notify_owner")
+    await queue.enqueue("inquiry.confirm_guest", payload, idempotency_key=f"{key}:confirm_guest")
+    await queue.enqueue(
+        "analytics.record",
+        {"event": "inquiry", "property_id": payload.get("property_id")},
+        idempotency_key=f"{key}:analytics",
+    )
+
+
+@register("inquiry.notify_owner")
+async def inquiry_notify_owner(payload: Dict[str, Any], queue: JobQueue) -> None:
+    property_title = payload.get("property_title") or "General inquiry"
+    await notifications.send_email(
+        notifications.OWNER_EMAIL,
+        f"New booking inquiry: {property_title}",
+        f"Name: {payload['name']}\n"
+        f"Phone: {payload['phone']}\n"
+        f"Email: {payload.get('email') or '-'}\n"
+        f"Guests: {payload['guests']}\n"
+        f"Stay: {_format_stay(payload)}\n\n"
+        f"{payload.get('message') or ''}",
+    )
+    await notifications.send_sms(
+        notifications.OWNER_PHONE,
+        f"New inquiry from {payload['name']} ({payload['phone']}) for {property_title}",
+    )
+
+
+@register("inquiry.confirm_guest")
+async def inquiry_confirm_guest(payload: Dict[str, Any], queue: JobQueue) -> None:
+    property_title = payload.get("property_title") or "your stay in Vattavada"
+    text = (
+        f"Hi {payload['name']}, we received your inquiry for {property_title} "
+        f"({_format_stay(payload)}). Our team will contact you shortly."
+    )
+    if payload.get("email"):
+        await notifications.send_email(payload["email"], "We received your booking inquiry", text)
+    await notifications.send_sms(payload["phone"], text)
+
+
+@register("contact.created")
+async def contact_created(payload: Dict[str, Any], queue: JobQueue) -> None:
+    """Fan out side effects of a new contact message as independent jobs"""
+    key = f"contact:{payload['contact_id']}"
+    await queue.enqueue("contact.notify_owner", payload, idempotency_key=f"{key}:notify_owner")
+    await queue.enqueue("contact.acknowledge", payload, idempotency_key=f"{key}:acknowledge")
+    await queue.enqueue("analytics.record", {"event": "contact"}, idempotency_key=f"{key}:analytics")
+
+
+@register("contact.notify_owner")
+async def contact_notify_owner(payload: Dict[str, Any], queue: JobQueue) -> None:
+    await notifications.send_email(
+        notifications.OWNER_EMAIL,
+        f"Contact form: {payload['subject']}",
+        f"From: {payload['name']} <{payload['email']}>\n"
+        f"Phone: {payload.get('phone') or '-'}\n\n"
+        f"{payload['message']}",
+    )
+
+
+@register("contact.acknowledge")
+async def contact_acknowledge(payload: Dict[str, Any], queue: JobQueue) -> None:
+    await notifications.send_email(
+        payload["email"],
+        f"Re: {payload['subject']}",
+        f"Hi {payload['name']}, thanks for reaching out. We will get back to you soon.",
+    )
+
+
+@register("analytics.record")
+async def analytics_record(payload: Dict[str, Any], queue: JobQueue) -> None:
+    """Bump daily event counters, optionally per property"""
+    day = datetime.utcnow().strftime("%Y-%m-%d")
+    inc = {f"events.{payload['event']}": 1}
+    if payload.get("property_id"):
+        inc[f"properties.{payload['property_id']}.{payload['event']}"] = 1
+    await queue.db.analytics_daily.update_one(
+        {"_id": day},
+        {"$inc": inc, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True,
+    )
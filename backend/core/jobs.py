@@ -0,0 +1,284 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from datetime import datetime, timedelta
+import asyncio
+import random
+import socket
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '4'))
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', '1.0'))
+JOB_TIMEOUT = float(os.environ.get('JOB_TIMEOUT', '30'))
+JOB_LOCK_TIMEOUT = float(os.environ.get('JOB_LOCK_TIMEOUT', '300'))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', '5'))
+JOB_BACKOFF_BASE = float(os.environ.get('JOB_BACKOFF_BASE', '5'))
+JOB_BACKOFF_MAX = float(os.environ.get('JOB_BACKOFF_MAX', '3600'))
+# Finished jobs are only kept for inspection
+JOB_RETENTION = int(os.environ.get('JOB_RETENTION', str(7 * 24 * 3600)))
+OUTBOX_BATCH_SIZE = 100
+
+# Collections whose documents can carry jobs to enqueue (see outbox_job)
+OUTBOX_COLLECTIONS = ("booking_inquiries", "contacts")
+
+# pending -> running -> done, or back to pending with backoff, or dead after max_attempts
+JOB_STATUSES = ["pending", "running", "done", "dead"]
+
+Handler = Callable[[Dict[str, Any], "JobQueue"], Awaitable[None]]
+
+# Job type -> coroutine handling its payload
+HANDLERS: Dict[str, Handler] = {}
+
+
+def register(job_type: str):
+    """Decorator registering a handler for a job type"""
+    def decorator(func: Handler) -> Handler:
+        HANDLERS[job_type] = func
+        return func
+    return decorator
+
+
+def outbox_job(job_type: str, payload: Dict[str, Any], idempotency_key: str) -> Dict[str, Any]:
+    """Fields that carry a job inside the document that triggers it, written by the same insert"""
+    return {
+        "outbox": [{"type": job_type, "payload": payload, "idempotency_key": idempotency_key}],
+        "outbox_at": datetime.utcnow(),
+    }
+
+
+async def ensure_outbox_index(collection) -> None:
+    """Index only documents with jobs still waiting to be relayed"""
+    await collection.create_index(
+        "outbox_at", name="outbox", partialFilterExpression={"outbox_at": {"$exists": True}}
+    )
+
+
+def backoff_delay(attempts: int) -> float:
+    """Exponential backoff with full jitter"""
+    delay = min(JOB_BACKOFF_MAX, JOB_BACKOFF_BASE * (2 ** max(attempts - 1, 0)))
+    return random.uniform(delay / 2, delay)
+
+
+class JobQueue:
+    """Persistent job queue stored in the `jobs` collection"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db.jobs
+
+    async def ensure_indexes(self) -> None:
+        """Create the indexes claim and idempotency rely on"""
+        await self.collection.create_index([("status", ASCENDING), ("run_at", ASCENDING)])
+        await self.collection.create_index([("status", ASCENDING), ("locked_at", ASCENDING)])
+        await self.collection.create_index(
+            "idempotency_key",
+            unique=True,
+            partialFilterExpression={"idempotency_key": {"$type": "string"}},
+        )
+        await self.collection.create_index("completed_at", expireAfterSeconds=JOB_RETENTION, name="completed_ttl")
+
+    async def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+        delay: float = 0,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+    ) -> str:
+        """Insert a job; an existing job with the same idempotency key is reused"""
+        now = datetime.utcnow()
+        job = {
+            "type": job_type,
+            "payload": payload,
+            "status": "pending",
+            "attempts": 0,
+            "max_attempts": max_attempts,
+            "run_at": now + timedelta(seconds=delay),
+            "locked_by": None,
+            "locked_at": None,
+            "last_error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        if idempotency_key:
+            job["idempotency_key"] = idempotency_key
+        try:
+            result = await self.collection.insert_one(job)
+            return str(result.inserted_id)
+        except DuplicateKeyError:
+            existing = await self.collection.find_one(
+                {"idempotency_key": idempotency_key}, {"_id": 1}
+            )
+            return str(existing["_id"])
+
+    async def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Atomically take the oldest due job"""
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            {"status": "pending", "run_at": {"$lte": now}},
+            {
+                "$set": {"status": "running", "locked_by": worker_id, "locked_at": now, "updated_at": now},
+                "$inc": {"attempts": 1},
+            },
+            sort=[("run_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def complete(self, job: Dict[str, Any]) -> None:
+        await self.collection.update_one(
+            {"_id": job["_id"], "locked_by": job["locked_by"]},
+            {"$set": {"status": "done", "locked_by": None, "completed_at": datetime.utcnow(), "updated_at": datetime.utcnow()}},
+        )
+
+    async def fail(self, job: Dict[str, Any], error: str) -> None:
+        """Schedule a retry with backoff, or dead-letter the job"""
+        now = datetime.utcnow()
+        update = {"locked_by": None, "last_error": error, "updated_at": now}
+        if job["attempts"] >= job["max_attempts"]:
+            update["status"] = "dead"
+            logger.error(f"Job {job['_id']} ({job['type']}) dead-lettered after {job['attempts']} attempts: {error}")
+        else:
+            update["status"] = "pending"
+            update["run_at"] = now + timedelta(seconds=backoff_delay(job["attempts"]))
+        await self.collection.update_one(
+            {"_id": job["_id"], "locked_by": job["locked_by"]},
+            {"$set": update},
+        )
+
+    async def relay_outbox(self, batch_size: int = OUTBOX_BATCH_SIZE) -> int:
+        """Enqueue jobs waiting in OUTBOX_COLLECTIONS documents, then clear them from the source"""
+        relayed = 0
+        for name in OUTBOX_COLLECTIONS:
+            source = self.db[name]
+            cursor = source.find(
+                {"outbox_at": {"$exists": True}}, {"outbox": 1, "outbox_at": 1}
+            ).sort("outbox_at", ASCENDING).limit(batch_size)
+            async for doc in cursor:
+                # Idempotency keys make this safe when several relays pick up the same document
+                for job in doc.get("outbox", []):
+                    await self.enqueue(job["type"], job["payload"], idempotency_key=job["idempotency_key"])
+                await source.update_one(
+                    {"_id": doc["_id"], "outbox_at": doc["outbox_at"]},
+                    {"$unset": {"outbox": "", "outbox_at": ""}},
+                )
+                relayed += 1
+        return relayed
+
+    async def requeue_stale(self, lock_timeout: float = JOB_LOCK_TIMEOUT) -> int:
+        """Return jobs held by crashed workers to the queue, or dead-letter them when out of attempts"""
+        now = datetime.utcnow()
+        stale = {"status": "running", "locked_at": {"$lt": now - timedelta(seconds=lock_timeout)}}
+        # A job that crashes or hangs its worker never reaches fail(), so its attempts are checked here
+        dead = await self.collection.update_many(
+            {**stale, "$expr": {"$gte": ["$attempts", "$max_attempts"]}},
+            {"$set": {"status": "dead", "locked_by": None, "last_error": "worker lock expired", "updated_at": now}},
+        )
+        if dead.modified_count:
+            logger.error(f"Dead-lettered {dead.modified_count} jobs whose workers held them until the lock expired")
+        result = await self.collection.update_many(
+            stale,
+            {"$set": {"status": "pending", "locked_by": None, "run_at": now, "updated_at": now}},
+        )
+        return result.modified_count
+
+    async def retry_dead(self, job_type: Optional[str] = None) -> int:
+        """Put dead-lettered jobs back in the queue"""
+        query = {"status": "dead"}
+        if job_type:
+            query["type"] = job_type
+        result = await self.collection.update_many(
+            query,
+            {"$set": {"status": "pending", "attempts": 0, "run_at": datetime.utcnow()}},
+        )
+        return result.modified_count
+
+
+class JobWorkerPool:
+    """Runs registered handlers for queued jobs on a pool of asyncio tasks"""
+
+    def __init__(self, queue: JobQueue, concurrency: int = JOB_WORKERS,
+                 poll_interval: float = JOB_POLL_INTERVAL, timeout: float = JOB_TIMEOUT):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+
+    async def start(self) -> None:
+        await self.queue.ensure_indexes()
+        await self.queue.requeue_stale()
+        self._stopping.clear()
+        self._tasks = [
+            asyncio.create_task(self._run(f"{self.worker_prefix}:{i}"))
+            for i in range(self.concurrency)
+        ]
+        self._tasks.append(asyncio.create_task(self._reaper()))
+        self._tasks.append(asyncio.create_task(self._relay()))
+        logger.info(f"Started {self.concurrency} job workers")
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _reaper(self) -> None:
+        while not self._stopping.is_set():
+            await self._sleep(JOB_LOCK_TIMEOUT / 2)
+            try:
+                requeued = await self.queue.requeue_stale()
+                if requeued:
+                    logger.warning(f"Requeued {requeued} stale jobs")
+            except Exception as e:
+                logger.error(f"Error requeueing stale jobs: {e}")
+
+    async def _relay(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                relayed = await self.queue.relay_outbox()
+            except Exception as e:
+                logger.error(f"Error relaying outbox jobs: {e}")
+                relayed = 0
+            if relayed < OUTBOX_BATCH_SIZE:
+                await self._sleep(self.poll_interval)
+
+    async def _run(self, worker_id: str) -> None:
+        while not self._stopping.is_set():
+            try:
+                job = await self.queue.claim(worker_id)
+            except Exception as e:
+                logger.error(f"Error claiming job: {e}")
+                await self._sleep(self.poll_interval)
+                continue
+
+            if job is None:
+                await self._sleep(self.poll_interval)
+                continue
+
+            await self.run_job(job)
+
+    async def run_job(self, job: Dict[str, Any]) -> None:
+        handler = HANDLERS.get(job["type"])
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job type {job['type']}")
+            await asyncio.wait_for(handler(job["payload"], self.queue), timeout=self.timeout)
+            await self.queue.complete(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Job {job['_id']} ({job['type']}) attempt {job['attempts']} failed: {e}")
+            await self.queue.fail(job, str(e) or type(e).__name__)
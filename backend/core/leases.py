@@ -0,0 +1,38 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+from datetime import datetime, timedelta
+import socket
+import uuid
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Lease:
+    """A named lease held by one process at a time, so periodic work shared by every worker runs once.
+
+    The holder renews it on each pass; if the holder dies, another process takes over once it expires.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, name: str, duration: float):
+        self.collection = db.leases
+        self.name = name
+        self.duration = duration
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    async def acquire(self) -> bool:
+        """Take or renew the lease; False while another process holds it"""
+        now = datetime.utcnow()
+        try:
+            await self.collection.find_one_and_update(
+                {"_id": self.name, "$or": [{"owner": self.owner}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"owner": self.owner, "expires_at": now + timedelta(seconds=self.duration)}},
+                upsert=True
+            )
+            return True
+        except DuplicateKeyError:
+            return False
+
+    async def release(self) -> None:
+        await self.collection.delete_one({"_id": self.name, "owner": self.owner})
@@ -0,0 +1,215 @@
+from concurrent.futures import ProcessPoolExecutor
+from pydantic import BaseModel
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from pathlib import Path
+import io
+import os
+import logging
+
+try:
+    from PIL import Image, features
+except ImportError:  # Pillow is only needed where uploads are processed
+    Image = None
+    features = None
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).parent.parent
+
+MEDIA_BACKEND = os.environ.get('MEDIA_BACKEND', 'local')  # local, s3
+MEDIA_ROOT = Path(os.environ.get('MEDIA_ROOT', ROOT_DIR / 'media'))
+MEDIA_BASE_URL = os.environ.get('MEDIA_BASE_URL', '/media').rstrip('/')
+MEDIA_BUCKET = os.environ.get('MEDIA_BUCKET', '')
+MEDIA_S3_ENDPOINT = os.environ.get('MEDIA_S3_ENDPOINT') or None
+MEDIA_WORKERS = int(os.environ.get('MEDIA_WORKERS', '2'))
+
+# Widths generated for every image; the smallest one is used as the card thumbnail
+VARIANT_WIDTHS = (320, 640, 1024, 1600)
+THUMBNAIL_WIDTH = VARIANT_WIDTHS[0]
+DEFAULT_SIZES = "(max-width: 640px) 100vw, (max-width: 1024px) 50vw, 33vw"
+
+UNSPLASH_HOST = "images.unsplash.com"
+
+
+class ResponsiveImage(BaseModel):
+    src: str
+    thumbnail: str
+    srcset: Dict[str, str] = {}  # format -> srcset attribute value
+    sizes: str = DEFAULT_SIZES
+
+
+def variant_formats() -> Tuple[str, ...]:
+    """Output formats this process can encode, preferred first"""
+    if Image is None:
+        return ()
+    formats = []
+    if features.check("avif"):
+        formats.append("avif")
+    if features.check("webp"):
+        formats.append("webp")
+    return tuple(formats)
+
+
+def variant_key(asset_id: str, width: int, fmt: str) -> str:
+    return f"{asset_id}/{width}.{fmt}"
+
+
+def render_variants(data: bytes, widths: Tuple[int, ...], formats: Tuple[str, ...]) -> List[Tuple[int, str, bytes]]:
+    """Resize and re-encode an image; runs inside the process pool"""
+    source = Image.open(io.BytesIO(data))
+    source.load()
+    if source.mode not in ("RGB", "RGBA"):
+        source = source.convert("RGB")
+
+    variants = []
+    for width in widths:
+        if source.width > width:
+            height = round(source.height * width / source.width)
+            resized = source.resize((width, height), Image.LANCZOS)
+        else:
+            resized = source
+        for fmt in formats:
+            buffer = io.BytesIO()
+            resized.save(buffer, format=fmt.upper(), quality=75)
+            variants.append((width, fmt, buffer.getvalue()))
+    return variants
+
+
+class LocalMediaStorage:
+    """Stores media files under MEDIA_ROOT, served by the app at MEDIA_BASE_URL"""
+
+    def __init__(self, root: Path = MEDIA_ROOT, base_url: str = MEDIA_BASE_URL):
+        self.root = Path(root)
+        self.base_url = base_url
+
+    def save(self, key: str, data: bytes, content_type: str) -> str:
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        return self.url_for(key)
+
+    def url_for(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+
+class S3MediaStorage:
+    """Stores media files in an S3-compatible bucket"""
+
+    def __init__(self, bucket: str = MEDIA_BUCKET, base_url: str = MEDIA_BASE_URL,
+                 endpoint_url: Optional[str] = MEDIA_S3_ENDPOINT):
+        import boto3
+
+        self.bucket = bucket
+        self.base_url = base_url
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    def save(self, key: str, data: bytes, content_type: str) -> str:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            ContentType=content_type,
+            CacheControl="public, max-age=31536000, immutable",
+        )
+        return self.url_for(key)
+
+    def url_for(self, key: str) -> str:
+        return f"{self.base_url}/{key}"
+
+
+_storage = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+# asset_id -> (width, format, url) of the variants recorded as stored, loaded from the media collection
+_variants: Dict[str, List[Tuple[int, str, str]]] = {}
+
+
+def record_variants(asset_id: str, variants: List[Dict]) -> None:
+    """Make stored variants available to build_image_set"""
+    _variants[asset_id] = sorted((v["width"], v["format"], v["url"]) for v in variants)
+
+
+def get_storage():
+    global _storage
+    if _storage is None:
+        _storage = S3MediaStorage() if MEDIA_BACKEND == "s3" else LocalMediaStorage()
+    return _storage
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=MEDIA_WORKERS)
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+def _dimension(value: Optional[str]) -> int:
+    """A w/h query value in pixels, or 0 for anything else such as h=auto"""
+    return int(value) if value and value.isdigit() else 0
+
+
+def _unsplash_url(url: str, width: int, fmt: Optional[str] = None) -> str:
+    parts = urlsplit(url)
+    params = dict(parse_qsl(parts.query))
+    original_w = _dimension(params.get("w"))
+    original_h = _dimension(params.get("h"))
+    params["w"] = str(width)
+    if original_w and original_h:
+        params["h"] = str(round(original_h * width / original_w))
+    params.setdefault("fit", "crop")
+    if fmt:
+        params["fm"] = fmt
+    params["q"] = "75"
+    return urlunsplit(parts._replace(query=urlencode(params)))
+
+
+def build_image_set(url: Optional[str]) -> Optional[ResponsiveImage]:
+    """Derive thumbnail and srcset metadata for an image URL without any I/O"""
+    if not url:
+        return None
+    try:
+        return _build_image_set(url)
+    except Exception as e:
+        # Runs while serializing every listing; a malformed URL must not fail the response
+        logger.warning(f"Could not build image set for {url}: {e}")
+        return ResponsiveImage(src=url, thumbnail=url)
+
+
+def _build_image_set(url: str) -> ResponsiveImage:
+    if urlsplit(url).netloc == UNSPLASH_HOST:
+        return ResponsiveImage(
+            src=url,
+            thumbnail=_unsplash_url(url, THUMBNAIL_WIDTH, "webp"),
+            srcset={
+                fmt: ", ".join(f"{_unsplash_url(url, w, fmt)} {w}w" for w in VARIANT_WIDTHS)
+                for fmt in ("avif", "webp")
+            },
+        )
+
+    if url.startswith(MEDIA_BASE_URL + "/"):
+        # Uploaded assets live at <base>/<asset_id>/original.<ext>
+        asset_id = url[len(MEDIA_BASE_URL) + 1:].split("/", 1)[0]
+        variants = _variants.get(asset_id)
+        if not variants:
+            # Still processing, failed, or not loaded yet: only the original is known to exist
+            return ResponsiveImage(src=url, thumbnail=url)
+        srcset: Dict[str, List[str]] = {}
+        for width, fmt, variant_url in variants:
+            srcset.setdefault(fmt, []).append(f"{variant_url} {width}w")
+        # webp decodes almost everywhere, so it is the thumbnail when present
+        thumbnail_format = "webp" if "webp" in srcset else variants[0][1]
+        thumbnail = next(u for w, f, u in variants if f == thumbnail_format)
+        return ResponsiveImage(
+            src=url,
+            thumbnail=thumbnail,
+            srcset={fmt: ", ".join(entries) for fmt, entries in srcset.items()},
+        )
+
+    return ResponsiveImage(src=url, thumbnail=url)
@@ -0,0 +1,279 @@
+from pymongo import monitoring
+from typing import Dict, List, Tuple
+import bisect
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    """Label value escaping required by the Prometheus text format"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        # Driver threads add label sets while /metrics renders; format a copy taken under the lock
+        with self._lock:
+            values_copy = list(self._values.items())
+        for values, total in sorted(values_copy):
+            lines.append(f"{self.name}{_format_labels(self.labels, values)} {total}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = buckets
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        with self._lock:
+            values_copy = [(values, list(series)) for values, series in self._values.items()]
+        for values, series in sorted(values_copy):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, values)} {series[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, values)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests handled", ("method", "route", "status")))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled", ("method",)))
+
+mongodb_commands_total = registry.register(Counter(
+    "mongodb_commands_total", "MongoDB commands executed", ("collection", "command", "status")))
+mongodb_command_duration_seconds = registry.register(Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency", ("collection", "command")))
+mongodb_documents_returned_total = registry.register(Counter(
+    "mongodb_documents_returned_total", "Documents returned by MongoDB cursors", ("collection", "command")))
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route request counts, latency and in-flight requests"""
+
+    def __init__(self, app):
+        self.app = app
+        self._route_names: Dict[object, str] = {}
+
+    def _route_name(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        name = self._route_names.get(endpoint)
+        if name is None:
+            name = self._route_names[endpoint] = self._lookup_route(scope["app"], endpoint)
+        return name
+
+    @staticmethod
+    def _lookup_route(app, endpoint) -> str:
+        for route in getattr(app, "routes", []):
+            if getattr(route, "endpoint", None) is endpoint or getattr(route, "app", None) is endpoint:
+                return route.path
+        return getattr(endpoint, "__name__", "unknown")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        http_requests_in_flight.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = self._route_name(scope)
+            http_requests_in_flight.dec(method)
+            http_request_duration_seconds.observe(time.perf_counter() - start, method, route)
+            http_requests_total.inc(method, route, status)
+
+
+def _collection_name(event: monitoring.CommandStartedEvent) -> str:
+    target = event.command.get(event.command_name)
+    if isinstance(target, str):
+        return target
+    # getMore carries the cursor id; the collection is a separate field
+    return event.command.get("collection", "-")
+
+
+def _documents_returned(reply) -> int:
+    cursor = reply.get("cursor") if isinstance(reply, dict) else None
+    if cursor:
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+    return 0
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Records per-collection, per-command durations and documents returned"""
+
+    def __init__(self):
+        self._pending: Dict[Tuple[object, int], str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self._pending[(event.connection_id, event.request_id)] = _collection_name(event)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        collection = self._pending.pop((event.connection_id, event.request_id), "-")
+        command = event.command_name
+        mongodb_commands_total.inc(collection, command, "ok")
+        mongodb_command_duration_seconds.observe(event.duration_micros / 1e6, collection, command)
+        returned = _documents_returned(event.reply)
+        if returned:
+            mongodb_documents_returned_total.inc(collection, command, amount=returned)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        collection = self._pending.pop((event.connection_id, event.request_id), "-")
+        command = event.command_name
+        mongodb_commands_total.inc(collection, command, "error")
+        mongodb_command_duration_seconds.observe(event.duration_micros / 1e6, collection, command)
+
+
+mongodb_pool_connections = registry.register(Gauge(
+    "mongodb_pool_connections", "Driver pool connections by state", ("address", "state")))
+mongodb_pool_max_size = registry.register(Gauge(
+    "mongodb_pool_max_size", "Configured maxPoolSize", ("address",)))
+mongodb_pool_checkout_failures_total = registry.register(Counter(
+    "mongodb_pool_checkout_failures_total", "Connection check-outs that failed", ("address", "reason")))
+
+
+def _address(event) -> str:
+    host, port = event.address
+    return f"{host}:{port}"
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Tracks open, in-use and waiting connections for each server pool"""
+
+    def pool_created(self, event) -> None:
+        mongodb_pool_max_size.set(_address(event), value=event.options.get("maxPoolSize", 100))
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_created(self, event) -> None:
+        mongodb_pool_connections.inc(_address(event), "open")
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        mongodb_pool_connections.dec(_address(event), "open")
+
+    def connection_check_out_started(self, event) -> None:
+        mongodb_pool_connections.inc(_address(event), "waiting")
+
+    def connection_check_out_failed(self, event) -> None:
+        mongodb_pool_connections.dec(_address(event), "waiting")
+        mongodb_pool_checkout_failures_total.inc(_address(event), str(event.reason))
+
+    def connection_checked_out(self, event) -> None:
+        address = _address(event)
+        mongodb_pool_connections.dec(address, "waiting")
+        mongodb_pool_connections.inc(address, "in_use")
+
+    def connection_checked_in(self, event) -> None:
+        mongodb_pool_connections.dec(_address(event), "in_use")
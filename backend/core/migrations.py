@@ -0,0 +1,214 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+from pymongo.write_concern import WriteConcern
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import importlib
+import re
+import time
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).parent.parent / "migrations"
+MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+# A running migration whose checkpoint is older than this is assumed abandoned
+STALE_AFTER = timedelta(minutes=5)
+
+
+@dataclass
+class Backfill:
+    """Updates every document in collection matching filter, one _id-ordered batch at a time"""
+    collection: str
+    filter: Dict[str, Any]
+    # Returns the update for a document, or None to leave it alone
+    update: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+    projection: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class Migration:
+    name: str
+    description: str
+    steps: List[Backfill] = field(default_factory=list)
+    # Index changes and other one-off work, run once every step has finished
+    after: Optional[Callable[[AsyncIOMotorDatabase], Awaitable[None]]] = None
+    version: int = 0
+
+
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """Numbered migration modules, in version order"""
+    migrations = []
+    for path in sorted(directory.glob("*.py")):
+        match = MIGRATION_FILE.match(path.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"migrations.{path.stem}")
+        migration = module.migration
+        migration.version = int(match.group(1))
+        migrations.append(migration)
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"Duplicate migration versions in {directory}")
+    return migrations
+
+
+class MigrationLocked(Exception):
+    pass
+
+
+class MigrationRunner:
+    """Applies migrations in batches with checkpoints, so interrupted runs resume"""
+
+    def __init__(self, db: AsyncIOMotorDatabase, batch_size: int = 500, pause: float = 0.1,
+                 duty_cycle: float = 0.5, dry_run: bool = False, write_concern: Optional[WriteConcern] = None,
+                 report: Callable[[str], None] = print):
+        self.db = db
+        self.state = db.migrations
+        self.batch_size = batch_size
+        self.pause = pause
+        # Fraction of wall time spent writing; slow batches earn longer pauses
+        self.duty_cycle = duty_cycle
+        self.dry_run = dry_run
+        self.write_concern = write_concern
+        self.report = report
+        self.owner = uuid.uuid4().hex
+
+    async def status(self, migrations: List[Migration]) -> List[Dict[str, Any]]:
+        states = {doc["_id"]: doc async for doc in self.state.find({})}
+        rows = []
+        for migration in migrations:
+            state = states.get(migration.version, {})
+            rows.append({
+                "version": migration.version,
+                "name": migration.name,
+                "status": state.get("status", PENDING),
+                "step": state.get("step", 0),
+                "processed": state.get("processed", 0),
+                "modified": state.get("modified", 0),
+                "finished_at": state.get("finished_at"),
+            })
+        return rows
+
+    async def run(self, migrations: List[Migration], target: Optional[int] = None) -> int:
+        """Apply pending migrations up to target; returns how many were applied"""
+        applied = 0
+        for migration in migrations:
+            if target is not None and migration.version > target:
+                break
+            state = await self.state.find_one({"_id": migration.version})
+            if state and state.get("status") == DONE:
+                continue
+            if self.dry_run:
+                await self._preview(migration)
+            else:
+                await self._apply(migration)
+            applied += 1
+        return applied
+
+    async def _claim(self, migration: Migration) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        try:
+            return await self.state.find_one_and_update(
+                {
+                    "_id": migration.version,
+                    "$or": [{"status": {"$ne": RUNNING}}, {"updated_at": {"$lt": now - STALE_AFTER}}],
+                },
+                {
+                    "$set": {"name": migration.name, "status": RUNNING, "owner": self.owner, "updated_at": now},
+                    "$setOnInsert": {"step": 0, "last_id": None, "processed": 0, "modified": 0, "started_at": now},
+                },
+                upsert=True,
+                return_document=True
+            )
+        except DuplicateKeyError:
+            raise MigrationLocked(f"Migration {migration.version:04d} is being run by another process")
+
+    async def _checkpoint(self, migration: Migration, **fields) -> None:
+        await self.state.update_one(
+            {"_id": migration.version, "owner": self.owner},
+            {"$set": {**fields, "updated_at": datetime.utcnow()}}
+        )
+
+    async def _apply(self, migration: Migration) -> None:
+        state = await self._claim(migration)
+        if state["step"] or state.get("last_id") is not None:
+            self.report(f"↻ {migration.version:04d}_{migration.name}: resuming at step {state['step'] + 1}, "
+                        f"{state['processed']} documents done")
+        else:
+            self.report(f"▶ {migration.version:04d}_{migration.name}: {migration.description}")
+        try:
+            for index in range(state["step"], len(migration.steps)):
+                last_id = state["last_id"] if index == state["step"] else None
+                await self._run_step(migration, index, last_id, state)
+                state["processed"] = state["modified"] = 0
+                await self._checkpoint(migration, step=index + 1, last_id=None, processed=0, modified=0)
+            if migration.after:
+                await migration.after(self.db)
+            await self._checkpoint(migration, status=DONE, finished_at=datetime.utcnow())
+            self.report(f"✓ {migration.version:04d}_{migration.name}")
+        except Exception as e:
+            logger.error(f"Migration {migration.version:04d} failed: {e}")
+            await self._checkpoint(migration, status=FAILED, error=str(e))
+            raise
+
+    async def _run_step(self, migration: Migration, index: int, last_id: Any, state: Dict[str, Any]) -> None:
+        step = migration.steps[index]
+        collection = self.db[step.collection]
+        if self.write_concern:
+            collection = collection.with_options(write_concern=self.write_concern)
+        remaining = await collection.count_documents(step.filter)
+        processed, modified = state.get("processed", 0), state.get("modified", 0)
+        total = processed + remaining
+        done_before = processed
+        started = time.monotonic()
+
+        while True:
+            query = {"$and": [step.filter, {"_id": {"$gt": last_id}}]} if last_id is not None else step.filter
+            batch = await collection.find(query, step.projection).sort("_id", 1).limit(self.batch_size).to_list(None)
+            if not batch:
+                break
+
+            batch_started = time.monotonic()
+            # The filter is repeated per document, so a change made by the app
+            # since the batch was read is never overwritten
+            operations = []
+            for doc in batch:
+                update = step.update(doc)
+                if update:
+                    operations.append(UpdateOne({"$and": [step.filter, {"_id": doc["_id"]}]}, update))
+            if operations:
+                result = await collection.bulk_write(operations, ordered=False)
+                modified += result.modified_count
+
+            last_id = batch[-1]["_id"]
+            processed += len(batch)
+            await self._checkpoint(migration, last_id=last_id, processed=processed, modified=modified)
+
+            elapsed = time.monotonic() - started
+            rate = (processed - done_before) / elapsed if elapsed else 0
+            percent = 100 * processed / total if total else 100
+            self.report(f"  {step.collection}: {processed}/{total} ({percent:.1f}%) "
+                        f"{modified} modified, {rate:.0f} docs/s")
+
+            # Leave the primary and the secondaries room to keep up
+            write_time = time.monotonic() - batch_started
+            await asyncio.sleep(max(self.pause, write_time * (1 / self.duty_cycle - 1)))
+
+    async def _preview(self, migration: Migration) -> None:
+        self.report(f"◇ {migration.version:04d}_{migration.name} (dry run): {migration.description}")
+        for step in migration.steps:
+            collection = self.db[step.collection]
+            count = await collection.count_documents(step.filter)
+            self.report(f"  {step.collection}: {count} documents match {step.filter}")
+            async for doc in collection.find(step.filter, step.projection).sort("_id", 1).limit(3):
+                self.report(f"    {doc['_id']}: {step.update(doc)}")
+        if migration.after:
+            self.report("  then runs its post-migration hook")
@@ -0,0 +1,54 @@
+from email.message import EmailMessage
+from typing import Dict, List, Optional
+import asyncio
+import smtplib
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# smtp sends real mail; stub only records messages in OUTBOX (local dev and tests)
+NOTIFICATIONS_BACKEND = os.environ.get('NOTIFICATIONS_BACKEND', 'stub')
+SMTP_HOST = os.environ.get('SMTP_HOST', 'localhost')
+SMTP_PORT = int(os.environ.get('SMTP_PORT', '25'))
+SMTP_USER = os.environ.get('SMTP_USER')
+SMTP_PASSWORD = os.environ.get('SMTP_PASSWORD')
+SMTP_STARTTLS = os.environ.get('SMTP_STARTTLS', 'false').lower() == 'true'
+MAIL_FROM = os.environ.get('MAIL_FROM', 'no-reply@vattavadabooking.com')
+OWNER_EMAIL = os.environ.get('OWNER_EMAIL', 'bookings@vattavadabooking.com')
+OWNER_PHONE = os.environ.get('OWNER_PHONE')
+
+# Messages captured by the stub backend
+OUTBOX: List[Dict[str, str]] = []
+
+
+def _send_smtp(message: EmailMessage) -> None:
+    with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=10) as smtp:
+        if SMTP_STARTTLS:
+            smtp.starttls()
+        if SMTP_USER:
+            smtp.login(SMTP_USER, SMTP_PASSWORD or "")
+        smtp.send_message(message)
+
+
+async def send_email(to: str, subject: str, body: str) -> None:
+    """Send an email through the configured backend"""
+    if NOTIFICATIONS_BACKEND == "stub":
+        OUTBOX.append({"channel": "email", "to": to, "subject": subject, "body": body})
+        logger.info(f"[stub] email to {to}: {subject}")
+        return
+
+    message = EmailMessage()
+    message["From"] = MAIL_FROM
+    message["To"] = to
+    message["Subject"] = subject
+    message.set_content(body)
+    await asyncio.to_thread(_send_smtp, message)
+
+
+async def send_sms(to: Optional[str], text: str) -> None:
+    """Send an SMS; only the stub gateway is wired up for now"""
+    if not to:
+        return
+    OUTBOX.append({"channel": "sms", "to": to, "body": text})
+    logger.info(f"[stub] sms to {to}: {text[:40]}")
@@ -0,0 +1,167 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import monitoring
+from pymongo.errors import CollectionInvalid
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+import asyncio
+import hashlib
+import random
+import time
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', '100'))
+SLOW_QUERY_SAMPLE_RATE = float(os.environ.get('SLOW_QUERY_SAMPLE_RATE', '1.0'))
+# The same query shape is explained at most once per interval
+SLOW_QUERY_DEDUP_SECONDS = float(os.environ.get('SLOW_QUERY_DEDUP_SECONDS', '300'))
+SLOW_QUERY_COLLECTION_SIZE = int(os.environ.get('SLOW_QUERY_COLLECTION_SIZE', str(16 * 1024 * 1024)))
+SLOW_QUERY_QUEUE_SIZE = 100
+
+SLOW_QUERY_COLLECTION = "slow_queries"
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct"}
+# Driver bookkeeping fields that explain rejects or that make shapes unique
+DRIVER_FIELDS = {"lsid", "$db", "$clusterTime", "$readPreference", "txnNumber", "readConcern", "$audit"}
+
+
+def _shape(value: Any) -> Any:
+    """Replace literal values with placeholders so similar queries share a shape"""
+    if isinstance(value, dict):
+        return {k: _shape(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_shape(v) for v in value[:1]]
+    return "?"
+
+
+def _walk_stages(stage: Optional[Dict[str, Any]], found: List[Dict[str, Any]]) -> None:
+    if not stage:
+        return
+    found.append(stage)
+    _walk_stages(stage.get("inputStage"), found)
+    for child in stage.get("inputStages", []):
+        _walk_stages(child, found)
+    # SBE plans nest the classic plan under queryPlan
+    _walk_stages(stage.get("queryPlan"), found)
+
+
+def summarize_explain(explain: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce explain("executionStats") output to the fields worth keeping"""
+    # Aggregations that cannot be pushed down wrap the query in a $cursor stage
+    if "queryPlanner" not in explain and explain.get("stages"):
+        explain = explain["stages"][0].get("$cursor", {})
+
+    planner = explain.get("queryPlanner", {})
+    stats = explain.get("executionStats", {})
+    stages: List[Dict[str, Any]] = []
+    _walk_stages(planner.get("winningPlan"), stages)
+    stage_names = [s.get("stage") for s in stages if s.get("stage")]
+
+    return {
+        "stages": stage_names,
+        "collscan": "COLLSCAN" in stage_names,
+        "in_memory_sort": "SORT" in stage_names,
+        "indexes": sorted({s["indexName"] for s in stages if s.get("indexName")}),
+        "docs_examined": stats.get("totalDocsExamined"),
+        "keys_examined": stats.get("totalKeysExamined"),
+        "n_returned": stats.get("nReturned"),
+        "execution_time_ms": stats.get("executionTimeMillis"),
+    }
+
+
+class SlowQueryProfiler(monitoring.CommandListener):
+    """Samples slow read commands and explains them off the request path"""
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_THRESHOLD_MS, sample_rate: float = SLOW_QUERY_SAMPLE_RATE):
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.db: Optional[AsyncIOMotorDatabase] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._commands: Dict[Tuple[object, int], Dict[str, Any]] = {}
+        self._last_explained: Dict[str, float] = {}
+
+    async def start(self, db: AsyncIOMotorDatabase) -> None:
+        self.db = db
+        try:
+            await db.create_collection(SLOW_QUERY_COLLECTION, capped=True, size=SLOW_QUERY_COLLECTION_SIZE)
+        except CollectionInvalid:
+            pass
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=SLOW_QUERY_QUEUE_SIZE)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._loop = None
+
+    # Listener callbacks run on driver threads; keep them cheap
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if self._loop is None or event.command_name not in EXPLAINABLE_COMMANDS:
+            return
+        if event.command.get(event.command_name) == SLOW_QUERY_COLLECTION:
+            return
+        self._commands[(event.connection_id, event.request_id)] = event.command
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        command = self._commands.pop((event.connection_id, event.request_id), None)
+        if command is None or event.duration_micros < self.threshold_ms * 1000:
+            return
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        self._loop.call_soon_threadsafe(self._enqueue, event.database_name, command, event.duration_micros / 1000)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._commands.pop((event.connection_id, event.request_id), None)
+
+    def _enqueue(self, database: str, command: Dict[str, Any], duration_ms: float) -> None:
+        try:
+            self._queue.put_nowait((database, command, duration_ms))
+        except asyncio.QueueFull:
+            logger.debug("Slow query queue full, dropping sample")
+
+    async def _run(self) -> None:
+        while True:
+            database, command, duration_ms = await self._queue.get()
+            try:
+                await self.record(database, command, duration_ms)
+            except Exception as e:
+                logger.error(f"Error explaining slow query: {e}")
+
+    async def record(self, database: str, command: Dict[str, Any], duration_ms: float) -> None:
+        """Explain a slow command and store its plan summary"""
+        command_name = next(iter(command))
+        collection = command[command_name]
+        query = {k: v for k, v in command.items() if k not in DRIVER_FIELDS}
+        if command_name == "aggregate" and any(
+            "$out" in stage or "$merge" in stage for stage in query.get("pipeline", [])
+        ):
+            return
+
+        shape = {k: _shape(v) for k, v in query.items() if k in ("filter", "query", "pipeline", "sort", "projection")}
+        shape_hash = hashlib.sha1(repr((command_name, collection, shape)).encode("utf-8")).hexdigest()
+        now = time.monotonic()
+        if now - self._last_explained.get(shape_hash, -SLOW_QUERY_DEDUP_SECONDS) < SLOW_QUERY_DEDUP_SECONDS:
+            return
+        self._last_explained[shape_hash] = now
+
+        explain = await self.db.client[database].command(
+            {"explain": query, "verbosity": "executionStats"}
+        )
+        await self.db[SLOW_QUERY_COLLECTION].insert_one({
+            "collection": collection,
+            "command": command_name,
+            "shape": repr(shape),
+            "shape_hash": shape_hash,
+            "duration_ms": round(duration_ms, 2),
+            "plan": summarize_explain(explain),
+            "created_at": datetime.utcnow(),
+        })
+
+
+slow_query_profiler = SlowQueryProfiler()
@@ -0,0 +1,236 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from fastapi import Request
+from pymongo import UpdateOne
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from core.metrics import registry, Counter
+import asyncio
+import math
+import time
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# "mongo" shares counts across workers; "local" keeps every worker on its own buckets
+RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'mongo')
+RATE_LIMIT_SYNC_INTERVAL = float(os.environ.get('RATE_LIMIT_SYNC_INTERVAL', '1'))
+RATE_LIMIT_MAX_KEYS = int(os.environ.get('RATE_LIMIT_MAX_KEYS', '10000'))
+# Reverse proxies in front of the app that append to X-Forwarded-For; 0 trusts only the peer address
+TRUSTED_PROXIES = int(os.environ.get('TRUSTED_PROXIES', '0'))
+
+rate_limit_decisions_total = registry.register(Counter(
+    "rate_limit_decisions_total", "Rate limit checks by outcome", ("limiter", "rule", "result")))
+rate_limit_sync_failures_total = registry.register(Counter(
+    "rate_limit_sync_failures_total", "Failed syncs of rate limit counts to MongoDB"))
+
+
+@dataclass(frozen=True)
+class Rule:
+    capacity: int  # burst size, and the shared limit per window
+    per_seconds: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.per_seconds
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, rule: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded for {rule}")
+        self.rule = rule
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated = now
+
+    def refill(self, rule: Rule, now: float) -> None:
+        self.tokens = min(rule.capacity, self.tokens + (now - self.updated) * rule.rate)
+        self.updated = now
+
+
+def client_ip(request: Request, trusted_proxies: int = TRUSTED_PROXIES) -> str:
+    """The address our outermost trusted proxy saw, else the peer address.
+
+    Entries left of that are supplied by the client and cannot be trusted.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if trusted_proxies <= 0:
+        return peer
+    hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    if len(hops) < trusted_proxies:
+        return peer
+    return hops[-trusted_proxies]
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    return email.strip().lower() if email else None
+
+
+class MongoRateLimitStore:
+    """Fixed-window hit counts shared by every worker, expired by a TTL index"""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.collection = db.rate_limits
+
+    async def ensure_indexes(self) -> None:
+        await self.collection.create_index("expires_at", expireAfterSeconds=0, name="expires")
+
+    async def record(self, hits: Dict[str, Tuple[int, datetime]], watched: List[str]) -> Dict[str, int]:
+        """Add local hits to their windows and return cluster-wide totals for the watched ones"""
+        if hits:
+            await self.collection.bulk_write([
+                UpdateOne(
+                    {"_id": window_id},
+                    {"$inc": {"count": count}, "$setOnInsert": {"expires_at": expires_at}},
+                    upsert=True
+                )
+                for window_id, (count, expires_at) in hits.items()
+            ], ordered=False)
+        cursor = self.collection.find({"_id": {"$in": watched}}, {"count": 1})
+        return {doc["_id"]: doc["count"] async for doc in cursor}
+
+
+class RateLimiter:
+    """Token buckets checked in-process, reconciled across workers in the background"""
+
+    def __init__(self, name: str, rules: Dict[str, Rule], max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.name = name
+        self.rules = rules
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        # Keys other workers have pushed over the limit, until their window ends
+        self._blocked: Dict[str, float] = {}
+        # Hits not yet synced: window id -> count
+        self._pending: Dict[str, int] = {}
+        # Open windows this worker has seen: window id -> (key, window end, rule)
+        self._windows: Dict[str, Tuple[str, float, Rule]] = {}
+        # Set by RateLimitSync when a shared store is running; window bookkeeping is only kept for it
+        self.shared = False
+
+    def _bucket(self, key: str, rule: Rule, now: float) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(rule.capacity, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket.refill(rule, now)
+        return bucket
+
+    def hit(self, **identities: Optional[str]) -> None:
+        """Take one token per identity, or raise without taking any"""
+        now = time.time()
+        checked = []
+        for rule_name, value in identities.items():
+            if not value:
+                continue
+            rule = self.rules[rule_name]
+            key = f"{self.name}:{rule_name}:{value}"
+            blocked_until = self._blocked.get(key, 0)
+            if blocked_until > now:
+                rate_limit_decisions_total.inc(self.name, rule_name, "blocked")
+                raise RateLimitExceeded(rule_name, blocked_until - now)
+            bucket = self._bucket(key, rule, now)
+            if bucket.tokens < 1:
+                rate_limit_decisions_total.inc(self.name, rule_name, "limited")
+                raise RateLimitExceeded(rule_name, (1 - bucket.tokens) / rule.rate)
+            checked.append((key, rule_name, rule, bucket))
+
+        for key, rule_name, rule, bucket in checked:
+            bucket.tokens -= 1
+            rate_limit_decisions_total.inc(self.name, rule_name, "allowed")
+            if not self.shared:
+                continue
+            window_start = int(now // rule.per_seconds * rule.per_seconds)
+            window_id = f"{key}:{window_start}"
+            self._pending[window_id] = self._pending.get(window_id, 0) + 1
+            self._windows.setdefault(window_id, (key, window_start + rule.per_seconds, rule))
+
+    async def sync(self, store: MongoRateLimitStore) -> None:
+        """Push local hits to the shared store and block keys that are over the limit"""
+        now = time.time()
+        self._windows = {w: entry for w, entry in self._windows.items() if entry[1] > now}
+        self._blocked = {key: until for key, until in self._blocked.items() if until > now}
+        # Hits in windows that already closed no longer matter to anyone
+        pending, self._pending = {w: c for w, c in self._pending.items() if w in self._windows}, {}
+        if not self._windows:
+            return
+        try:
+            totals = await store.record({
+                window_id: (count, datetime.utcfromtimestamp(self._windows[window_id][1]) + timedelta(seconds=60))
+                for window_id, count in pending.items()
+            }, list(self._windows))
+        except Exception:
+            # Put the hits back so the next sync still counts them, unless their window closed meanwhile
+            for window_id, count in pending.items():
+                if window_id in self._windows:
+                    self._pending[window_id] = self._pending.get(window_id, 0) + count
+            raise
+
+        for window_id, (key, window_end, rule) in self._windows.items():
+            if totals.get(window_id, 0) >= rule.capacity:
+                self._blocked[key] = max(self._blocked.get(key, 0), window_end)
+
+
+class RateLimitSync:
+    """Background task syncing every limiter to MongoDB"""
+
+    def __init__(self, limiters: List[RateLimiter], interval: float = RATE_LIMIT_SYNC_INTERVAL):
+        self.limiters = limiters
+        self.interval = interval
+        self.store: Optional[MongoRateLimitStore] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, db: AsyncIOMotorDatabase) -> None:
+        if RATE_LIMIT_BACKEND != "mongo":
+            return
+        self.store = MongoRateLimitStore(db)
+        await self.store.ensure_indexes()
+        for limiter in self.limiters:
+            limiter.shared = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            await self.flush()
+            for limiter in self.limiters:
+                limiter.shared = False
+        self._task = None
+
+    async def flush(self) -> None:
+        for limiter in self.limiters:
+            try:
+                await limiter.sync(self.store)
+            except Exception as e:
+                rate_limit_sync_failures_total.inc()
+                logger.warning(f"Rate limit sync failed for {limiter.name}: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+
+# Public form submissions: a burst per minute per IP, fewer per person
+contact_limiter = RateLimiter("contact", {
+    "ip": Rule(capacity=5, per_seconds=60),
+    "email": Rule(capacity=3, per_seconds=600),
+    "phone": Rule(capacity=3, per_seconds=600),
+})
+inquiry_limiter = RateLimiter("inquiry", {
+    "ip": Rule(capacity=10, per_seconds=60),
+    "email": Rule(capacity=5, per_seconds=600),
+    "phone": Rule(capacity=5, per_seconds=600),
+})
+rate_limit_sync = RateLimitSync([contact_limiter, inquiry_limiter])
@@ -0,0 +1,97 @@
+from pymongo.errors import ConnectionFailure, ExecutionTimeout
+from typing import Awaitable, Callable, TypeVar
+from core.metrics import registry, Counter, Gauge
+import time
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+BREAKER_FAILURE_THRESHOLD = int(os.environ.get('BREAKER_FAILURE_THRESHOLD', '5'))
+BREAKER_RESET_TIMEOUT = float(os.environ.get('BREAKER_RESET_TIMEOUT', '30'))
+
+# Failures that mean the database is degraded, as opposed to a bad request
+DEGRADED_ERRORS = (ExecutionTimeout, ConnectionFailure)
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+circuit_breaker_state = registry.register(Gauge(
+    "circuit_breaker_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)", ("breaker",)))
+circuit_breaker_transitions_total = registry.register(Counter(
+    "circuit_breaker_transitions_total", "Circuit breaker state changes", ("breaker", "state")))
+circuit_breaker_rejections_total = registry.register(Counter(
+    "circuit_breaker_rejections_total", "Calls rejected while the breaker was open", ("breaker",)))
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open")
+        self.retry_after = max(1, int(retry_after + 0.999))
+
+
+class CircuitBreaker:
+    """Fails fast after repeated database timeouts, probing again after a cool-down"""
+
+    def __init__(self, name: str, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 reset_timeout: float = BREAKER_RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        circuit_breaker_state.set(name, value=STATE_VALUES[CLOSED])
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        logger.warning(f"Circuit breaker '{self.name}' {self.state} -> {state}")
+        self.state = state
+        circuit_breaker_state.set(self.name, value=STATE_VALUES[state])
+        circuit_breaker_transitions_total.inc(self.name, state)
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a call may go through now; at most one probe while half-open"""
+        if self.state == OPEN and self.retry_after() <= 0:
+            self._transition(HALF_OPEN)
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._probing = False
+        self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        self._probing = False
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._transition(OPEN)
+
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        if not self.allow():
+            circuit_breaker_rejections_total.inc(self.name)
+            raise CircuitOpenError(self.name, self.retry_after())
+        try:
+            result = await func()
+        except DEGRADED_ERRORS:
+            self.record_failure()
+            raise
+        except BaseException:
+            # Not a database health signal; just release a half-open probe
+            self._probing = False
+            raise
+        self.record_success()
+        return result
@@ -0,0 +1,48 @@
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Callable, Dict
+from datetime import datetime
+from decimal import Decimal
+from bson import ObjectId
+import orjson
+
+
+def _encode_decimal(value: Decimal):
+    # Same rule as fastapi.encoders.decimal_encoder so output stays identical
+    if value.as_tuple().exponent >= 0:
+        return int(value)
+    return float(value)
+
+
+# Shared encoder registry used by every model and by FastJSONResponse
+JSON_ENCODERS: Dict[type, Callable[[Any], Any]] = {
+    ObjectId: str,
+    datetime: lambda v: v.isoformat(),
+    Decimal: _encode_decimal,
+}
+
+
+def encode_default(obj: Any) -> Any:
+    """Fallback encoder for types orjson does not serialize natively"""
+    for base in type(obj).__mro__:
+        encoder = JSON_ENCODERS.get(base)
+        if encoder is not None:
+            return encoder(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to compact JSON bytes"""
+    return orjson.dumps(content, default=encode_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, byte-compatible with JSONResponse"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class MongoModel(BaseModel):
+    """Base model for documents read from MongoDB"""
+    model_config = ConfigDict(populate_by_name=True, json_encoders=JSON_ENCODERS)
@@ -0,0 +1,289 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from collections import Counter as TermCounter
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import asyncio
+import math
+import re
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+SIMILAR_TOP_K = int(os.environ.get('SIMILAR_TOP_K', '12'))
+SIMILARITY_REBUILD_INTERVAL = float(os.environ.get('SIMILARITY_REBUILD_INTERVAL', '900'))
+# Relative weight of each feature block; every block is unit-length before weighting
+FEATURE_WEIGHTS = {
+    "type": 1.0,
+    "price": 0.8,
+    "capacity": 0.6,
+    "amenities": 0.8,
+    "attractions": 0.6,
+    "description": 1.0,
+}
+MAX_DESCRIPTION_TERMS = 2000
+# Rows scored per matrix product while rebuilding, bounding memory at BLOCK_ROWS x N
+BLOCK_ROWS = 512
+
+TOKEN_RE = re.compile(r"[a-z][a-z]+")
+STOPWORDS = frozenset(
+    "and the with for our you your are from this that into amid near its all has have was were "
+    "will can per each room rooms stay".split()
+)
+PROJECTION = {"type": 1, "price": 1, "capacity": 1, "amenities": 1, "attractions": 1, "description": 1}
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+def attraction_name(attraction: str) -> str:
+    """"Tea Museum - 2km" and "Tea Museum - 2.5km" are the same attraction"""
+    return attraction.split(" - ")[0].strip().lower()
+
+
+def guest_count(capacity: Any) -> float:
+    try:
+        return float(str(capacity).split()[0])
+    except (ValueError, IndexError):
+        return 0.0
+
+
+def _unit(block: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(block, axis=1, keepdims=True)
+    return np.divide(block, norms, out=np.zeros_like(block), where=norms > 0)
+
+
+class FeatureSpace:
+    """Vocabularies and scaling fitted on the catalog, used to vectorize any listing"""
+
+    def __init__(self, docs: List[Dict[str, Any]]):
+        self.types = {t: i for i, t in enumerate(sorted({(d.get("type") or "").lower() for d in docs}))}
+        self.amenities = {a: i for i, a in enumerate(sorted({a.lower() for d in docs for a in d.get("amenities") or []}))}
+        self.attractions = {a: i for i, a in enumerate(sorted(
+            {attraction_name(a) for d in docs for a in d.get("attractions") or []}))}
+
+        doc_freq = TermCounter(t for d in docs for t in set(tokenize(d.get("description"))))
+        terms = [t for t, _ in doc_freq.most_common(MAX_DESCRIPTION_TERMS)]
+        self.terms = {t: i for i, t in enumerate(terms)}
+        self.idf = np.array([math.log((1 + len(docs)) / (1 + doc_freq[t])) + 1 for t in terms], dtype=np.float32)
+
+        log_prices = np.log1p([max(d.get("price") or 0, 0) for d in docs]) if docs else np.zeros(1)
+        self.price_mean, self.price_std = float(np.mean(log_prices)), float(np.std(log_prices)) or 1.0
+        guests = [guest_count(d.get("capacity")) for d in docs] or [0.0]
+        self.guest_mean, self.guest_std = float(np.mean(guests)), float(np.std(guests)) or 1.0
+
+    def vectorize(self, docs: List[Dict[str, Any]]) -> np.ndarray:
+        """One L2-normalized row per document"""
+        n = len(docs)
+        types = np.zeros((n, max(len(self.types), 1)), dtype=np.float32)
+        amenities = np.zeros((n, max(len(self.amenities), 1)), dtype=np.float32)
+        attractions = np.zeros((n, max(len(self.attractions), 1)), dtype=np.float32)
+        tf = np.zeros((n, max(len(self.terms), 1)), dtype=np.float32)
+        # Price and capacity become points on a unit circle, so nearby values score close to 1
+        price = np.zeros((n, 2), dtype=np.float32)
+        capacity = np.zeros((n, 2), dtype=np.float32)
+
+        for row, doc in enumerate(docs):
+            index = self.types.get((doc.get("type") or "").lower())
+            if index is not None:
+                types[row, index] = 1
+            for amenity in doc.get("amenities") or []:
+                index = self.amenities.get(amenity.lower())
+                if index is not None:
+                    amenities[row, index] = 1
+            for attraction in doc.get("attractions") or []:
+                index = self.attractions.get(attraction_name(attraction))
+                if index is not None:
+                    attractions[row, index] = 1
+            for term, count in TermCounter(tokenize(doc.get("description"))).items():
+                index = self.terms.get(term)
+                if index is not None:
+                    tf[row, index] = count
+            z = (math.log1p(max(doc.get("price") or 0, 0)) - self.price_mean) / self.price_std
+            price[row] = (math.cos(z * math.pi / 6), math.sin(z * math.pi / 6))
+            z = (guest_count(doc.get("capacity")) - self.guest_mean) / self.guest_std
+            capacity[row] = (math.cos(z * math.pi / 6), math.sin(z * math.pi / 6))
+
+        if self.terms:
+            tf = tf * self.idf
+        blocks = {
+            "type": types, "price": price, "capacity": capacity,
+            "amenities": amenities, "attractions": attractions, "description": tf,
+        }
+        matrix = np.hstack([_unit(block) * FEATURE_WEIGHTS[name] for name, block in blocks.items()])
+        return _unit(matrix)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k highest scores in each row, best first"""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return np.zeros((scores.shape[0], 0), dtype=np.int64)
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1)
+    return np.take_along_axis(part, order, axis=1)
+
+
+class IndexSnapshot:
+    """Feature matrix and top-k neighbours at one point in time; updates return a new snapshot"""
+
+    def __init__(self, k: int, space: FeatureSpace, ids: List[str], matrix: np.ndarray,
+                 neighbors: Dict[str, List[Tuple[str, float]]]):
+        self.k = k
+        self.space = space
+        self.ids = ids
+        self.rows = {pid: i for i, pid in enumerate(ids)}
+        self.matrix = matrix
+        self.neighbors = neighbors
+
+    @classmethod
+    def build(cls, docs: List[Dict[str, Any]], k: int) -> "IndexSnapshot":
+        """Fit the feature space and compute every listing's neighbours"""
+        space = FeatureSpace(docs)
+        ids = [str(d["_id"]) for d in docs]
+        matrix = space.vectorize(docs)
+        neighbors: Dict[str, List[Tuple[str, float]]] = {}
+        for start in range(0, len(ids), BLOCK_ROWS):
+            scores = matrix[start:start + BLOCK_ROWS] @ matrix.T
+            # A listing is not similar to itself
+            scores[np.arange(scores.shape[0]), np.arange(start, start + scores.shape[0])] = -np.inf
+            best = top_k(scores, k)
+            for offset, columns in enumerate(best):
+                row_scores = scores[offset, columns]
+                neighbors[ids[start + offset]] = [
+                    (ids[c], float(s)) for c, s in zip(columns, row_scores) if np.isfinite(s)
+                ]
+        return cls(k, space, ids, matrix, neighbors)
+
+    def _neighbors_of(self, row: int) -> List[Tuple[str, float]]:
+        scores = self.matrix[row] @ self.matrix.T
+        scores[row] = -np.inf
+        columns = top_k(scores[None, :], self.k)[0]
+        return [(self.ids[c], float(scores[c])) for c in columns if np.isfinite(scores[c])]
+
+    def upserted(self, doc: Dict[str, Any]) -> "IndexSnapshot":
+        """Re-vectorize one listing with the fitted vocabulary and patch the affected neighbour lists"""
+        property_id = str(doc["_id"])
+        vector = self.space.vectorize([doc])
+        row = self.rows.get(property_id)
+        if row is None:
+            ids = self.ids + [property_id]
+            matrix = np.vstack([self.matrix, vector]) if self.matrix.size else vector
+            row = len(self.ids)
+        else:
+            ids = self.ids
+            matrix = self.matrix.copy()
+            matrix[row] = vector[0]
+        snapshot = IndexSnapshot(self.k, self.space, ids, matrix, dict(self.neighbors))
+
+        neighbors = snapshot.neighbors
+        neighbors[property_id] = snapshot._neighbors_of(row)
+        scores = matrix @ matrix[row]
+        for other, other_row in snapshot.rows.items():
+            if other == property_id:
+                continue
+            current = neighbors.get(other, [])
+            if any(pid == property_id for pid, _ in current):
+                # Its score changed and it may have dropped out; recompute that list
+                neighbors[other] = snapshot._neighbors_of(other_row)
+            elif len(current) < self.k or scores[other_row] > current[-1][1]:
+                merged = current + [(property_id, float(scores[other_row]))]
+                neighbors[other] = sorted(merged, key=lambda item: -item[1])[:self.k]
+        return snapshot
+
+    def removed(self, property_id: str) -> "IndexSnapshot":
+        """Drop a listing that was deleted or deactivated"""
+        row = self.rows.get(property_id)
+        if row is None:
+            return self
+        snapshot = IndexSnapshot(
+            self.k, self.space, self.ids[:row] + self.ids[row + 1:], np.delete(self.matrix, row, axis=0),
+            {pid: current for pid, current in self.neighbors.items() if pid != property_id}
+        )
+        for other, current in snapshot.neighbors.items():
+            if any(pid == property_id for pid, _ in current):
+                snapshot.neighbors[other] = snapshot._neighbors_of(snapshot.rows[other])
+        return snapshot
+
+    def replayed(self, journal: List[Tuple[str, Any]]) -> "IndexSnapshot":
+        snapshot = self
+        for operation, argument in journal:
+            snapshot = getattr(snapshot, operation)(argument)
+        return snapshot
+
+
+class SimilarityIndex:
+    """Serves the current IndexSnapshot of active listings and keeps it up to date"""
+
+    def __init__(self, k: int = SIMILAR_TOP_K):
+        self.k = k
+        # Replaced wholesale, never mutated, so readers on the event loop always see a complete snapshot
+        self.snapshot: Optional[IndexSnapshot] = None
+        # Serializes updates and the rebuild swap; the matrix work itself runs in a worker thread
+        self._lock = asyncio.Lock()
+        # Updates made while a rebuild reads the catalog, replayed onto the rebuilt snapshot
+        self._journal: Optional[List[Tuple[str, Any]]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.snapshot is not None
+
+    def similar(self, property_id: str, limit: int) -> List[Tuple[str, float]]:
+        snapshot = self.snapshot
+        if snapshot is None:
+            return []
+        return snapshot.neighbors.get(property_id, [])[:limit]
+
+    async def _update(self, operation: str, argument: Any) -> None:
+        async with self._lock:
+            if self._journal is not None:
+                self._journal.append((operation, argument))
+            if self.snapshot is None:
+                return
+            try:
+                self.snapshot = await asyncio.to_thread(getattr(self.snapshot, operation), argument)
+            except Exception as e:
+                # The next rebuild picks the listing up from the database
+                logger.error(f"Error updating similarity index: {e}")
+
+    async def upsert(self, doc: Dict[str, Any]) -> None:
+        await self._update("upserted", doc)
+
+    async def remove(self, property_id: str) -> None:
+        await self._update("removed", str(property_id))
+
+    async def rebuild(self, db: AsyncIOMotorDatabase) -> None:
+        async with self._lock:
+            self._journal = []
+        try:
+            docs = await db.properties.find({"active": True}, PROJECTION).to_list(None)
+            snapshot = await asyncio.to_thread(IndexSnapshot.build, docs, self.k)
+            async with self._lock:
+                # Writes made after the read began may be missing from docs; replaying is idempotent
+                self.snapshot = await asyncio.to_thread(snapshot.replayed, self._journal)
+        finally:
+            self._journal = None
+        logger.info(f"Similarity index built for {len(docs)} properties")
+
+    async def start(self, db: AsyncIOMotorDatabase) -> None:
+        self._task = asyncio.create_task(self._run(db))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self, db: AsyncIOMotorDatabase) -> None:
+        # Periodic rebuilds refit the vocabulary and pick up writes made by other workers
+        while True:
+            try:
+                await self.rebuild(db)
+            except Exception as e:
+                logger.error(f"Error building similarity index: {e}")
+            await asyncio.sleep(SIMILARITY_REBUILD_INTERVAL)
+
+
+similarity_index = SimilarityIndex()
@@ -0,0 +1,76 @@
+from typing import Any, Awaitable, Callable, Dict
+from core.metrics import registry, Counter, Gauge, Histogram
+from core.timeouts import flight_context, kill_operations_soon
+import asyncio
+
+singleflight_calls_total = registry.register(Counter(
+    "singleflight_calls_total", "Calls through single-flight by role", ("group", "role")))
+singleflight_waiters = registry.register(Gauge(
+    "singleflight_waiters", "Callers currently waiting on another caller's flight", ("group",)))
+singleflight_shared = registry.register(Histogram(
+    "singleflight_shared_callers", "Followers that shared each flight", ("group",),
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100, 250, 500)))
+
+
+def key_group(key: str) -> str:
+    """Low-cardinality label for a key such as properties:list:type=cottage"""
+    return ":".join(key.split(":", 2)[:2])
+
+
+class Flight:
+    """One execution and the callers waiting on it"""
+
+    def __init__(self, task: asyncio.Task, tag: str):
+        self.task = task
+        self.tag = tag
+        self.waiters = 0
+        self.followers = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution"""
+
+    def __init__(self):
+        self._flights: Dict[str, Flight] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        group = key_group(key)
+        flight = self._flights.get(key)
+        follower = flight is not None
+        if not follower:
+            singleflight_calls_total.inc(group, "leader")
+            # The flight runs in its own task and context, so one caller disconnecting does not
+            # cancel work others share; the route's query budget still applies
+            context, tag = flight_context()
+            flight = Flight(context.run(asyncio.create_task, func()), tag)
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _, key=key, flight=flight: self._finish(key, flight, group))
+        else:
+            singleflight_calls_total.inc(group, "follower")
+            flight.followers += 1
+            singleflight_waiters.inc(group)
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if follower:
+                singleflight_waiters.dec(group)
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller went away: stop the flight and its queries on the server
+                self._abandon(key, flight)
+
+    def _abandon(self, key: str, flight: Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        flight.task.cancel()
+        kill_operations_soon(flight.tag)
+
+    def _finish(self, key: str, flight: Flight, group: str) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        singleflight_shared.observe(flight.followers, group)
+
+    def in_flight(self) -> int:
+        return len(self._flights)
@@ -0,0 +1,161 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from contextvars import Context, ContextVar
+from typing import Any, Dict, Optional, Tuple
+from core.metrics import registry, Counter
+import asyncio
+import uuid
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERY_TIMEOUT_MS = int(os.environ.get('DEFAULT_QUERY_TIMEOUT_MS', '5000'))
+
+# Time budget for each query issued while serving a route, by path prefix
+ROUTE_QUERY_TIMEOUTS_MS: Dict[str, int] = {
+    "/api/properties": 2000,
+    "/api/experiences": 2000,
+    "/api/testimonials": 2000,
+    "/api/bookings": 5000,
+    "/api/contact": 5000,
+    "/api/admin": 15000,
+}
+# Overrides such as QUERY_TIMEOUTS="/api/properties=1500,/api/admin=20000"
+for _item in filter(None, os.environ.get('QUERY_TIMEOUTS', '').split(',')):
+    _prefix, _, _ms = _item.partition('=')
+    ROUTE_QUERY_TIMEOUTS_MS[_prefix.strip()] = int(_ms)
+
+_query_budget_ms: ContextVar[int] = ContextVar("query_budget_ms", default=DEFAULT_QUERY_TIMEOUT_MS)
+_request_tag: ContextVar[Optional[str]] = ContextVar("request_tag", default=None)
+
+http_client_disconnects_total = registry.register(Counter(
+    "http_client_disconnects_total", "Requests cancelled because the client went away", ("method",)))
+mongodb_operations_killed_total = registry.register(Counter(
+    "mongodb_operations_killed_total", "Server-side operations killed after a client disconnect"))
+
+# Database QueryBudgetMiddleware kills operations on; shared work abandoned outside a request uses it too
+_kill_db: Optional[AsyncIOMotorDatabase] = None
+
+
+def budget_for_path(path: str) -> int:
+    """Longest matching route prefix wins"""
+    best, best_len = DEFAULT_QUERY_TIMEOUT_MS, -1
+    for prefix, budget in ROUTE_QUERY_TIMEOUTS_MS.items():
+        if path.startswith(prefix) and len(prefix) > best_len:
+            best, best_len = budget, len(prefix)
+    return best
+
+
+def query_options() -> Dict[str, Any]:
+    """maxTimeMS and a request tag for reads issued by the services"""
+    options: Dict[str, Any] = {"max_time_ms": _query_budget_ms.get()}
+    tag = _request_tag.get()
+    if tag:
+        options["comment"] = tag
+    return options
+
+
+def detached_context() -> Context:
+    """A fresh context for background work: keeps the route's query budget, drops the request tag"""
+    context = Context()
+    context.run(_query_budget_ms.set, _query_budget_ms.get())
+    return context
+
+
+def flight_context() -> Tuple[Context, str]:
+    """A detached context for work shared by several requests, with its own tag for killOp"""
+    leader = _request_tag.get()
+    # Derived from the leader's tag so its queries are traceable, but distinct so the leader
+    # disconnecting does not kill work other requests are still waiting on
+    tag = f"{leader}:flight" if leader else f"flight:{uuid.uuid4().hex[:16]}"
+    context = detached_context()
+    context.run(_request_tag.set, tag)
+    return context, tag
+
+
+def aggregate_options() -> Dict[str, Any]:
+    """query_options() spelled the way aggregate() takes them"""
+    options = query_options()
+    options["maxTimeMS"] = options.pop("max_time_ms")
+    return options
+
+
+async def kill_operations(db: AsyncIOMotorDatabase, tag: str) -> int:
+    """Kill in-flight server operations started by the tagged request"""
+    killed = 0
+    try:
+        admin = db.client.admin
+        cursor = admin.aggregate([
+            {"$currentOp": {"allUsers": True}},
+            {"$match": {"$or": [{"command.comment": tag}, {"cursor.originatingCommand.comment": tag}]}},
+            {"$project": {"opid": 1}},
+        ])
+        async for op in cursor:
+            await admin.command("killOp", op=op["opid"])
+            killed += 1
+        if killed:
+            mongodb_operations_killed_total.inc(amount=killed)
+    except Exception as e:
+        logger.warning(f"Could not kill operations for {tag}: {e}")
+    return killed
+
+
+def kill_operations_soon(tag: str) -> None:
+    """Schedule kill_operations for tag, for work cancelled outside QueryBudgetMiddleware"""
+    if _kill_db is not None:
+        asyncio.create_task(kill_operations(_kill_db, tag))
+
+
+class QueryBudgetMiddleware:
+    """Sets the per-route query budget and cancels reads whose client disconnected"""
+
+    def __init__(self, app, db: AsyncIOMotorDatabase):
+        global _kill_db
+        self.app = app
+        self.db = db
+        _kill_db = db
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        tag = f"req:{uuid.uuid4().hex[:16]}"
+        budget_token = _query_budget_ms.set(budget_for_path(scope["path"]))
+        tag_token = _request_tag.set(tag)
+        try:
+            if scope["method"] in ("GET", "HEAD"):
+                await self._run_cancellable(scope, receive, send, tag)
+            else:
+                # Writes are left to finish; cancelling halfway helps nobody
+                await self.app(scope, receive, send)
+        finally:
+            _request_tag.reset(tag_token)
+            _query_budget_ms.reset(budget_token)
+
+    async def _run_cancellable(self, scope, receive, send, tag: str):
+        messages: asyncio.Queue = asyncio.Queue()
+        app_task = asyncio.create_task(self.app(scope, messages.get, send))
+        disconnected = False
+
+        async def watch_disconnect():
+            nonlocal disconnected
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    disconnected = True
+                    app_task.cancel()
+                    return
+                await messages.put(message)
+
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            await app_task
+        except asyncio.CancelledError:
+            if not disconnected:
+                raise
+            # Client went away: stop the query server-side too
+            http_client_disconnects_total.inc(scope["method"])
+            asyncio.create_task(kill_operations(self.db, tag))
+        finally:
+            watcher.cancel()
@@ -0,0 +1,219 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, Optional
+from core.metrics import registry, Counter, Gauge, Histogram
+import asyncio
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+WRITE_BEHIND_BATCH_SIZE = int(os.environ.get('WRITE_BEHIND_BATCH_SIZE', '500'))
+WRITE_BEHIND_FLUSH_INTERVAL = float(os.environ.get('WRITE_BEHIND_FLUSH_INTERVAL', '1'))
+WRITE_BEHIND_MAX_PENDING = int(os.environ.get('WRITE_BEHIND_MAX_PENDING', '10000'))
+# How long a writer waits for room before the write is rejected
+WRITE_BEHIND_PUT_TIMEOUT = float(os.environ.get('WRITE_BEHIND_PUT_TIMEOUT', '2'))
+
+write_behind_pending = registry.register(Gauge(
+    "write_behind_pending", "Writes buffered and not yet flushed", ("collection",)))
+write_behind_flushed_total = registry.register(Counter(
+    "write_behind_flushed_total", "Writes flushed to MongoDB", ("collection",)))
+write_behind_failures_total = registry.register(Counter(
+    "write_behind_failures_total", "Writes that failed or were dropped", ("collection", "reason")))
+write_behind_batch_size = registry.register(Histogram(
+    "write_behind_batch_size", "Writes per flush", ("collection",),
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000)))
+
+
+class BufferFull(Exception):
+    pass
+
+
+class WriteBehindBuffer:
+    """Collects low-value writes in memory and flushes them as one unordered bulk_write"""
+
+    def __init__(self, collection: str, batch_size: int = WRITE_BEHIND_BATCH_SIZE,
+                 flush_interval: float = WRITE_BEHIND_FLUSH_INTERVAL,
+                 max_pending: int = WRITE_BEHIND_MAX_PENDING):
+        self.collection_name = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.collection = None
+        self._pending: Deque[Any] = deque()
+        self._batch_ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def start(self, db: AsyncIOMotorDatabase) -> None:
+        self.collection = db[self.collection_name]
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher and write out everything still buffered"""
+        if self._task:
+            # Let an in-progress flush finish rather than cancelling it halfway
+            self._closing = True
+            self._batch_ready.set()
+            await self._task
+            self._task = None
+            while self._pending:
+                if not await self.flush():
+                    break
+            if self._pending:
+                write_behind_failures_total.inc(self.collection_name, "shutdown", amount=len(self._pending))
+                logger.error(f"Dropped {len(self._pending)} buffered writes to {self.collection_name} at shutdown")
+                self._pending.clear()
+
+    async def insert(self, document: Dict[str, Any]) -> None:
+        await self.put(InsertOne(document))
+
+    async def put(self, operation: Any) -> None:
+        """Buffer a write operation, waiting for room while the buffer is full"""
+        while len(self._pending) >= self.max_pending:
+            self._space.clear()
+            self._batch_ready.set()
+            try:
+                await asyncio.wait_for(self._space.wait(), WRITE_BEHIND_PUT_TIMEOUT)
+            except asyncio.TimeoutError:
+                write_behind_failures_total.inc(self.collection_name, "full")
+                raise BufferFull(f"Write-behind buffer for {self.collection_name} is full")
+        self._pending.append(operation)
+        write_behind_pending.set(self.collection_name, value=len(self._pending))
+        if len(self._pending) >= self.batch_size:
+            self._batch_ready.set()
+
+    async def flush(self) -> bool:
+        """Write one batch; returns False if it failed and was put back"""
+        batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+        if not batch:
+            return True
+        try:
+            result = await self.collection.bulk_write(batch, ordered=False)
+            written = result.inserted_count + result.modified_count + result.upserted_count
+            write_behind_flushed_total.inc(self.collection_name, amount=written)
+            write_behind_batch_size.observe(len(batch), self.collection_name)
+            return True
+        except BulkWriteError as e:
+            # Unordered: everything but the reported errors was written, and retrying those will not help
+            errors = len(e.details.get("writeErrors", []))
+            write_behind_flushed_total.inc(self.collection_name, amount=len(batch) - errors)
+            write_behind_failures_total.inc(self.collection_name, "write_error", amount=errors)
+            logger.error(f"{errors} buffered writes to {self.collection_name} failed: {e}")
+            return True
+        except Exception as e:
+            # Likely transient; keep the batch for the next flush
+            logger.error(f"Error flushing writes to {self.collection_name}: {e}")
+            self._pending.extendleft(reversed(batch))
+            return False
+        finally:
+            write_behind_pending.set(self.collection_name, value=len(self._pending))
+            if len(self._pending) < self.max_pending:
+                self._space.set()
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+                # Woken by a full batch: write full batches, leave the rest for the timer
+                full_only = True
+            except asyncio.TimeoutError:
+                full_only = False
+            self._batch_ready.clear()
+            while self._pending and (not full_only or len(self._pending) >= self.batch_size):
+                if not await self.flush():
+                    await asyncio.sleep(self.flush_interval)
+                    break
+
+
+class IncrementBuffer:
+    """Sums counter increments in memory and flushes them as batched $inc upserts"""
+
+    def __init__(self, collection: str, flush_interval: float = WRITE_BEHIND_FLUSH_INTERVAL,
+                 max_keys: int = WRITE_BEHIND_MAX_PENDING):
+        self.collection_name = collection
+        self.flush_interval = flush_interval
+        self.max_keys = max_keys
+        self.collection = None
+        # _id -> [field increments, fields set when the document is created]
+        self._counts: Dict[Hashable, list] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._wake = asyncio.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def start(self, db: AsyncIOMotorDatabase) -> None:
+        self.collection = db[self.collection_name]
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._closing = True
+            self._wake.set()
+            await self._task
+            self._task = None
+            await self.flush()
+
+    def incr(self, doc_id: Hashable, field: str, amount: int = 1, on_insert: Optional[Dict[str, Any]] = None) -> None:
+        """Add to a counter; never waits, and drops new keys while the buffer is over its limit"""
+        entry = self._counts.get(doc_id)
+        if entry is None:
+            if len(self._counts) >= self.max_keys:
+                self._wake.set()
+                write_behind_failures_total.inc(self.collection_name, "full")
+                return
+            entry = self._counts[doc_id] = [{}, on_insert or {}]
+        entry[0][field] = entry[0].get(field, 0) + amount
+        write_behind_pending.set(self.collection_name, value=len(self._counts))
+
+    async def flush(self) -> None:
+        if not self._counts:
+            return
+        counts, self._counts = self._counts, {}
+        write_behind_pending.set(self.collection_name, value=0)
+        try:
+            await self.collection.bulk_write([
+                UpdateOne({"_id": doc_id}, {"$inc": incs, "$setOnInsert": on_insert}, upsert=True)
+                if on_insert else UpdateOne({"_id": doc_id}, {"$inc": incs})
+                for doc_id, (incs, on_insert) in counts.items()
+            ], ordered=False)
+            write_behind_flushed_total.inc(self.collection_name, amount=len(counts))
+            write_behind_batch_size.observe(len(counts), self.collection_name)
+        except BulkWriteError as e:
+            # The rest were applied; retrying would count them twice
+            errors = len(e.details.get("writeErrors", []))
+            write_behind_failures_total.inc(self.collection_name, "write_error", amount=errors)
+            logger.error(f"{errors} counter updates to {self.collection_name} failed: {e}")
+        except Exception as e:
+            # Fold the counts back in so the next flush retries them
+            logger.error(f"Error flushing counters to {self.collection_name}: {e}")
+            for doc_id, (incs, on_insert) in counts.items():
+                entry = self._counts.setdefault(doc_id, [{}, on_insert])
+                for field, amount in incs.items():
+                    entry[0][field] = entry[0].get(field, 0) + amount
+            write_behind_pending.set(self.collection_name, value=len(self._counts))
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+
+status_check_buffer = WriteBehindBuffer("status_checks")
@@ -0,0 +1,197 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import urllib.request
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from dotenv import load_dotenv
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+# Fields whose value distribution says what the public site actually shows
+DISTRIBUTIONS = {
+    "properties": ["active", "featured"],
+    "experiences": ["active"],
+    "testimonials": ["approved"],
+    "booking_inquiries": ["status"],
+    "contacts": ["status"],
+    "jobs": ["status"],
+}
+POOL_METRICS = ("mongodb_pool_connections", "mongodb_pool_max_size", "mongodb_pool_checkout_failures_total")
+
+
+async def collection_stats(db: AsyncIOMotorDatabase, name: str) -> Dict[str, Any]:
+    """Sizes from $collStats and per-index usage from $indexStats"""
+    collection = db[name]
+    stats = (await collection.aggregate([{"$collStats": {"storageStats": {}}}]).to_list(1))[0]["storageStats"]
+    usage = {
+        doc["name"]: {"ops": doc["accesses"]["ops"], "since": doc["accesses"]["since"].isoformat()}
+        for doc in await collection.aggregate([{"$indexStats": {}}]).to_list(None)
+    }
+    indexes = {
+        index: {"size_bytes": size, **usage.get(index, {"ops": None, "since": None})}
+        for index, size in stats.get("indexSizes", {}).items()
+    }
+    return {
+        "count": stats.get("count", 0),
+        "size_bytes": stats.get("size", 0),
+        "avg_doc_bytes": stats.get("avgObjSize", 0),
+        "storage_bytes": stats.get("storageSize", 0),
+        "total_index_bytes": stats.get("totalIndexSize", 0),
+        "indexes": indexes,
+        # _id is used by every write, so it never counts as unused
+        "unused_indexes": sorted(i for i, info in indexes.items() if info["ops"] == 0 and i != "_id_"),
+    }
+
+
+async def distributions(db: AsyncIOMotorDatabase, collections: List[str]) -> Dict[str, Dict[str, Dict[str, int]]]:
+    result = {}
+    for name, fields in DISTRIBUTIONS.items():
+        if name not in collections:
+            continue
+        result[name] = {}
+        for field in fields:
+            counts = await db[name].aggregate([
+                {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+            ]).to_list(None)
+            result[name][field] = {str(doc["_id"]): doc["count"] for doc in counts}
+    return result
+
+
+async def slow_operations(client: AsyncIOMotorClient, db_name: str, threshold_ms: int) -> List[Dict[str, Any]]:
+    """In-progress operations on this database running longer than the threshold"""
+    cursor = client.admin.aggregate([
+        {"$currentOp": {"allUsers": True, "idleConnections": False}},
+        {"$match": {"ns": {"$regex": f"^{db_name}\\."}, "microsecs_running": {"$gte": threshold_ms * 1000}}},
+        {"$sort": {"microsecs_running": -1}},
+    ])
+    return [{
+        "opid": op.get("opid"),
+        "ns": op.get("ns"),
+        "op": op.get("op"),
+        "running_ms": op.get("microsecs_running", 0) // 1000,
+        "plan": op.get("planSummary"),
+        "comment": (op.get("command") or {}).get("comment"),
+        "waiting_for_lock": op.get("waitingForLock", False),
+    } async for op in cursor]
+
+
+def app_pool_metrics(metrics_url: str) -> Dict[str, float]:
+    """Driver pool gauges scraped from the running app's /metrics endpoint"""
+    with urllib.request.urlopen(metrics_url, timeout=5) as response:
+        text = response.read().decode()
+    return {
+        name: float(value)
+        for name, _, value in (line.rpartition(" ") for line in text.splitlines())
+        if name.startswith(POOL_METRICS)
+    }
+
+
+async def connections(client: AsyncIOMotorClient, metrics_url: Optional[str]) -> Dict[str, Any]:
+    status = await client.admin.command("serverStatus")
+    server = status.get("connections", {})
+    current, available = server.get("current", 0), server.get("available", 0)
+    result = {
+        "server": {
+            "current": current,
+            "available": available,
+            "active": server.get("active"),
+            "total_created": server.get("totalCreated"),
+            "utilization": round(current / (current + available), 4) if current + available else None,
+        },
+        "max_pool_size": client.options.pool_options.max_pool_size,
+    }
+    if metrics_url:
+        try:
+            result["app_pool"] = app_pool_metrics(metrics_url)
+        except Exception as e:
+            result["app_pool"] = {"error": str(e)}
+    return result
+
+
+async def diagnose(args) -> Dict[str, Any]:
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[args.db_name]
+    try:
+        names = sorted(n for n in await db.list_collection_names() if not n.startswith("system."))
+        collections = {}
+        for name in names:
+            try:
+                collections[name] = await collection_stats(db, name)
+            except Exception as e:
+                # Views and time-series buckets do not support every stage
+                collections[name] = {"error": str(e)}
+        return {
+            "generated_at": datetime.utcnow().isoformat(),
+            "database": args.db_name,
+            "collections": collections,
+            "distributions": await distributions(db, names),
+            "slow_operations": await slow_operations(client, args.db_name, args.slow_ms),
+            "connections": await connections(client, args.metrics_url),
+        }
+    finally:
+        client.close()
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    def mb(size):
+        return f"{size / 1024 / 1024:.1f} MB"
+
+    print(f"Database {report['database']} at {report['generated_at']}\n")
+    for name, stats in report["collections"].items():
+        if "error" in stats:
+            print(f"{name}: {stats['error']}")
+            continue
+        print(f"{name}: {stats['count']} docs, {mb(stats['size_bytes'])} data, "
+              f"avg {stats['avg_doc_bytes']} B, {mb(stats['total_index_bytes'])} indexes")
+        for index, info in stats["indexes"].items():
+            unused = "  ⚠️ unused" if index in stats["unused_indexes"] else ""
+            print(f"    {index:<36} {mb(info['size_bytes']):>10}  {info['ops']} ops{unused}")
+
+    print("\nValue distributions:")
+    for name, fields in report["distributions"].items():
+        for field, counts in fields.items():
+            print(f"    {name}.{field}: " + ", ".join(f"{v}={c}" for v, c in counts.items()))
+
+    print(f"\nOperations running longer than the threshold: {len(report['slow_operations'])}")
+    for op in report["slow_operations"]:
+        print(f"    #{op['opid']} {op['op']} {op['ns']} {op['running_ms']} ms {op['plan'] or ''}")
+
+    server = report["connections"]["server"]
+    print(f"\nConnections: {server['current']} open, {server['available']} available "
+          f"({(server['utilization'] or 0) * 100:.1f}% used), maxPoolSize {report['connections']['max_pool_size']}")
+    for metric, value in report["connections"].get("app_pool", {}).items():
+        print(f"    {metric} {value}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report collection sizes, index usage, slow operations and connections")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--append", metavar="FILE", help="Append the report as one JSON line, to track capacity over time")
+    parser.add_argument("--slow-ms", type=int, default=1000, help="Report operations running at least this long")
+    parser.add_argument("--metrics-url", help="App /metrics URL to include driver pool utilization")
+    parser.add_argument("--db-name", default=os.environ.get('DB_NAME'))
+    args = parser.parse_args()
+
+    try:
+        report = asyncio.run(diagnose(args))
+    except Exception as e:
+        print(f'Database error: {e}')
+        sys.exit(1)
+
+    if args.append:
+        with open(args.append, "a") as f:
+            f.write(json.dumps(report, default=str) + "\n")
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+    elif not args.append:
+        print_report(report)
+
+if __name__ == '__main__':
+    main()
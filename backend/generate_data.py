@@ -0,0 +1,360 @@
+import argparse
+import asyncio
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+import numpy as np
+from bson import ObjectId
+from dotenv import load_dotenv
+from pathlib import Path
+from pymongo import MongoClient
+
+from seed_data import PROPERTIES_DATA, EXPERIENCES_DATA, TESTIMONIALS_DATA
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+# Synthetic documents carry deterministic ObjectIds: 4-byte timestamp, 1-byte
+# collection tag, 7-byte index. Inquiries can then reference properties by
+# index without reading them back.
+COLLECTION_TAGS = {
+    "properties": 1,
+    "experiences": 2,
+    "testimonials": 3,
+    "booking_inquiries": 4,
+    "contacts": 5,
+}
+BASE_TIME = datetime(2023, 1, 1)
+
+PROPERTY_TYPES = ["Cottage", "Homestay", "Resort", "Tent", "Farmstay"]
+PROPERTY_TYPE_WEIGHTS = [0.35, 0.30, 0.15, 0.12, 0.08]
+TYPE_BASE_PRICE = {"Cottage": 2800, "Homestay": 2400, "Resort": 6500, "Tent": 1500, "Farmstay": 2600}
+ADJECTIVES = ["Misty", "Green", "Cloud", "Silver Oak", "Tea Garden", "Valley View", "Shola", "Pine",
+              "Strawberry", "Sunrise", "Hilltop", "Cardamom", "Eucalyptus", "Rainforest", "Mountain"]
+LOCATIONS = ["Vattavada, Munnar", "Vattavada Village", "Kovilur", "Kottakamboor", "Top Station Road",
+             "Pampadum Shola", "Koviloor Valley", "Chilanthiyar"]
+AMENITIES = ["Hot Water", "WiFi", "Parking", "Campfire", "BBQ Area", "Home-cooked Meals", "Garden",
+             "Restaurant", "Room Service", "Trekking Guide", "Bonfire", "Balcony", "Kitchen"]
+FIRST_NAMES = ["Arjun", "Priya", "Rahul", "Anjali", "Vishnu", "Meera", "Rohan", "Divya", "Akhil",
+               "Sneha", "Nikhil", "Aparna", "Karthik", "Lakshmi", "Siddharth", "Fathima", "Joseph", "Ananya"]
+LAST_NAMES = ["Nair", "Menon", "Pillai", "Kumar", "Thomas", "Varghese", "Iyer", "Sharma", "Reddy",
+              "Das", "George", "Krishnan", "Joseph", "Rao"]
+CITIES = ["Kochi", "Bangalore", "Chennai", "Thiruvananthapuram", "Kozhikode", "Coimbatore",
+          "Hyderabad", "Mumbai", "Madurai", "Thrissur"]
+SUBJECTS = ["Booking question", "Group booking", "Availability", "Directions", "Payment", "Feedback"]
+INQUIRY_STATUSES = ["pending", "contacted", "confirmed", "cancelled"]
+INQUIRY_STATUS_WEIGHTS = [0.45, 0.25, 0.20, 0.10]
+CONTACT_STATUSES = ["new", "read", "replied"]
+CONTACT_STATUS_WEIGHTS = [0.4, 0.3, 0.3]
+
+# Check-in seasons as (day of year, spread in days, weight): Christmas/New Year,
+# summer vacation, Onam; the remainder is spread over the year
+SEASONS = [(358, 10, 0.30), (130, 25, 0.30), (245, 12, 0.15)]
+OFF_SEASON_WEIGHT = 0.25
+
+
+def object_id(collection: str, index: int, created_at: datetime) -> ObjectId:
+    timestamp = int((created_at - datetime(1970, 1, 1)).total_seconds())
+    return ObjectId(struct.pack(">IB", timestamp, COLLECTION_TAGS[collection]) + index.to_bytes(7, "big"))
+
+
+def property_created_at(index: int) -> datetime:
+    # Monotonic so ids and created_at agree; one new listing every 10 minutes
+    return BASE_TIME + timedelta(minutes=10 * index)
+
+
+def property_id(index: int) -> str:
+    return str(object_id("properties", index, property_created_at(index)))
+
+
+def batch_rng(seed: int, collection: str, batch: int) -> np.random.Generator:
+    """Independent stream per batch so results don't depend on worker scheduling"""
+    return np.random.default_rng([seed, COLLECTION_TAGS[collection], batch])
+
+
+def popularity_weights(n: int, skew: float) -> np.ndarray:
+    """Zipf-like weights: a few properties get most of the inquiries"""
+    ranks = np.arange(1, n + 1, dtype=np.float64)
+    weights = 1.0 / ranks ** skew
+    return weights / weights.sum()
+
+
+def names(rng: np.random.Generator, size: int) -> List[str]:
+    first = rng.choice(FIRST_NAMES, size)
+    last = rng.choice(LAST_NAMES, size)
+    return [f"{f} {l}" for f, l in zip(first, last)]
+
+
+def gen_properties(rng, start: int, size: int, options) -> List[Dict]:
+    idx = np.arange(start, start + size)
+    types = rng.choice(PROPERTY_TYPES, size, p=PROPERTY_TYPE_WEIGHTS)
+    templates = rng.integers(0, len(PROPERTIES_DATA), size)
+    price_factor = rng.lognormal(0, 0.35, size)
+    capacity = rng.integers(2, 13, size)
+    rating = np.round(np.clip(rng.normal(4.3, 0.4, size), 2.5, 5.0), 1)
+    reviews = rng.zipf(1.8, size).clip(0, 2000)
+    amenity_counts = rng.integers(3, 8, size)
+    adjectives = rng.choice(ADJECTIVES, size)
+    locations = rng.choice(LOCATIONS, size)
+    active = rng.random(size) < 0.93
+    # Featured listings come from the top 2% by popularity rank
+    featured = (idx < options.properties * 0.02) & (rng.random(size) < 0.6)
+    docs = []
+    for i in range(size):
+        template = PROPERTIES_DATA[templates[i]]
+        created_at = property_created_at(int(idx[i]))
+        docs.append({
+            "_id": object_id("properties", int(idx[i]), created_at),
+            "title": f"{adjectives[i]} {types[i]} {idx[i]}",
+            "type": str(types[i]),
+            "price": int(round(TYPE_BASE_PRICE[types[i]] * price_factor[i], -2)),
+            "capacity": f"{capacity[i]} guests",
+            "capacity_guests": int(capacity[i]),
+            "rating": float(rating[i]),
+            "reviews": int(reviews[i]),
+            "image": template["image"],
+            "gallery": template.get("gallery", []),
+            "description": template["description"],
+            "amenities": [str(a) for a in rng.choice(AMENITIES, amenity_counts[i], replace=False)],
+            "location": str(locations[i]),
+            "attractions": template.get("attractions", []),
+            "room_categories": [],
+            "min_guests": 1,
+            "max_guests": int(capacity[i]),
+            "featured": bool(featured[i]),
+            "active": bool(active[i]),
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+    return docs
+
+
+def gen_experiences(rng, start: int, size: int, options) -> List[Dict]:
+    templates = rng.integers(0, len(EXPERIENCES_DATA), size)
+    price_factor = rng.lognormal(0, 0.3, size)
+    docs = []
+    for i in range(size):
+        index = start + i
+        template = EXPERIENCES_DATA[templates[i]]
+        created_at = BASE_TIME + timedelta(hours=6 * index)
+        docs.append({
+            "_id": object_id("experiences", index, created_at),
+            "title": f"{template['title']} #{index}",
+            "price": int(round(template["price"] * price_factor[i], -1)),
+            "duration": template["duration"],
+            "description": template["description"],
+            "image": template["image"],
+            "highlights": template.get("highlights", []),
+            "active": bool(rng.random() < 0.9),
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+    return docs
+
+
+def gen_testimonials(rng, start: int, size: int, options) -> List[Dict]:
+    templates = rng.integers(0, len(TESTIMONIALS_DATA), size)
+    ratings = rng.choice([5, 4, 3, 2, 1], size, p=[0.55, 0.30, 0.09, 0.04, 0.02])
+    offsets = rng.integers(0, options.days * 24 * 3600, size)
+    approved = rng.random(size) < 0.7
+    people = names(rng, size)
+    cities = rng.choice(CITIES, size)
+    docs = []
+    for i in range(size):
+        template = TESTIMONIALS_DATA[templates[i]]
+        created_at = BASE_TIME + timedelta(seconds=int(offsets[i]))
+        docs.append({
+            "_id": object_id("testimonials", start + i, created_at),
+            "name": people[i],
+            "location": str(cities[i]),
+            "rating": int(ratings[i]),
+            "text": template["text"],
+            "image": template.get("image"),
+            "approved": bool(approved[i]),
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+    return docs
+
+
+def seasonal_check_ins(rng, size: int, days: int) -> np.ndarray:
+    """Day offsets from BASE_TIME clustered around the peak seasons"""
+    years = rng.integers(0, max(days // 365, 1), size)
+    weights = np.array([w for _, _, w in SEASONS] + [OFF_SEASON_WEIGHT])
+    season = rng.choice(len(weights), size, p=weights / weights.sum())
+    day_of_year = rng.integers(0, 365, size).astype(np.float64)
+    for k, (center, spread, _) in enumerate(SEASONS):
+        mask = season == k
+        day_of_year[mask] = rng.normal(center, spread, mask.sum())
+    return np.clip(years * 365 + np.mod(day_of_year, 365), 0, days + 180).astype(np.int64)
+
+
+def gen_inquiries(rng, start: int, size: int, options) -> List[Dict]:
+    popular = popularity_weights(options.properties, options.skew)
+    property_idx = rng.choice(options.properties, size, p=popular)
+    check_in = seasonal_check_ins(rng, size, options.days)
+    nights = rng.choice([1, 2, 3, 4, 5, 7], size, p=[0.25, 0.35, 0.2, 0.1, 0.06, 0.04])
+    lead_days = np.minimum(rng.exponential(21, size), check_in).astype(np.int64)
+    seconds = rng.integers(0, 24 * 3600, size)
+    guests = rng.choice(np.arange(1, 11), size, p=[0.05, 0.35, 0.1, 0.25, 0.05, 0.1, 0.03, 0.04, 0.01, 0.02])
+    statuses = rng.choice(INQUIRY_STATUSES, size, p=INQUIRY_STATUS_WEIGHTS)
+    phones = rng.integers(6000000000, 9999999999, size)
+    has_email = rng.random(size) < 0.6
+    people = names(rng, size)
+    docs = []
+    for i in range(size):
+        check_in_date = BASE_TIME + timedelta(days=int(check_in[i]))
+        created_at = check_in_date - timedelta(days=int(lead_days[i])) + timedelta(seconds=int(seconds[i]))
+        name = people[i]
+        docs.append({
+            "_id": object_id("booking_inquiries", start + i, created_at),
+            "name": name,
+            "phone": f"+91-{phones[i]}",
+            "email": f"{name.lower().replace(' ', '.')}{start + i}@example.com" if has_email[i] else None,
+            "guests": int(guests[i]),
+            "message": None,
+            "property_id": property_id(int(property_idx[i])),
+            "property_title": None,
+            "check_in_date": check_in_date,
+            "check_out_date": check_in_date + timedelta(days=int(nights[i])),
+            "status": str(statuses[i]),
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+    return docs
+
+
+def gen_contacts(rng, start: int, size: int, options) -> List[Dict]:
+    offsets = rng.integers(0, options.days * 24 * 3600, size)
+    subjects = rng.choice(SUBJECTS, size)
+    statuses = rng.choice(CONTACT_STATUSES, size, p=CONTACT_STATUS_WEIGHTS)
+    people = names(rng, size)
+    docs = []
+    for i in range(size):
+        created_at = BASE_TIME + timedelta(seconds=int(offsets[i]))
+        docs.append({
+            "_id": object_id("contacts", start + i, created_at),
+            "name": people[i],
+            "email": f"{people[i].lower().replace(' ', '.')}{start + i}@example.com",
+            "phone": None,
+            "subject": str(subjects[i]),
+            "message": f"Hello, I have a question about {subjects[i].lower()}.",
+            "status": str(statuses[i]),
+            "created_at": created_at,
+            "updated_at": created_at,
+        })
+    return docs
+
+
+GENERATORS = {
+    "properties": gen_properties,
+    "experiences": gen_experiences,
+    "testimonials": gen_testimonials,
+    "booking_inquiries": gen_inquiries,
+    "contacts": gen_contacts,
+}
+
+_client = None
+
+
+def load_batch(collection: str, batch: int, start: int, size: int, options) -> Tuple[str, int]:
+    """Generate and insert one batch; runs in a worker process"""
+    global _client
+    if _client is None:
+        _client = MongoClient(os.environ['MONGO_URL'], w=options.write_concern)
+    docs = GENERATORS[collection](batch_rng(options.seed, collection, batch), start, size, options)
+    if not options.dry_run:
+        _client[options.db_name][collection].insert_many(
+            docs, ordered=False, bypass_document_validation=True
+        )
+    return collection, len(docs)
+
+
+async def create_indexes(db_name: str):
+    """Build the production indexes once the bulk load is done"""
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from models.Property import PropertyService
+    from models.Experience import ExperienceService
+    from models.Testimonial import TestimonialService
+    from models.BookingInquiry import BookingInquiryService
+    from models.Contact import ContactService
+
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[db_name]
+    for service in (PropertyService, ExperienceService, TestimonialService, BookingInquiryService, ContactService):
+        await service(db).ensure_indexes()
+    client.close()
+
+
+def generate(options):
+    counts = {
+        "properties": options.properties,
+        "experiences": options.experiences,
+        "testimonials": options.testimonials,
+        "booking_inquiries": options.inquiries,
+        "contacts": options.contacts,
+    }
+    if options.inquiries and not options.properties:
+        raise SystemExit("Inquiries reference properties; --properties must be > 0")
+
+    if options.drop and not options.dry_run:
+        client = MongoClient(os.environ['MONGO_URL'])
+        for collection in counts:
+            client[options.db_name].drop_collection(collection)
+        client.close()
+
+    tasks = []
+    for collection, total in counts.items():
+        for batch, start in enumerate(range(0, total, options.batch_size)):
+            tasks.append((collection, batch, start, min(options.batch_size, total - start)))
+
+    print(f"Generating {sum(counts.values()):,} documents in {len(tasks)} batches "
+          f"with {options.workers} workers (seed {options.seed})...")
+    started = time.perf_counter()
+    done = {collection: 0 for collection in counts}
+    with ProcessPoolExecutor(max_workers=options.workers) as pool:
+        futures = [pool.submit(load_batch, *task, options) for task in tasks]
+        for i, future in enumerate(as_completed(futures), 1):
+            collection, inserted = future.result()
+            done[collection] += inserted
+            if i % max(len(futures) // 20, 1) == 0 or i == len(futures):
+                elapsed = time.perf_counter() - started
+                total_done = sum(done.values())
+                print(f"  {i}/{len(futures)} batches, {total_done:,} docs, {total_done / elapsed:,.0f} docs/s")
+
+    if not options.dry_run and not options.skip_indexes:
+        print("Building indexes...")
+        asyncio.run(create_indexes(options.db_name))
+
+    elapsed = time.perf_counter() - started
+    for collection, count in done.items():
+        print(f"{collection}: {count:,}")
+    print(f"Finished in {elapsed:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate deterministic synthetic data at scale")
+    parser.add_argument("--properties", type=int, default=1000)
+    parser.add_argument("--experiences", type=int, default=50)
+    parser.add_argument("--testimonials", type=int, default=2000)
+    parser.add_argument("--inquiries", type=int, default=100000)
+    parser.add_argument("--contacts", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--days", type=int, default=730, help="History span for created_at values")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent for property popularity")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--write-concern", type=int, default=1, help="w for bulk inserts (0 is fastest)")
+    parser.add_argument("--db-name", default=os.environ.get('DB_NAME'))
+    parser.add_argument("--drop", action="store_true", help="Drop the target collections first")
+    parser.add_argument("--skip-indexes", action="store_true")
+    parser.add_argument("--dry-run", action="store_true", help="Generate without inserting")
+    generate(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import asyncio
+import os
+import sys
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+from pathlib import Path
+from pymongo.write_concern import WriteConcern
+from core.migrations import MigrationLocked, MigrationRunner, load_migrations
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+async def run(args):
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[args.db_name]
+    try:
+        migrations = load_migrations()
+        write_concern = None
+        if args.write_concern:
+            w = int(args.write_concern) if args.write_concern.isdigit() else args.write_concern
+            write_concern = WriteConcern(w=w)
+        runner = MigrationRunner(
+            db,
+            batch_size=args.batch_size,
+            pause=args.pause,
+            duty_cycle=args.duty_cycle,
+            dry_run=args.dry_run,
+            write_concern=write_concern
+        )
+
+        if args.command == "status":
+            for row in await runner.status(migrations):
+                finished = f" at {row['finished_at']:%Y-%m-%d %H:%M}" if row['finished_at'] else ""
+                progress = f" (step {row['step'] + 1}, {row['processed']} processed)" if row['status'] not in ("done", "pending") else ""
+                print(f"{row['version']:04d}_{row['name']:<32} {row['status']}{progress}{finished}")
+            return 0
+
+        applied = await runner.run(migrations, target=args.target)
+        if not applied:
+            print("No pending migrations.")
+        return 0
+    except MigrationLocked as e:
+        print(f"Error: {e}")
+        return 1
+    finally:
+        client.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply numbered data migrations in throttled, resumable batches")
+    parser.add_argument("command", choices=["up", "status"], nargs="?", default="up")
+    parser.add_argument("--target", type=int, help="Stop after this migration version")
+    parser.add_argument("--dry-run", action="store_true", help="Show matching counts and sample updates without writing")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.1, help="Minimum seconds between batches")
+    parser.add_argument("--duty-cycle", type=float, default=0.5,
+                        help="Fraction of time spent writing; slower batches get longer pauses")
+    parser.add_argument("--write-concern", help="w for batch writes, e.g. majority to wait for the secondaries")
+    parser.add_argument("--db-name", default=os.environ.get('DB_NAME'))
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,11 @@
+from core.migrations import Migration, Backfill
+
+# Listings created before the active flag existed never showed up in the catalog
+migration = Migration(
+    name="activate_catalog",
+    description="Set active=True on properties and experiences that have no active flag",
+    steps=[
+        Backfill("properties", {"active": {"$exists": False}}, lambda doc: {"$set": {"active": True}}, {"_id": 1}),
+        Backfill("experiences", {"active": {"$exists": False}}, lambda doc: {"$set": {"active": True}}, {"_id": 1}),
+    ],
+)
@@ -0,0 +1,10 @@
+from core.migrations import Migration, Backfill
+
+# Testimonials imported before moderation existed were curated by hand
+migration = Migration(
+    name="approve_legacy_testimonials",
+    description="Set approved=True on testimonials that have no approved flag",
+    steps=[
+        Backfill("testimonials", {"approved": {"$exists": False}}, lambda doc: {"$set": {"approved": True}}, {"_id": 1}),
+    ],
+)
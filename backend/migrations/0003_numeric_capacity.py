@@ -0,0 +1,30 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from core.migrations import Migration, Backfill
+from models.Property import PropertyService, parse_capacity
+
+
+def set_capacity_guests(doc):
+    guests = parse_capacity(doc.get("capacity"))
+    return {"$set": {"capacity_guests": guests}} if guests is not None else None
+
+
+async def replace_listing_index(db: AsyncIOMotorDatabase) -> None:
+    # active_created_price_capacity supersedes active_created_price
+    await PropertyService(db).ensure_indexes()
+    if "active_created_price" in await db.properties.index_information():
+        await db.properties.drop_index("active_created_price")
+
+
+migration = Migration(
+    name="numeric_capacity",
+    description="Store capacity as an integer capacity_guests field so the capacity filter can use an index",
+    steps=[
+        Backfill(
+            "properties",
+            {"capacity_guests": {"$exists": False}, "capacity": {"$type": "string"}},
+            set_capacity_guests,
+            {"capacity": 1}
+        ),
+    ],
+    after=replace_listing_index,
+)
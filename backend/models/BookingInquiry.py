@@ -3,11 +3,17 @@ from pydantic import BaseModel, Field, EmailStr
 from typing import Optional
 from datetime import datetime
 from bson import ObjectId
+from pymongo import DESCENDING
+from core.serialization import MongoModel
+from core.timeouts import query_options
+from core.jobs import outbox_job, ensure_outbox_index
+from core.idempotency import IdempotencyStore, content_keys, header_key, normalize_phone
+from models.PropertyActivity import record_activity
 import logging
 
 logger = logging.getLogger(__name__)
 
-class BookingInquiry(BaseModel):
+class BookingInquiry(MongoModel):
     id: Optional[str] = Field(None, alias="_id")
     name: str
     phone: str
@@ -22,13 +28,6 @@ class BookingInquiry(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        populate_by_name = True
-        json_encoders = {
-            ObjectId: str,
-            datetime: lambda v: v.isoformat()
-        }
-
 class BookingInquiryCreate(BaseModel):
     name: str
     phone: str
@@ -44,9 +43,24 @@ class BookingInquiryService:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.collection = db.booking_inquiries
+        self.idempotency = IdempotencyStore(db)
+
+    async def ensure_indexes(self) -> None:
+        """Create the indexes backing every inquiry query"""
+        await self.collection.create_index([("created_at", DESCENDING)], name="created")
+        await ensure_outbox_index(self.collection)
+
+    async def replay_inquiry(self, idempotency_key: Optional[str]) -> Optional[BookingInquiry]:
+        """The inquiry an earlier request with this Idempotency-Key created, if any"""
+        try:
+            original = await self.idempotency.replay(header_key("inquiry", idempotency_key))
+            return BookingInquiry(**original) if original else None
+        except Exception as e:
+            logger.error(f"Error replaying inquiry: {e}")
+            raise
 
-    async def create_inquiry(self, inquiry_data: BookingInquiryCreate) -> BookingInquiry:
-        """Create a new booking inquiry"""
+    async def create_inquiry(self, inquiry_data: BookingInquiryCreate, idempotency_key: Optional[str] = None) -> BookingInquiry:
+        """Create a new booking inquiry, returning the original one for retried submissions"""
         try:
             inquiry_dict = inquiry_data.dict()
             
@@ -67,12 +81,42 @@ class BookingInquiryService:
                 except:
                     inquiry_dict["check_out_date"] = None
             
+            # Same phone, property and dates within the window count as a retry
+            hash_keys = content_keys(
+                "inquiry",
+                normalize_phone(inquiry_dict["phone"]),
+                inquiry_dict.get("property_id"),
+                inquiry_dict["check_in_date"].date() if inquiry_dict.get("check_in_date") else None,
+                inquiry_dict["check_out_date"].date() if inquiry_dict.get("check_out_date") else None,
+            )
+            request_key = header_key("inquiry", idempotency_key)
+            
+            inquiry_id = ObjectId()
             inquiry_dict["created_at"] = datetime.utcnow()
             inquiry_dict["updated_at"] = datetime.utcnow()
             inquiry_dict["status"] = "pending"
+            inquiry_dict["_id"] = str(inquiry_id)
+            
+            original = await self.idempotency.claim(request_key, hash_keys, inquiry_dict)
+            if original:
+                return BookingInquiry(**original)
+            
+            # The notification job travels in the same document, so it is stored exactly when
+            # the inquiry is; the job workers' outbox relay moves it to the queue
+            job = outbox_job(
+                "inquiry.created",
+                {"inquiry_id": inquiry_dict["_id"], **{k: v for k, v in inquiry_dict.items() if k != "_id"}},
+                idempotency_key=f"inquiry:{inquiry_dict['_id']}:created"
+            )
+            
+            try:
+                await self.collection.insert_one({**inquiry_dict, "_id": inquiry_id, **job})
+            except Exception:
+                await self.idempotency.release([request_key] + hash_keys, inquiry_dict["_id"])
+                raise
             
-            result = await self.collection.insert_one(inquiry_dict)
-            inquiry_dict["_id"] = str(result.inserted_id)
+            if inquiry_dict.get("property_id"):
+                record_activity(inquiry_dict["property_id"], "inquiries")
             
             return BookingInquiry(**inquiry_dict)
         except Exception as e:
@@ -82,7 +126,7 @@ class BookingInquiryService:
     async def get_all_inquiries(self, limit: int = 100) -> list:
         """Get all booking inquiries (admin function)"""
         try:
-            cursor = self.collection.find({}).sort("created_at", -1).limit(limit)
+            cursor = self.collection.find({}, **query_options()).sort("created_at", -1).limit(limit)
             inquiries = []
             
             async for doc in cursor:
@@ -100,7 +144,7 @@ class BookingInquiryService:
             if not ObjectId.is_valid(inquiry_id):
                 return None
                 
-            doc = await self.collection.find_one({"_id": ObjectId(inquiry_id)})
+            doc = await self.collection.find_one({"_id": ObjectId(inquiry_id)}, **query_options())
             
             if doc:
                 doc["_id"] = str(doc["_id"])
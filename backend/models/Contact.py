@@ -3,11 +3,16 @@ from pydantic import BaseModel, Field, EmailStr
 from typing import Optional
 from datetime import datetime
 from bson import ObjectId
+from pymongo import DESCENDING
+from core.serialization import MongoModel
+from core.timeouts import query_options
+from core.jobs import outbox_job, ensure_outbox_index
+from core.idempotency import IdempotencyStore, content_keys, header_key
 import logging
 
 logger = logging.getLogger(__name__)
 
-class Contact(BaseModel):
+class Contact(MongoModel):
     id: Optional[str] = Field(None, alias="_id")
     name: str
     email: EmailStr
@@ -18,13 +23,6 @@ class Contact(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        populate_by_name = True
-        json_encoders = {
-            ObjectId: str,
-            datetime: lambda v: v.isoformat()
-        }
-
 class ContactCreate(BaseModel):
     name: str
     email: EmailStr
@@ -36,17 +34,56 @@ class ContactService:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.collection = db.contacts
+        self.idempotency = IdempotencyStore(db)
+
+    async def ensure_indexes(self) -> None:
+        """Create the indexes backing every contact query"""
+        await self.collection.create_index([("created_at", DESCENDING)], name="created")
+        await ensure_outbox_index(self.collection)
+
+    async def replay_contact(self, idempotency_key: Optional[str]) -> Optional[Contact]:
+        """The contact an earlier request with this Idempotency-Key created, if any"""
+        try:
+            original = await self.idempotency.replay(header_key("contact", idempotency_key))
+            return Contact(**original) if original else None
+        except Exception as e:
+            logger.error(f"Error replaying contact: {e}")
+            raise
 
-    async def create_contact(self, contact_data: ContactCreate) -> Contact:
-        """Create a new contact message"""
+    async def create_contact(self, contact_data: ContactCreate, idempotency_key: Optional[str] = None) -> Contact:
+        """Create a new contact message, returning the original one for retried submissions"""
         try:
             contact_dict = contact_data.dict()
+            
+            # Same sender and message within the window count as a retry
+            hash_keys = content_keys(
+                "contact", contact_dict["email"], contact_dict["subject"], contact_dict["message"]
+            )
+            request_key = header_key("contact", idempotency_key)
+            
+            contact_id = ObjectId()
             contact_dict["created_at"] = datetime.utcnow()
             contact_dict["updated_at"] = datetime.utcnow()
             contact_dict["status"] = "new"
+            contact_dict["_id"] = str(contact_id)
+            
+            original = await self.idempotency.claim(request_key, hash_keys, contact_dict)
+            if original:
+                return Contact(**original)
+            
+            # The notification job travels in the same document, so it is stored exactly when
+            # the contact is; the job workers' outbox relay moves it to the queue
+            job = outbox_job(
+                "contact.created",
+                {"contact_id": contact_dict["_id"], **{k: v for k, v in contact_dict.items() if k != "_id"}},
+                idempotency_key=f"contact:{contact_dict['_id']}:created"
+            )
             
-            result = await self.collection.insert_one(contact_dict)
-            contact_dict["_id"] = str(result.inserted_id)
+            try:
+                await self.collection.insert_one({**contact_dict, "_id": contact_id, **job})
+            except Exception:
+                await self.idempotency.release([request_key] + hash_keys, contact_dict["_id"])
+                raise
             
             return Contact(**contact_dict)
         except Exception as e:
@@ -56,7 +93,7 @@ class ContactService:
     async def get_all_contacts(self, limit: int = 100) -> list:
         """Get all contact messages (admin function)"""
         try:
-            cursor = self.collection.find({}).sort("created_at", -1).limit(limit)
+            cursor = self.collection.find({}, **query_options()).sort("created_at", -1).limit(limit)
             contacts = []
             
             async for doc in cursor:
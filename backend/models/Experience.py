@@ -1,13 +1,24 @@
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from core.serialization import MongoModel
+from core.timeouts import aggregate_options, query_options
+from core.media import ResponsiveImage, build_image_set
+import re
+import os
 import logging
 
 logger = logging.getLogger(__name__)
 
-class Experience(BaseModel):
+# Fields experience cards never show; left out of bundled card payloads
+CARD_EXCLUDE = {"highlights", "created_at", "updated_at"}
+# Related experiences are ranked among this many of the newest, so the read stays on the active_created index
+RELATED_CANDIDATES = int(os.environ.get('RELATED_EXPERIENCE_CANDIDATES', '200'))
+
+class Experience(MongoModel):
     id: Optional[str] = Field(None, alias="_id")
     title: str
     price: int
@@ -19,12 +30,10 @@ class Experience(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        populate_by_name = True
-        json_encoders = {
-            ObjectId: str,
-            datetime: lambda v: v.isoformat()
-        }
+    @computed_field
+    @property
+    def image_set(self) -> Optional[ResponsiveImage]:
+        return build_image_set(self.image)
 
 class ExperienceCreate(BaseModel):
     title: str
@@ -39,6 +48,13 @@ class ExperienceService:
         self.db = db
         self.collection = db.experiences
 
+    async def ensure_indexes(self) -> None:
+        """Create the indexes backing every experience query"""
+        await self.collection.create_index(
+            [("active", ASCENDING), ("created_at", DESCENDING)],
+            name="active_created"
+        )
+
     async def create_experience(self, experience_data: ExperienceCreate) -> Experience:
         """Create a new experience"""
         try:
@@ -54,10 +70,10 @@ class ExperienceService:
             logger.error(f"Error creating experience: {e}")
             raise
 
-    async def get_all_experiences(self) -> List[Experience]:
-        """Get all active experiences"""
+    async def get_all_experiences(self, limit: int = 0) -> List[Experience]:
+        """Get active experiences, newest first; limit 0 means all"""
         try:
-            cursor = self.collection.find({"active": True}).sort("created_at", -1)
+            cursor = self.collection.find({"active": True}, **query_options()).sort("created_at", -1).limit(limit)
             experiences = []
             
             async for doc in cursor:
@@ -69,6 +85,32 @@ class ExperienceService:
             logger.error(f"Error getting experiences: {e}")
             raise
 
+    async def get_related_experiences(self, terms: List[str], limit: int) -> List[Experience]:
+        """Active experiences mentioning any of terms first, then the newest"""
+        try:
+            pattern = "|".join(re.escape(t) for t in terms if t) or "$^"
+            cursor = self.collection.aggregate([
+                {"$match": {"active": True}},
+                {"$sort": {"created_at": -1}},
+                {"$limit": RELATED_CANDIDATES},
+                {"$project": {"highlights": 0}},
+                {"$addFields": {"_related": {"$or": [
+                    {"$regexMatch": {"input": "$title", "regex": pattern, "options": "i"}},
+                    {"$regexMatch": {"input": "$description", "regex": pattern, "options": "i"}},
+                ]}}},
+                {"$sort": {"_related": -1, "created_at": -1}},
+                {"$limit": limit},
+                {"$project": {"_related": 0}},
+            ], **aggregate_options())
+            experiences = []
+            async for doc in cursor:
+                doc["_id"] = str(doc["_id"])
+                experiences.append(Experience(**doc))
+            return experiences
+        except Exception as e:
+            logger.error(f"Error getting related experiences: {e}")
+            raise
+
     async def get_experience_by_id(self, experience_id: str) -> Optional[Experience]:
         """Get experience by ID"""
         try:
@@ -78,7 +120,7 @@ class ExperienceService:
             doc = await self.collection.find_one({
                 "_id": ObjectId(experience_id), 
                 "active": True
-            })
+            }, **query_options())
             
             if doc:
                 doc["_id"] = str(doc["_id"])
@@ -0,0 +1,176 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import Field
+from typing import List, Optional, Set
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import ASCENDING
+from core.serialization import MongoModel
+from core.timeouts import query_options
+from core import media
+import asyncio
+import mimetypes
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+MEDIA_VARIANT_SYNC_INTERVAL = float(os.environ.get('MEDIA_VARIANT_SYNC_INTERVAL', '30'))
+# Each sync re-reads assets updated this long before the previous one, covering clock skew between workers
+MEDIA_VARIANT_SYNC_OVERLAP = 60
+
+# The loop only keeps weak references to tasks, so variant jobs are held here until they finish
+_variant_tasks: Set[asyncio.Task] = set()
+
+class MediaVariant(MongoModel):
+    width: int
+    format: str
+    url: str
+    size: int
+
+class MediaAsset(MongoModel):
+    id: Optional[str] = Field(None, alias="_id")
+    filename: str
+    content_type: str
+    url: str
+    size: int
+    status: str = "processing"  # processing, ready, failed
+    variants: List[MediaVariant] = []
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class MediaService:
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db.media
+        self.storage = media.get_storage()
+
+    async def ensure_indexes(self) -> None:
+        """Create the indexes backing every media query"""
+        # MediaVariantSync reads assets that became ready since its last pass
+        await self.collection.create_index(
+            [("status", ASCENDING), ("updated_at", ASCENDING)],
+            name="status_updated"
+        )
+
+    async def upload(self, filename: str, data: bytes, content_type: Optional[str] = None) -> MediaAsset:
+        """Store the original image and schedule variant generation"""
+        try:
+            if media.Image is None:
+                raise ValueError("Image processing is not available (Pillow is not installed)")
+
+            content_type = content_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            if not content_type.startswith("image/"):
+                raise ValueError("Only image uploads are supported")
+
+            asset_id = ObjectId()
+            extension = mimetypes.guess_extension(content_type) or ""
+            url = await asyncio.to_thread(
+                self.storage.save, f"{asset_id}/original{extension}", data, content_type
+            )
+
+            asset_dict = {
+                "_id": asset_id,
+                "filename": filename,
+                "content_type": content_type,
+                "url": url,
+                "size": len(data),
+                "status": "processing",
+                "variants": [],
+                "created_at": datetime.utcnow(),
+                "updated_at": datetime.utcnow(),
+            }
+            await self.collection.insert_one(asset_dict)
+            task = asyncio.create_task(self.generate_variants(str(asset_id), data))
+            _variant_tasks.add(task)
+            task.add_done_callback(_variant_tasks.discard)
+
+            asset_dict["_id"] = str(asset_id)
+            return MediaAsset(**asset_dict)
+        except Exception as e:
+            logger.error(f"Error uploading media: {e}")
+            raise
+
+    async def generate_variants(self, asset_id: str, data: bytes) -> None:
+        """Resize in the process pool, upload variants and mark the asset ready"""
+        try:
+            loop = asyncio.get_running_loop()
+            rendered = await loop.run_in_executor(
+                media.get_process_pool(),
+                media.render_variants,
+                data,
+                media.VARIANT_WIDTHS,
+                media.variant_formats(),
+            )
+
+            variants = []
+            for width, fmt, body in rendered:
+                url = await asyncio.to_thread(
+                    self.storage.save, media.variant_key(asset_id, width, fmt), body, f"image/{fmt}"
+                )
+                variants.append({"width": width, "format": fmt, "url": url, "size": len(body)})
+
+            await self.collection.update_one(
+                {"_id": ObjectId(asset_id)},
+                {"$set": {"status": "ready", "variants": variants, "updated_at": datetime.utcnow()}}
+            )
+            media.record_variants(asset_id, variants)
+        except Exception as e:
+            logger.error(f"Error generating media variants for {asset_id}: {e}")
+            await self.collection.update_one(
+                {"_id": ObjectId(asset_id)},
+                {"$set": {"status": "failed", "updated_at": datetime.utcnow()}}
+            )
+
+    async def get_asset_by_id(self, asset_id: str) -> Optional[MediaAsset]:
+        """Get media asset by ID"""
+        try:
+            if not ObjectId.is_valid(asset_id):
+                return None
+
+            doc = await self.collection.find_one({"_id": ObjectId(asset_id)}, **query_options())
+
+            if doc:
+                doc["_id"] = str(doc["_id"])
+                return MediaAsset(**doc)
+            return None
+        except Exception as e:
+            logger.error(f"Error getting media asset by ID: {e}")
+            raise
+
+class MediaVariantSync:
+    """Loads the variants recorded for ready assets, so srcset only lists files that exist"""
+
+    def __init__(self, interval: float = MEDIA_VARIANT_SYNC_INTERVAL):
+        self.interval = interval
+        # Start of the last successful pass; later passes only read assets updated after it
+        self.synced_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def load(self, db: AsyncIOMotorDatabase) -> None:
+        started = datetime.utcnow()
+        query = {"status": "ready"}
+        if self.synced_at is not None:
+            query["updated_at"] = {"$gte": self.synced_at - timedelta(seconds=MEDIA_VARIANT_SYNC_OVERLAP)}
+        async for doc in db.media.find(query, {"variants": 1}):
+            media.record_variants(str(doc["_id"]), doc.get("variants", []))
+        self.synced_at = started
+
+    async def start(self, db: AsyncIOMotorDatabase) -> None:
+        self._task = asyncio.create_task(self._run(db))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self, db: AsyncIOMotorDatabase) -> None:
+        # Picks up variants generated by other workers
+        while True:
+            try:
+                await self.load(db)
+            except Exception as e:
+                logger.error(f"Error loading media variants: {e}")
+            await asyncio.sleep(self.interval)
+
+media_variant_sync = MediaVariantSync()
@@ -1,13 +1,39 @@
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
 from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from pymongo.collation import Collation
+from core.serialization import MongoModel
+from core.timeouts import query_options
+from core.media import ResponsiveImage, build_image_set
+from core.similarity import similarity_index
+from core.migrations import DONE
 import logging
 
 logger = logging.getLogger(__name__)
 
-class Property(BaseModel):
+# Case-insensitive matching for the type filter, shared by the query and its index
+TYPE_COLLATION = Collation(locale="en", strength=2)
+# Fields listing cards never show; left out of bundled card payloads
+CARD_EXCLUDE = {"gallery", "gallery_set", "description", "attractions", "room_categories", "created_at", "updated_at"}
+# Migration that backfills capacity_guests; until it is done the capacity filter also parses capacity
+CAPACITY_MIGRATION = 3
+# Guest count parsed from the capacity string, for listings written before capacity_guests existed
+LEGACY_GUESTS = {"$convert": {
+    "input": {"$arrayElemAt": [{"$split": ["$capacity", " "]}, 0]},
+    "to": "int", "onError": 0, "onNull": 0,
+}}
+
+def parse_capacity(capacity: Optional[str]) -> Optional[int]:
+    """Guest count from a capacity string such as 4 guests"""
+    try:
+        return int(str(capacity).split()[0])
+    except (ValueError, IndexError):
+        return None
+
+class Property(MongoModel):
     id: Optional[str] = Field(None, alias="_id")
     title: str
     type: str  # Cottage, Resort, Homestay, Tent, Farmstay
@@ -29,12 +55,15 @@ class Property(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        populate_by_name = True
-        json_encoders = {
-            ObjectId: str,
-            datetime: lambda v: v.isoformat()
-        }
+    @computed_field
+    @property
+    def image_set(self) -> Optional[ResponsiveImage]:
+        return build_image_set(self.image)
+
+    @computed_field
+    @property
+    def gallery_set(self) -> List[ResponsiveImage]:
+        return [build_image_set(url) for url in self.gallery if url]
 
 class PropertyCreate(BaseModel):
     title: str
@@ -72,19 +101,52 @@ class PropertyUpdate(BaseModel):
     active: Optional[bool] = None
 
 class PropertyService:
+    # Checked once per process by ensure_indexes; restart workers after migrate.py up to drop the fallback
+    capacity_backfilled = False
+
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.collection = db.properties
 
+    async def ensure_indexes(self) -> None:
+        """Create the indexes backing every property query"""
+        state = await self.db.migrations.find_one({"_id": CAPACITY_MIGRATION}, {"status": 1})
+        PropertyService.capacity_backfilled = bool(state and state.get("status") == DONE)
+        if not PropertyService.capacity_backfilled:
+            logger.warning("capacity_guests backfill has not finished; capacity filters will also scan "
+                           "unmigrated listings until `python migrate.py up` has run")
+        # Equality, sort, range: listing with optional price and capacity ranges
+        await self.collection.create_index(
+            [("active", ASCENDING), ("created_at", DESCENDING), ("price", ASCENDING), ("capacity_guests", ASCENDING)],
+            name="active_created_price_capacity"
+        )
+        await self.collection.create_index(
+            [("active", ASCENDING), ("type", ASCENDING), ("created_at", DESCENDING), ("price", ASCENDING)],
+            name="active_type_created_price",
+            collation=TYPE_COLLATION
+        )
+        await self.collection.create_index(
+            [("featured", ASCENDING), ("active", ASCENDING), ("created_at", DESCENDING)],
+            name="featured_active_created"
+        )
+        # sort=trending; popularity is maintained by PropertyActivityService
+        await self.collection.create_index(
+            [("active", ASCENDING), ("popularity", DESCENDING), ("created_at", DESCENDING)],
+            name="active_popularity_created"
+        )
+
     async def create_property(self, property_data: PropertyCreate) -> Property:
         """Create a new property"""
         try:
             property_dict = property_data.dict()
+            property_dict["capacity_guests"] = parse_capacity(property_dict["capacity"])
+            property_dict["active"] = True
             property_dict["created_at"] = datetime.utcnow()
             property_dict["updated_at"] = datetime.utcnow()
             
             result = await self.collection.insert_one(property_dict)
             property_dict["_id"] = str(result.inserted_id)
+            await similarity_index.upsert(property_dict)
             
             return Property(**property_dict)
         except Exception as e:
@@ -95,10 +157,13 @@ class PropertyService:
         """Get all active properties with optional filters"""
         try:
             query = {"active": True}
+            collation = None
             
             if filters:
                 if "type" in filters and filters["type"] != "all":
-                    query["type"] = {"$regex": f"^{filters['type']}$", "$options": "i"}
+                    # Case-insensitive exact match served by active_type_created_price
+                    query["type"] = filters["type"]
+                    collation = TYPE_COLLATION
                 
                 if "min_price" in filters:
                     query["price"] = {"$gte": int(filters["min_price"])}
@@ -109,15 +174,17 @@ class PropertyService:
                     query["price"]["$lte"] = int(filters["max_price"])
                 
                 if "capacity" in filters:
-                    # Extract number from capacity string like "4 guests"
+                    # capacity_guests is backfilled by migration 0003_numeric_capacity
                     try:
                         min_capacity = int(filters["capacity"])
-                        query["$expr"] = {
-                            "$gte": [
-                                {"$toInt": {"$arrayElemAt": [{"$split": ["$capacity", " "]}, 0]}},
-                                min_capacity
-                            ]
-                        }
+                        if self.capacity_backfilled:
+                            query["capacity_guests"] = {"$gte": min_capacity}
+                        else:
+                            query["$and"] = [{"$or": [
+                                {"capacity_guests": {"$gte": min_capacity}},
+                                {"capacity_guests": {"$exists": False},
+                                 "$expr": {"$gte": [LEGACY_GUESTS, min_capacity]}},
+                            ]}]
                     except:
                         pass
                 
@@ -129,7 +196,11 @@ class PropertyService:
                         {"location": {"$regex": search_term, "$options": "i"}}
                     ]
             
-            cursor = self.collection.find(query).sort("created_at", -1)
+            sort = [("created_at", -1)]
+            if filters and filters.get("sort") == "trending":
+                sort = [("popularity", -1), ("created_at", -1)]
+            
+            cursor = self.collection.find(query, collation=collation, **query_options()).sort(sort)
             properties = []
             
             async for doc in cursor:
@@ -150,7 +221,7 @@ class PropertyService:
             doc = await self.collection.find_one({
                 "_id": ObjectId(property_id), 
                 "active": True
-            })
+            }, **query_options())
             
             if doc:
                 doc["_id"] = str(doc["_id"])
@@ -160,13 +231,13 @@ class PropertyService:
             logger.error(f"Error getting property by ID: {e}")
             raise
 
-    async def get_featured_properties(self) -> List[Property]:
-        """Get featured properties"""
+    async def get_featured_properties(self, limit: int = 0) -> List[Property]:
+        """Get featured properties, newest first; limit 0 means all"""
         try:
             cursor = self.collection.find({
                 "featured": True, 
                 "active": True
-            }).sort("created_at", -1)
+            }, **query_options()).sort("created_at", -1).limit(limit)
             
             properties = []
             async for doc in cursor:
@@ -178,6 +249,23 @@ class PropertyService:
             logger.error(f"Error getting featured properties: {e}")
             raise
 
+    async def get_properties_by_ids(self, property_ids: List[str], cards: bool = False) -> List[Property]:
+        """Get active properties by ID, in the order given"""
+        try:
+            object_ids = [ObjectId(pid) for pid in property_ids if ObjectId.is_valid(pid)]
+            if not object_ids:
+                return []
+            projection = {"gallery": 0, "attractions": 0, "room_categories": 0} if cards else None
+            cursor = self.collection.find({"_id": {"$in": object_ids}, "active": True}, projection, **query_options())
+            found = {}
+            async for doc in cursor:
+                doc["_id"] = str(doc["_id"])
+                found[doc["_id"]] = Property(**doc)
+            return [found[pid] for pid in property_ids if pid in found]
+        except Exception as e:
+            logger.error(f"Error getting properties by ID: {e}")
+            raise
+
     async def update_property(self, property_id: str, update_data: PropertyUpdate) -> Optional[Property]:
         """Update property"""
         try:
@@ -185,6 +273,8 @@ class PropertyService:
                 return None
             
             update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
+            if "capacity" in update_dict:
+                update_dict["capacity_guests"] = parse_capacity(update_dict["capacity"])
             update_dict["updated_at"] = datetime.utcnow()
             
             result = await self.collection.find_one_and_update(
@@ -195,6 +285,10 @@ class PropertyService:
             
             if result:
                 result["_id"] = str(result["_id"])
+                if result.get("active"):
+                    await similarity_index.upsert(result)
+                else:
+                    await similarity_index.remove(result["_id"])
                 return Property(**result)
             return None
         except Exception as e:
@@ -211,6 +305,7 @@ class PropertyService:
                 {"_id": ObjectId(property_id)},
                 {"$set": {"active": False, "updated_at": datetime.utcnow()}}
             )
+            await similarity_index.remove(property_id)
             
             return result.modified_count > 0
         except Exception as e:
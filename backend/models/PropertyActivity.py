@@ -0,0 +1,103 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING
+from typing import Optional
+from bson import ObjectId
+from datetime import datetime, timedelta
+from core.writebehind import IncrementBuffer
+import asyncio
+import math
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Activity older than the window no longer contributes to popularity
+POPULARITY_WINDOW_DAYS = int(os.environ.get('POPULARITY_WINDOW_DAYS', '60'))
+POPULARITY_HALF_LIFE_DAYS = float(os.environ.get('POPULARITY_HALF_LIFE_DAYS', '7'))
+POPULARITY_REFRESH_INTERVAL = float(os.environ.get('POPULARITY_REFRESH_INTERVAL', '300'))
+# An inquiry says far more about demand than a page view
+INQUIRY_WEIGHT = float(os.environ.get('POPULARITY_INQUIRY_WEIGHT', '20'))
+
+# Daily view/inquiry counts per property, flushed as batched $inc upserts
+activity_buffer = IncrementBuffer("property_activity")
+
+def record_activity(property_id: str, field: str) -> None:
+    """Count a view or inquiry for today; the write happens with the next flush"""
+    if not activity_buffer.running or not ObjectId.is_valid(property_id):
+        return
+    day = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    activity_buffer.incr(
+        f"{property_id}:{day:%Y-%m-%d}",
+        field,
+        on_insert={
+            "property_id": property_id,
+            "day": day,
+            "expires_at": day + timedelta(days=POPULARITY_WINDOW_DAYS + 1),
+        }
+    )
+
+class PropertyActivityService:
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db.property_activity
+
+    async def ensure_indexes(self) -> None:
+        """Create the indexes backing the popularity refresh"""
+        await self.collection.create_index([("day", ASCENDING)], name="day")
+        await self.collection.create_index("expires_at", expireAfterSeconds=0, name="expires")
+
+    async def refresh_popularity(self, now: Optional[datetime] = None) -> None:
+        """Recompute each property's time-decayed popularity score from its daily activity"""
+        now = now or datetime.utcnow()
+        decay_per_ms = math.log(2) / (POPULARITY_HALF_LIFE_DAYS * 86400 * 1000)
+        try:
+            await self.collection.aggregate([
+                {"$match": {"day": {"$gte": now - timedelta(days=POPULARITY_WINDOW_DAYS)}}},
+                {"$group": {
+                    "_id": "$property_id",
+                    "score": {"$sum": {"$multiply": [
+                        {"$add": [{"$ifNull": ["$views", 0]}, {"$multiply": [{"$ifNull": ["$inquiries", 0]}, INQUIRY_WEIGHT]}]},
+                        {"$exp": {"$multiply": [-decay_per_ms, {"$subtract": [now, "$day"]}]}},
+                    ]}},
+                }},
+                {"$project": {
+                    "_id": {"$toObjectId": "$_id"},
+                    "popularity": {"$round": ["$score", 4]},
+                    "popularity_updated_at": now,
+                }},
+                {"$merge": {"into": "properties", "on": "_id", "whenMatched": "merge", "whenNotMatched": "discard"}},
+            ]).to_list(None)
+            # Properties whose activity aged out of the window
+            await self.db.properties.update_many(
+                {"popularity": {"$gt": 0}, "popularity_updated_at": {"$lt": now}},
+                {"$set": {"popularity": 0, "popularity_updated_at": now}}
+            )
+        except Exception as e:
+            logger.error(f"Error refreshing popularity: {e}")
+            raise
+
+class PopularityTask:
+    """Refreshes popularity scores in the background"""
+
+    def __init__(self, interval: float = POPULARITY_REFRESH_INTERVAL):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, db: AsyncIOMotorDatabase) -> None:
+        self._task = asyncio.create_task(self._run(PropertyActivityService(db)))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self, service: PropertyActivityService) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await service.refresh_popularity()
+            except Exception:
+                pass  # logged by refresh_popularity; try again next interval
+
+popularity_task = PopularityTask()
@@ -0,0 +1,52 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import Field
+from typing import List, Optional
+from datetime import datetime
+from core.serialization import MongoModel
+from core.timeouts import query_options
+from core.profiler import SLOW_QUERY_COLLECTION
+import logging
+
+logger = logging.getLogger(__name__)
+
+class QueryPlan(MongoModel):
+    stages: List[str] = []
+    collscan: bool = False
+    in_memory_sort: bool = False
+    indexes: List[str] = []
+    docs_examined: Optional[int] = None
+    keys_examined: Optional[int] = None
+    n_returned: Optional[int] = None
+    execution_time_ms: Optional[int] = None
+
+class SlowQuery(MongoModel):
+    id: Optional[str] = Field(None, alias="_id")
+    collection: str
+    command: str
+    shape: str
+    shape_hash: str
+    duration_ms: float
+    plan: QueryPlan
+    created_at: datetime
+
+class SlowQueryService:
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db[SLOW_QUERY_COLLECTION]
+
+    async def get_recent(self, limit: int = 50, collscan_only: bool = False) -> List[SlowQuery]:
+        """Get the most recent slow query samples (admin function)"""
+        try:
+            query = {"plan.collscan": True} if collscan_only else {}
+            # Capped collections keep insertion order, so $natural is the cheap newest-first sort
+            cursor = self.collection.find(query, **query_options()).sort("$natural", -1).limit(limit)
+            samples = []
+
+            async for doc in cursor:
+                doc["_id"] = str(doc["_id"])
+                samples.append(SlowQuery(**doc))
+
+            return samples
+        except Exception as e:
+            logger.error(f"Error getting slow queries: {e}")
+            raise
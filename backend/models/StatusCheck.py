@@ -0,0 +1,164 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING
+from pymongo.errors import CollectionInvalid
+from typing import List, Optional
+from datetime import datetime, timedelta
+from core.serialization import MongoModel
+from core.timeouts import query_options
+from core.writebehind import status_check_buffer
+from core.leases import Lease
+import asyncio
+import uuid
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Raw checks only feed the rollups, so they are kept briefly
+STATUS_CHECK_TTL = int(os.environ.get('STATUS_CHECK_TTL', str(2 * 24 * 3600)))
+ROLLUP_TTL = {
+    "minute": timedelta(days=int(os.environ.get('STATUS_MINUTE_ROLLUP_DAYS', '14'))),
+    "hour": timedelta(days=int(os.environ.get('STATUS_HOUR_ROLLUP_DAYS', '400'))),
+}
+# Each pass recomputes these trailing spans, so late writes and the open window are picked up
+ROLLUP_LOOKBACK = {"minute": timedelta(hours=2), "hour": timedelta(days=2)}
+ROLLUP_INTERVAL = float(os.environ.get('STATUS_ROLLUP_INTERVAL', '60'))
+# Only the worker holding this lease rolls up; another takes over if it stops renewing
+ROLLUP_LEASE = 3 * ROLLUP_INTERVAL
+
+class StatusCheck(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    client_name: str
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+
+class StatusCheckCreate(BaseModel):
+    client_name: str
+
+class StatusWindow(MongoModel):
+    client_name: str
+    granularity: str  # minute, hour
+    start: datetime
+    count: int
+
+class StatusCheckService:
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db.status_checks
+        self.rollups = db.status_check_rollups
+
+    async def ensure_indexes(self) -> None:
+        """Create the time-series collection and the rollup indexes"""
+        try:
+            await self.db.create_collection(
+                "status_checks",
+                timeseries={"timeField": "timestamp", "metaField": "client_name", "granularity": "seconds"},
+                expireAfterSeconds=STATUS_CHECK_TTL
+            )
+        except CollectionInvalid:
+            # Already there; a legacy plain collection keeps working, just without the TTL
+            pass
+        await self.rollups.create_index(
+            [("granularity", ASCENDING), ("start", ASCENDING), ("client_name", ASCENDING)],
+            name="granularity_start_client"
+        )
+        await self.rollups.create_index("expires_at", expireAfterSeconds=0, name="expires")
+
+    async def create_status_check(self, status_data: StatusCheckCreate) -> StatusCheck:
+        """Record a status check"""
+        try:
+            status_obj = StatusCheck(**status_data.dict())
+            if status_check_buffer.running:
+                # Written with the next batch; the caller only needs the echo
+                await status_check_buffer.insert(status_obj.dict())
+            else:
+                await self.collection.insert_one(status_obj.dict())
+            return status_obj
+        except Exception as e:
+            logger.error(f"Error creating status check: {e}")
+            raise
+
+    async def roll_up(self, now: Optional[datetime] = None) -> None:
+        """Recompute per-minute counts from raw checks, then per-hour counts from the minutes"""
+        now = now or datetime.utcnow()
+        try:
+            await self._merge_windows(self.collection, {"timestamp": {"$gte": now - ROLLUP_LOOKBACK["minute"]}},
+                                      "$timestamp", "minute", {"$sum": 1})
+            await self._merge_windows(self.rollups, {
+                "granularity": "minute",
+                "start": {"$gte": now - ROLLUP_LOOKBACK["hour"]},
+            }, "$start", "hour", {"$sum": "$count"})
+        except Exception as e:
+            logger.error(f"Error rolling up status checks: {e}")
+            raise
+
+    async def _merge_windows(self, source, match: dict, time_field: str, granularity: str, count: dict) -> None:
+        await source.aggregate([
+            {"$match": match},
+            {"$group": {
+                "_id": {"client_name": "$client_name", "start": {"$dateTrunc": {"date": time_field, "unit": granularity}}},
+                "count": count,
+            }},
+            {"$project": {
+                "_id": {"granularity": granularity, "client_name": "$_id.client_name", "start": "$_id.start"},
+                "granularity": granularity,
+                "client_name": "$_id.client_name",
+                "start": "$_id.start",
+                "count": 1,
+                "expires_at": {"$add": ["$_id.start", int(ROLLUP_TTL[granularity].total_seconds() * 1000)]},
+            }},
+            {"$merge": {"into": "status_check_rollups", "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+        ]).to_list(None)
+
+    async def get_windows(self, granularity: str, since: datetime, client_name: Optional[str] = None) -> List[StatusWindow]:
+        """Aggregated counts per window, oldest first"""
+        try:
+            query = {"granularity": granularity, "start": {"$gte": since}}
+            if client_name:
+                query["client_name"] = client_name
+            cursor = self.rollups.find(query, {"_id": 0, "expires_at": 0}, **query_options()).sort("start", 1)
+            return [StatusWindow(**doc) async for doc in cursor]
+        except Exception as e:
+            logger.error(f"Error getting status windows: {e}")
+            raise
+
+class StatusRollupTask:
+    """Refreshes the status check rollups in the background, on one worker at a time"""
+
+    def __init__(self, interval: float = ROLLUP_INTERVAL):
+        self.interval = interval
+        self._lease: Optional[Lease] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, db: AsyncIOMotorDatabase) -> None:
+        self._lease = Lease(db, "status_rollup", ROLLUP_LEASE)
+        self._task = asyncio.create_task(self._run(StatusCheckService(db)))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        if self._lease:
+            try:
+                # Lets another worker take over without waiting for the lease to expire
+                await self._lease.release()
+            except Exception as e:
+                logger.warning(f"Could not release status rollup lease: {e}")
+        self._lease = None
+
+    async def _run(self, service: StatusCheckService) -> None:
+        while True:
+            try:
+                leader = await self._lease.acquire()
+            except Exception as e:
+                logger.error(f"Error acquiring status rollup lease: {e}")
+                leader = False
+            if leader:
+                try:
+                    await service.roll_up()
+                except Exception:
+                    pass  # logged by roll_up; try again next interval
+            await asyncio.sleep(self.interval)
+
+status_rollup_task = StatusRollupTask()
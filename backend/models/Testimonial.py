@@ -1,13 +1,24 @@
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, computed_field
+from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+from core.serialization import MongoModel
+from core.timeouts import aggregate_options, query_options
+from core.media import ResponsiveImage, build_image_set
+import re
+import os
 import logging
 
 logger = logging.getLogger(__name__)
 
-class Testimonial(BaseModel):
+# Fields testimonial cards never show; left out of bundled card payloads
+CARD_EXCLUDE = {"approved", "created_at", "updated_at"}
+# Related testimonials are ranked among this many of the newest, so the read stays on the approved_created index
+RELATED_CANDIDATES = int(os.environ.get('RELATED_TESTIMONIAL_CANDIDATES', '200'))
+
+class Testimonial(MongoModel):
     id: Optional[str] = Field(None, alias="_id")
     name: str
     location: str
@@ -18,12 +29,10 @@ class Testimonial(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        populate_by_name = True
-        json_encoders = {
-            ObjectId: str,
-            datetime: lambda v: v.isoformat()
-        }
+    @computed_field
+    @property
+    def image_set(self) -> Optional[ResponsiveImage]:
+        return build_image_set(self.image)
 
 class TestimonialCreate(BaseModel):
     name: str
@@ -37,6 +46,14 @@ class TestimonialService:
         self.db = db
         self.collection = db.testimonials
 
+    async def ensure_indexes(self) -> None:
+        """Create the indexes backing every testimonial query"""
+        await self.collection.create_index(
+            [("approved", ASCENDING), ("created_at", DESCENDING)],
+            name="approved_created"
+        )
+        await self.collection.create_index([("created_at", DESCENDING)], name="created")
+
     async def create_testimonial(self, testimonial_data: TestimonialCreate) -> Testimonial:
         """Create a new testimonial"""
         try:
@@ -53,10 +70,10 @@ class TestimonialService:
             logger.error(f"Error creating testimonial: {e}")
             raise
 
-    async def get_approved_testimonials(self) -> list:
-        """Get all approved testimonials"""
+    async def get_approved_testimonials(self, limit: int = 0) -> list:
+        """Get approved testimonials, newest first; limit 0 means all"""
         try:
-            cursor = self.collection.find({"approved": True}).sort("created_at", -1)
+            cursor = self.collection.find({"approved": True}, **query_options()).sort("created_at", -1).limit(limit)
             testimonials = []
             
             async for doc in cursor:
@@ -68,10 +85,32 @@ class TestimonialService:
             logger.error(f"Error getting approved testimonials: {e}")
             raise
 
+    async def get_related_testimonials(self, terms: List[str], limit: int) -> list:
+        """Approved testimonials mentioning any of terms first, then the newest"""
+        try:
+            pattern = "|".join(re.escape(t) for t in terms if t) or "$^"
+            cursor = self.collection.aggregate([
+                {"$match": {"approved": True}},
+                {"$sort": {"created_at": -1}},
+                {"$limit": RELATED_CANDIDATES},
+                {"$addFields": {"_related": {"$regexMatch": {"input": "$text", "regex": pattern, "options": "i"}}}},
+                {"$sort": {"_related": -1, "created_at": -1}},
+                {"$limit": limit},
+                {"$project": {"_related": 0}},
+            ], **aggregate_options())
+            testimonials = []
+            async for doc in cursor:
+                doc["_id"] = str(doc["_id"])
+                testimonials.append(Testimonial(**doc))
+            return testimonials
+        except Exception as e:
+            logger.error(f"Error getting related testimonials: {e}")
+            raise
+
     async def get_all_testimonials(self) -> list:
         """Get all testimonials (admin function)"""
         try:
-            cursor = self.collection.find({}).sort("created_at", -1)
+            cursor = self.collection.find({}, **query_options()).sort("created_at", -1)
             testimonials = []
             
             async for doc in cursor:
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import List
+from pymongo.errors import ExecutionTimeout
+from models.SlowQuery import SlowQueryService, SlowQuery
+from core.database import db
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+def get_slow_query_service():
+    return SlowQueryService(db)
+
+@router.get("/slow-queries", response_model=List[SlowQuery])
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=500),
+    collscan_only: bool = Query(False, description="Only show collection scans"),
+    service: SlowQueryService = Depends(get_slow_query_service)
+):
+    """Get recent slow query samples with their plan summaries (admin function)"""
+    try:
+        return await service.get_recent(limit, collscan_only)
+    except ExecutionTimeout:
+        raise HTTPException(status_code=504, detail="Query timed out")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching slow queries: {str(e)}")
@@ -1,20 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Header, Request
+from typing import List, Optional
+from pymongo.errors import ExecutionTimeout
 from models.BookingInquiry import BookingInquiryService, BookingInquiry, BookingInquiryCreate
-from motor.motor_asyncio import AsyncIOMotorDatabase
-import os
-from motor.motor_asyncio import AsyncIOMotorClient
-from dotenv import load_dotenv
-from pathlib import Path
-
-# Load environment variables
-ROOT_DIR = Path(__file__).parent.parent
-load_dotenv(ROOT_DIR / '.env')
-
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+from core.database import db
+from core.ratelimit import inquiry_limiter, RateLimitExceeded, client_ip, normalize_email
+from core.idempotency import normalize_phone
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
@@ -23,12 +13,35 @@ def get_booking_service():
 
 @router.post("/inquiry", response_model=BookingInquiry)
 async def submit_booking_inquiry(
+    request: Request,
     inquiry_data: BookingInquiryCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     service: BookingInquiryService = Depends(get_booking_service)
 ):
-    """Submit a booking inquiry"""
+    """Submit a booking inquiry; retries with the same Idempotency-Key return the original"""
+    if idempotency_key:
+        # A retry gets its original inquiry back without spending rate limit tokens
+        try:
+            original = await service.replay_inquiry(idempotency_key)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error submitting inquiry: {str(e)}")
+        if original:
+            return original
+    try:
+        # Checked in-process; counts are shared with other workers in the background
+        inquiry_limiter.hit(
+            ip=client_ip(request),
+            email=normalize_email(inquiry_data.email),
+            phone=normalize_phone(inquiry_data.phone)
+        )
+    except RateLimitExceeded as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many submissions, please try again later",
+            headers={"Retry-After": str(e.retry_after)}
+        )
     try:
-        inquiry = await service.create_inquiry(inquiry_data)
+        inquiry = await service.create_inquiry(inquiry_data, idempotency_key)
         return inquiry
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error submitting inquiry: {str(e)}")
@@ -42,6 +55,8 @@ async def get_booking_inquiries(
     try:
         inquiries = await service.get_all_inquiries(limit)
         return inquiries
+    except ExecutionTimeout:
+        raise HTTPException(status_code=504, detail="Query timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching inquiries: {str(e)}")
 
@@ -58,6 +73,8 @@ async def get_booking_inquiry(
         return inquiry
     except HTTPException:
         raise
+    except ExecutionTimeout:
+        raise HTTPException(status_code=504, detail="Query timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching inquiry: {str(e)}")
 
@@ -1,20 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Header, Request
+from typing import List, Optional
+from pymongo.errors import ExecutionTimeout
 from models.Contact import ContactService, Contact, ContactCreate
-from motor.motor_asyncio import AsyncIOMotorDatabase
-import os
-from motor.motor_asyncio import AsyncIOMotorClient
-from dotenv import load_dotenv
-from pathlib import Path
-
-# Load environment variables
-ROOT_DIR = Path(__file__).parent.parent
-load_dotenv(ROOT_DIR / '.env')
-
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+from core.database import db
+from core.ratelimit import contact_limiter, RateLimitExceeded, client_ip, normalize_email
+from core.idempotency import normalize_phone
 
 router = APIRouter(prefix="/contact", tags=["contact"])
 
@@ -23,12 +13,35 @@ def get_contact_service():
 
 @router.post("/", response_model=Contact)
 async def submit_contact_form(
+    request: Request,
     contact_data: ContactCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
     service: ContactService = Depends(get_contact_service)
 ):
-    """Submit a contact form"""
+    """Submit a contact form; retries with the same Idempotency-Key return the original"""
+    if idempotency_key:
+        # A retry gets its original contact back without spending rate limit tokens
+        try:
+            original = await service.replay_contact(idempotency_key)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error submitting contact form: {str(e)}")
+        if original:
+            return original
+    try:
+        # Checked in-process; counts are shared with other workers in the background
+        contact_limiter.hit(
+            ip=client_ip(request),
+            email=normalize_email(contact_data.email),
+            phone=normalize_phone(contact_data.phone)
+        )
+    except RateLimitExceeded as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many submissions, please try again later",
+            headers={"Retry-After": str(e.retry_after)}
+        )
     try:
-        contact = await service.create_contact(contact_data)
+        contact = await service.create_contact(contact_data, idempotency_key)
         return contact
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error submitting contact form: {str(e)}")
@@ -42,6 +55,8 @@ async def get_contact_messages(
     try:
         contacts = await service.get_all_contacts(limit)
         return contacts
+    except ExecutionTimeout:
+        raise HTTPException(status_code=504, detail="Query timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching contact messages: {str(e)}")
 
@@ -1,20 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from typing import List
+from pymongo.errors import ExecutionTimeout
 from models.Experience import ExperienceService, Experience, ExperienceCreate
-from motor.motor_asyncio import AsyncIOMotorDatabase
-import os
-from motor.motor_asyncio import AsyncIOMotorClient
-from dotenv import load_dotenv
-from pathlib import Path
-
-# Load environment variables
-ROOT_DIR = Path(__file__).parent.parent
-load_dotenv(ROOT_DIR / '.env')
-
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+from core.database import db
+from core.cache import catalog_cache, make_key
+from core.resilience import CircuitOpenError
 
 router = APIRouter(prefix="/experiences", tags=["experiences"])
 
@@ -22,11 +12,25 @@ def get_experience_service():
     return ExperienceService(db)
 
 @router.get("/", response_model=List[Experience])
-async def get_experiences(service: ExperienceService = Depends(get_experience_service)):
+async def get_experiences(
+    request: Request,
+    service: ExperienceService = Depends(get_experience_service)
+):
     """Get all experiences"""
     try:
-        experiences = await service.get_all_experiences()
-        return experiences
+        return await catalog_cache.respond(
+            request,
+            make_key("experiences", "list"),
+            service.get_all_experiences
+        )
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Catalog temporarily unavailable",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except ExecutionTimeout:
+        raise HTTPException(status_code=504, detail="Query timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching experiences: {str(e)}")
 
@@ -43,6 +47,8 @@ async def get_experience(
         return experience
     except HTTPException:
         raise
+    except ExecutionTimeout:
+        raise HTTPException(status_code=504, detail="Query timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching experience: {str(e)}")
 
@@ -54,6 +60,8 @@ async def create_experience(
     """Create a new experience (admin function)"""
     try:
         experience = await service.create_experience(experience_data)
+        catalog_cache.invalidate("experiences")
+        catalog_cache.invalidate("home")
         return experience
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating experience: {str(e)}")
\ No newline at end of file
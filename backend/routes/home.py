@@ -0,0 +1,66 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from pydantic import BaseModel
+from typing import Any, Dict, List
+from pymongo.errors import ExecutionTimeout
+from models.Property import PropertyService, CARD_EXCLUDE as PROPERTY_CARD_EXCLUDE
+from models.Experience import ExperienceService, CARD_EXCLUDE as EXPERIENCE_CARD_EXCLUDE
+from models.Testimonial import TestimonialService, CARD_EXCLUDE as TESTIMONIAL_CARD_EXCLUDE
+from core.database import db
+from core.cache import catalog_cache, make_key
+from core.resilience import CircuitOpenError
+import asyncio
+import os
+
+router = APIRouter(prefix="/home", tags=["home"])
+
+HOME_FEATURED_LIMIT = int(os.environ.get('HOME_FEATURED_LIMIT', '6'))
+HOME_EXPERIENCES_LIMIT = int(os.environ.get('HOME_EXPERIENCES_LIMIT', '3'))
+HOME_TESTIMONIALS_LIMIT = int(os.environ.get('HOME_TESTIMONIALS_LIMIT', '6'))
+
+class HomePage(BaseModel):
+    featured_properties: List[Dict[str, Any]]
+    experiences: List[Dict[str, Any]]
+    testimonials: List[Dict[str, Any]]
+
+async def _section(fetch, limit: int, exclude: set) -> List[Dict[str, Any]]:
+    if limit == 0:
+        return []
+    return [item.model_dump(mode="json", by_alias=True, exclude=exclude) for item in await fetch(limit)]
+
+@router.get("", response_model=HomePage)
+async def get_home(
+    request: Request,
+    featured: int = Query(HOME_FEATURED_LIMIT, ge=0, le=24, description="Featured properties to include"),
+    experiences: int = Query(HOME_EXPERIENCES_LIMIT, ge=0, le=24, description="Experiences to include"),
+    testimonials: int = Query(HOME_TESTIMONIALS_LIMIT, ge=0, le=24, description="Testimonials to include"),
+):
+    """Everything the home page needs for first paint, in one response"""
+    async def build() -> Dict[str, Any]:
+        # The three queries are independent, so they run concurrently
+        featured_properties, experience_list, testimonial_list = await asyncio.gather(
+            _section(PropertyService(db).get_featured_properties, featured, PROPERTY_CARD_EXCLUDE),
+            _section(ExperienceService(db).get_all_experiences, experiences, EXPERIENCE_CARD_EXCLUDE),
+            _section(TestimonialService(db).get_approved_testimonials, testimonials, TESTIMONIAL_CARD_EXCLUDE),
+        )
+        return {
+            "featured_properties": featured_properties,
+            "experiences": experience_list,
+            "testimonials": testimonial_list,
+        }
+
+    try:
+        return await catalog_cache.respond(
+            request,
+            make_key("home", featured=featured, experiences=experiences, testimonials=testimonials),
+            build
+        )
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Catalog temporarily unavailable",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except ExecutionTimeout:
+        raise HTTPException(status_code=504, detail="Query timed out")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching home page: {str(e)}")
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, HTTPException, Depends, File, UploadFile
+from pymongo.errors import ExecutionTimeout
+from models.Media import MediaService, MediaAsset
+from core.database import db
+import os
+
+router = APIRouter(prefix="/media", tags=["media"])
+
+MAX_UPLOAD_SIZE = int(os.environ.get('MEDIA_MAX_UPLOAD_SIZE', str(15 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+def get_media_service():
+    return MediaService(db)
+
+@router.post("/", response_model=MediaAsset)
+async def upload_media(
+    file: UploadFile = File(...),
+    service: MediaService = Depends(get_media_service)
+):
+    """Upload an image; resized variants are generated in the background (admin function)"""
+    try:
+        # Read in chunks so an oversized upload is rejected without holding all of it
+        chunks, size = [], 0
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > MAX_UPLOAD_SIZE:
+                raise HTTPException(status_code=413, detail="File too large")
+            chunks.append(chunk)
+        return await service.upload(file.filename, b"".join(chunks), file.content_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error uploading media: {str(e)}")
+
+@router.get("/{asset_id}", response_model=MediaAsset)
+async def get_media(
+    asset_id: str,
+    service: MediaService = Depends(get_media_service)
+):
+    """Get media asset with its variant status"""
+    try:
+        asset = await service.get_asset_by_id(asset_id)
+        if not asset:
+            raise HTTPException(status_code=404, detail="Media asset not found")
+        return asset
+    except HTTPException:
+        raise
+    except ExecutionTimeout:
+        raise HTTPException(status_code=504, detail="Query timed out")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching media asset: {str(e)}")
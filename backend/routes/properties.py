@@ -1,33 +1,54 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import List, Optional
-from models.Property import PropertyService, Property, PropertyCreate, PropertyUpdate
-from motor.motor_asyncio import AsyncIOMotorDatabase
-import os
-from motor.motor_asyncio import AsyncIOMotorClient
-from dotenv import load_dotenv
-from pathlib import Path
-
-# Load environment variables
-ROOT_DIR = Path(__file__).parent.parent
-load_dotenv(ROOT_DIR / '.env')
-
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from pymongo.errors import ExecutionTimeout
+from models.Property import PropertyService, Property, PropertyCreate, PropertyUpdate, CARD_EXCLUDE as PROPERTY_CARD_EXCLUDE
+from models.Experience import ExperienceService, CARD_EXCLUDE as EXPERIENCE_CARD_EXCLUDE
+from models.Testimonial import TestimonialService, CARD_EXCLUDE as TESTIMONIAL_CARD_EXCLUDE
+from core.database import db
+from core.cache import catalog_cache, property_page_cache, make_key
+from core.resilience import CircuitOpenError
+from core.singleflight import SingleFlight
+from core.similarity import similarity_index
+from models.PropertyActivity import record_activity
+import asyncio
 
 router = APIRouter(prefix="/properties", tags=["properties"])
 
+# Concurrent requests for the same property share one lookup
+detail_flights = SingleFlight()
+
+# Related content shown on the property page
+PAGE_SIMILAR_LIMIT = 3
+PAGE_EXPERIENCES_LIMIT = 3
+PAGE_TESTIMONIALS_LIMIT = 3
+
+class PropertyPage(BaseModel):
+    property: Property
+    similar_properties: List[Dict[str, Any]]
+    experiences: List[Dict[str, Any]]
+    testimonials: List[Dict[str, Any]]
+
+def property_version(property: Property) -> str:
+    """Cache version for a property page; legacy documents may lack updated_at or created_at"""
+    # Timestamps the document did not store are defaulted to now by the model, so they are not versions
+    for field in ("updated_at", "created_at"):
+        if field in property.model_fields_set:
+            return getattr(property, field).isoformat()
+    return ""
+
 def get_property_service():
     return PropertyService(db)
 
 @router.get("/", response_model=List[Property])
 async def get_properties(
+    request: Request,
     type: Optional[str] = Query(None, description="Property type filter"),
     min_price: Optional[int] = Query(None, description="Minimum price filter"),
     max_price: Optional[int] = Query(None, description="Maximum price filter"),
     capacity: Optional[int] = Query(None, description="Minimum capacity filter"),
     search: Optional[str] = Query(None, description="Search term"),
+    sort: Optional[str] = Query(None, pattern="^(newest|trending)$", description="newest (default) or trending"),
     service: PropertyService = Depends(get_property_service)
 ):
     """Get all properties with optional filters"""
@@ -43,18 +64,45 @@ async def get_properties(
             filters["capacity"] = capacity
         if search:
             filters["search"] = search
+        if sort == "trending":
+            filters["sort"] = sort
             
-        properties = await service.get_all_properties(filters)
-        return properties
+        return await catalog_cache.respond(
+            request,
+            make_key("properties", "list", **filters),
+            lambda: service.get_all_properties(filters)
+        )
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Catalog temporarily unavailable",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except ExecutionTimeout:
+        raise HTTPException(status_code=504, detail="Query timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching properties: {str(e)}")
 
 @router.get("/featured", response_model=List[Property])
-async def get_featured_properties(service: PropertyService = Depends(get_property_service)):
+async def get_featured_properties(
+    request: Request,
+    service: PropertyService = Depends(get_property_service)
+):
     """Get featured properties"""
     try:
-        properties = await service.get_featured_properties()
-        return properties
+        return await catalog_cache.respond(
+            request,
+            make_key("properties", "featured"),
+            service.get_featured_properties
+        )
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Catalog temporarily unavailable",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except ExecutionTimeout:
+        raise HTTPException(status_code=504, detail="Query timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching featured properties: {str(e)}")
 
@@ -65,15 +113,105 @@ async def get_property(
 ):
     """Get property by ID"""
     try:
-        property = await service.get_property_by_id(property_id)
+        property = await detail_flights.do(
+            make_key("properties", "detail", property_id),
+            lambda: service.get_property_by_id(property_id)
+        )
         if not property:
             raise HTTPException(status_code=404, detail="Property not found")
+        record_activity(property_id, "views")
         return property
     except HTTPException:
         raise
+    except ExecutionTimeout:
+        raise HTTPException(status_code=504, detail="Query timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching property: {str(e)}")
 
+@router.get("/{property_id}/full", response_model=PropertyPage)
+async def get_property_page(
+    request: Request,
+    property_id: str,
+    service: PropertyService = Depends(get_property_service)
+):
+    """Get a property with similar listings, related experiences and testimonials"""
+    try:
+        try:
+            # Through the page cache's breaker, so a failing database can still be answered from cache
+            property = await property_page_cache.breaker.call(lambda: service.get_property_by_id(property_id))
+        except Exception:
+            cached = property_page_cache.fallback(request, make_key("properties", "full", property_id))
+            if cached is None:
+                raise
+            record_activity(property_id, "views")
+            return cached
+        if not property:
+            raise HTTPException(status_code=404, detail="Property not found")
+        # Experiences and reviews that mention the listing's type or attractions come first
+        terms = [property.type] + [a.split(" - ")[0] for a in property.attractions]
+
+        async def build() -> Dict[str, Any]:
+            neighbor_ids = [pid for pid, _ in similarity_index.similar(property_id, PAGE_SIMILAR_LIMIT)]
+            similar, experiences, testimonials = await asyncio.gather(
+                service.get_properties_by_ids(neighbor_ids, cards=True),
+                ExperienceService(db).get_related_experiences(terms, PAGE_EXPERIENCES_LIMIT),
+                TestimonialService(db).get_related_testimonials(terms, PAGE_TESTIMONIALS_LIMIT),
+            )
+            return {
+                "property": property.model_dump(mode="json", by_alias=True),
+                "similar_properties": [p.model_dump(mode="json", by_alias=True, exclude=PROPERTY_CARD_EXCLUDE) for p in similar],
+                "experiences": [e.model_dump(mode="json", by_alias=True, exclude=EXPERIENCE_CARD_EXCLUDE) for e in experiences],
+                "testimonials": [t.model_dump(mode="json", by_alias=True, exclude=TESTIMONIAL_CARD_EXCLUDE) for t in testimonials],
+            }
+
+        # A new updated_at means a new key, so edits show up without invalidation
+        response = await property_page_cache.respond(
+            request,
+            make_key("properties", "full", property_id, version=property_version(property)),
+            build
+        )
+        record_activity(property_id, "views")
+        return response
+    except HTTPException:
+        raise
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Catalog temporarily unavailable",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except ExecutionTimeout:
+        raise HTTPException(status_code=504, detail="Query timed out")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching property page: {str(e)}")
+
+@router.get("/{property_id}/similar", response_model=List[Property])
+async def get_similar_properties(
+    request: Request,
+    property_id: str,
+    limit: int = Query(6, ge=1, le=12, description="Number of similar properties"),
+    service: PropertyService = Depends(get_property_service)
+):
+    """Get properties similar to this one, most similar first"""
+    try:
+        # Neighbours are precomputed, so this is one $in lookup
+        neighbor_ids = [pid for pid, _ in similarity_index.similar(property_id, limit)]
+        return await catalog_cache.respond(
+            request,
+            make_key("properties", "similar", property_id, limit=limit),
+            lambda: service.get_properties_by_ids(neighbor_ids)
+        )
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Catalog temporarily unavailable",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except ExecutionTimeout:
+        raise HTTPException(status_code=504, detail="Query timed out")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching similar properties: {str(e)}")
+
 @router.post("/", response_model=Property)
 async def create_property(
     property_data: PropertyCreate,
@@ -82,6 +220,8 @@ async def create_property(
     """Create a new property (admin function)"""
     try:
         property = await service.create_property(property_data)
+        catalog_cache.invalidate("properties")
+        catalog_cache.invalidate("home")
         return property
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating property: {str(e)}")
@@ -97,6 +237,8 @@ async def update_property(
         property = await service.update_property(property_id, property_data)
         if not property:
             raise HTTPException(status_code=404, detail="Property not found")
+        catalog_cache.invalidate("properties")
+        catalog_cache.invalidate("home")
         return property
     except HTTPException:
         raise
@@ -113,6 +255,8 @@ async def delete_property(
         success = await service.delete_property(property_id)
         if not success:
             raise HTTPException(status_code=404, detail="Property not found")
+        catalog_cache.invalidate("properties")
+        catalog_cache.invalidate("home")
         return {"message": "Property deleted successfully"}
     except HTTPException:
         raise
@@ -121,6 +265,7 @@ async def delete_property(
 
 @router.get("/search/filter", response_model=List[Property])
 async def search_properties(
+    request: Request,
     q: Optional[str] = Query(None, description="Search query"),
     type: Optional[str] = Query(None, description="Property type"),
     min_price: Optional[int] = Query(None, description="Minimum price"),
@@ -139,7 +284,18 @@ async def search_properties(
         if max_price is not None:
             filters["max_price"] = max_price
             
-        properties = await service.get_all_properties(filters)
-        return properties
+        return await catalog_cache.respond(
+            request,
+            make_key("properties", "list", **filters),
+            lambda: service.get_all_properties(filters)
+        )
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Catalog temporarily unavailable",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except ExecutionTimeout:
+        raise HTTPException(status_code=504, detail="Query timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error searching properties: {str(e)}")
\ No newline at end of file
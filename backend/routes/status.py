@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import List, Optional
+from datetime import datetime, timedelta
+from pymongo.errors import ExecutionTimeout
+from models.StatusCheck import StatusCheckService, StatusCheck, StatusCheckCreate, StatusWindow
+from core.database import db
+from core.writebehind import BufferFull
+
+router = APIRouter(prefix="/status", tags=["status"])
+
+def get_status_service():
+    return StatusCheckService(db)
+
+@router.post("", response_model=StatusCheck)
+async def create_status_check(
+    input: StatusCheckCreate,
+    service: StatusCheckService = Depends(get_status_service)
+):
+    """Record a status check"""
+    try:
+        return await service.create_status_check(input)
+    except BufferFull:
+        raise HTTPException(status_code=503, detail="Too many status checks, retry shortly", headers={"Retry-After": "1"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error recording status check: {str(e)}")
+
+@router.get("", response_model=List[StatusWindow])
+async def get_status_checks(
+    granularity: str = Query("minute", pattern="^(minute|hour)$"),
+    hours: int = Query(1, ge=1, le=24 * 400, description="How far back to report"),
+    client_name: Optional[str] = None,
+    service: StatusCheckService = Depends(get_status_service)
+):
+    """Status check counts per client and window, refreshed every minute"""
+    try:
+        return await service.get_windows(granularity, datetime.utcnow() - timedelta(hours=hours), client_name)
+    except ExecutionTimeout:
+        raise HTTPException(status_code=504, detail="Query timed out")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching status checks: {str(e)}")
@@ -1,20 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from typing import List
+from pymongo.errors import ExecutionTimeout
 from models.Testimonial import TestimonialService, Testimonial, TestimonialCreate
-from motor.motor_asyncio import AsyncIOMotorDatabase
-import os
-from motor.motor_asyncio import AsyncIOMotorClient
-from dotenv import load_dotenv
-from pathlib import Path
-
-# Load environment variables
-ROOT_DIR = Path(__file__).parent.parent
-load_dotenv(ROOT_DIR / '.env')
-
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+from core.database import db
+from core.cache import catalog_cache, make_key
+from core.resilience import CircuitOpenError
 
 router = APIRouter(prefix="/testimonials", tags=["testimonials"])
 
@@ -22,11 +12,25 @@ def get_testimonial_service():
     return TestimonialService(db)
 
 @router.get("/", response_model=List[Testimonial])
-async def get_testimonials(service: TestimonialService = Depends(get_testimonial_service)):
+async def get_testimonials(
+    request: Request,
+    service: TestimonialService = Depends(get_testimonial_service)
+):
     """Get all approved testimonials"""
     try:
-        testimonials = await service.get_approved_testimonials()
-        return testimonials
+        return await catalog_cache.respond(
+            request,
+            make_key("testimonials", "approved"),
+            service.get_approved_testimonials
+        )
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Catalog temporarily unavailable",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except ExecutionTimeout:
+        raise HTTPException(status_code=504, detail="Query timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching testimonials: {str(e)}")
 
@@ -48,6 +52,8 @@ async def get_all_testimonials(service: TestimonialService = Depends(get_testimo
     try:
         testimonials = await service.get_all_testimonials()
         return testimonials
+    except ExecutionTimeout:
+        raise HTTPException(status_code=504, detail="Query timed out")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching all testimonials: {str(e)}")
 
@@ -61,6 +67,8 @@ async def approve_testimonial(
         testimonial = await service.approve_testimonial(testimonial_id)
         if not testimonial:
             raise HTTPException(status_code=404, detail="Testimonial not found")
+        catalog_cache.invalidate("testimonials")
+        catalog_cache.invalidate("home")
         return testimonial
     except HTTPException:
         raise
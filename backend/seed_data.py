@@ -1,9 +1,12 @@
 import asyncio
 import os
+import sys
+from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorClient
-from models.Property import PropertyService, PropertyCreate
-from models.Experience import ExperienceService, ExperienceCreate
-from models.Testimonial import TestimonialService, TestimonialCreate
+from pymongo import UpdateOne
+from models.Property import PropertyCreate, parse_capacity
+from models.Experience import ExperienceCreate
+from models.Testimonial import TestimonialCreate
 from dotenv import load_dotenv
 from pathlib import Path
 
@@ -208,44 +211,45 @@ TESTIMONIALS_DATA = [
     }
 ]
 
-async def seed_database():
+def seed_upserts(records, model, natural_key, extra, now):
+    """One upsert per record, matched on its natural key; existing documents are left alone"""
+    operations = []
+    for record in records:
+        doc = {**model(**record).dict(), **extra(record), "created_at": now, "updated_at": now}
+        operations.append(UpdateOne(
+            {field: doc[field] for field in natural_key},
+            {"$setOnInsert": doc},
+            upsert=True
+        ))
+    return operations
+
+async def seed_database(force: bool = False):
     """Seed the database with initial data"""
     try:
         print("Starting database seeding...")
         
-        # Initialize services
-        property_service = PropertyService(db)
-        experience_service = ExperienceService(db)
-        testimonial_service = TestimonialService(db)
-        
-        # Check if data already exists
-        existing_properties = await property_service.get_all_properties()
-        if existing_properties:
+        # Served by the active_created_price_capacity index; stops at the first match
+        if not force and await db.properties.count_documents({"active": True}, limit=1):
             print("Database already contains properties. Skipping seeding.")
             return
         
-        # Seed Properties
-        print("Seeding properties...")
-        for prop_data in PROPERTIES_DATA:
-            property_create = PropertyCreate(**prop_data)
-            await property_service.create_property(property_create)
-            print(f"Created property: {prop_data['title']}")
-        
-        # Seed Experiences
-        print("Seeding experiences...")
-        for exp_data in EXPERIENCES_DATA:
-            experience_create = ExperienceCreate(**exp_data)
-            await experience_service.create_experience(experience_create)
-            print(f"Created experience: {exp_data['title']}")
-        
-        # Seed Testimonials (and approve them)
-        print("Seeding testimonials...")
-        for test_data in TESTIMONIALS_DATA:
-            testimonial_create = TestimonialCreate(**test_data)
-            testimonial = await testimonial_service.create_testimonial(testimonial_create)
-            # Approve the testimonial
-            await testimonial_service.approve_testimonial(testimonial.id)
-            print(f"Created and approved testimonial: {test_data['name']}")
+        # Seeds are written live: listed, and testimonials already approved
+        now = datetime.utcnow()
+        seeds = [
+            ("properties", PROPERTIES_DATA, PropertyCreate, ("title",),
+             lambda p: {"active": True, "capacity_guests": parse_capacity(p["capacity"])}),
+            ("experiences", EXPERIENCES_DATA, ExperienceCreate, ("title",),
+             lambda e: {"active": True}),
+            ("testimonials", TESTIMONIALS_DATA, TestimonialCreate, ("name", "location"),
+             lambda t: {"approved": True}),
+        ]
+        for collection, records, model, natural_key, extra in seeds:
+            result = await db[collection].bulk_write(
+                seed_upserts(records, model, natural_key, extra, now),
+                ordered=False
+            )
+            print(f"Seeded {collection}: {result.upserted_count} inserted, "
+                  f"{len(records) - result.upserted_count} already present")
         
         print("Database seeding completed successfully!")
         
@@ -256,4 +260,5 @@ async def seed_database():
         client.close()
 
 if __name__ == "__main__":
-    asyncio.run(seed_database())
\ No newline at end of file
+    # --force upserts the seeds even when properties already exist
+    asyncio.run(seed_database(force="--force" in sys.argv))
@@ -1,68 +1,75 @@
-from fastapi import FastAPI, APIRouter
+from fastapi import FastAPI, APIRouter, Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List
-import uuid
-from datetime import datetime
 
 # Import route modules
-from routes import properties, experiences, bookings, contact, testimonials
+from routes import properties, experiences, bookings, contact, testimonials, media, admin, status, home
+from core.database import client, db
+from core.serialization import FastJSONResponse
+from core.metrics import MetricsMiddleware, registry as metrics_registry
+from core.compression import CompressionMiddleware
+from core.timeouts import QueryBudgetMiddleware
+from core.concurrency import ConcurrencyLimitMiddleware
+from core import media as media_storage
+from core.jobs import JobQueue, JobWorkerPool, JOB_WORKERS
+from core.idempotency import IdempotencyStore
+from core.ratelimit import rate_limit_sync
+from core.writebehind import status_check_buffer
+from core.similarity import similarity_index
+from models.Property import PropertyService
+from models.Experience import ExperienceService
+from models.Testimonial import TestimonialService
+from models.BookingInquiry import BookingInquiryService
+from models.Contact import ContactService
+from models.Media import MediaService, media_variant_sync
+from models.StatusCheck import StatusCheckService, status_rollup_task
+from models.PropertyActivity import PropertyActivityService, activity_buffer, popularity_task
+from core.profiler import slow_query_profiler
+import core.job_handlers  # registers job handlers
+from starlette.staticfiles import StaticFiles
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
-
 # Create the main app without a prefix
-app = FastAPI(title="VattavadaBooking API", version="1.0.0")
+app = FastAPI(
+    title="VattavadaBooking API",
+    version="1.0.0",
+    default_response_class=FastJSONResponse
+)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
-# Define Models
-class StatusCheck(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    client_name: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-
-class StatusCheckCreate(BaseModel):
-    client_name: str
-
 # Add your routes to the router instead of directly to app
 @api_router.get("/")
 async def root():
     return {"message": "VattavadaBooking API is running!"}
 
-@api_router.post("/status", response_model=StatusCheck)
-async def create_status_check(input: StatusCheckCreate):
-    status_dict = input.dict()
-    status_obj = StatusCheck(**status_dict)
-    _ = await db.status_checks.insert_one(status_obj.dict())
-    return status_obj
-
-@api_router.get("/status", response_model=List[StatusCheck])
-async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
-    return [StatusCheck(**status_check) for status_check in status_checks]
-
 # Include all route modules
 api_router.include_router(properties.router)
 api_router.include_router(experiences.router)
 api_router.include_router(bookings.router)
 api_router.include_router(contact.router)
 api_router.include_router(testimonials.router)
+api_router.include_router(media.router)
+api_router.include_router(admin.router)
+api_router.include_router(status.router)
+api_router.include_router(home.router)
 
 # Include the router in the main app
 app.include_router(api_router)
 
+# Serve uploaded media and its variants when stored on local disk
+if media_storage.MEDIA_BACKEND == "local":
+    media_storage.MEDIA_ROOT.mkdir(parents=True, exist_ok=True)
+    app.mount(media_storage.MEDIA_BASE_URL, StaticFiles(directory=media_storage.MEDIA_ROOT), name="media")
+
+# Innermost, so shed requests still get CORS headers and show up in metrics
+app.add_middleware(ConcurrencyLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -70,6 +77,14 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(QueryBudgetMiddleware, db=db)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(content=metrics_registry.render(), media_type="text/plain; version=0.0.4")
 
 # Configure logging
 logging.basicConfig(
@@ -78,6 +93,66 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+job_workers = JobWorkerPool(JobQueue(db), concurrency=JOB_WORKERS)
+
+@app.on_event("startup")
+async def create_indexes():
+    await PropertyService(db).ensure_indexes()
+    await ExperienceService(db).ensure_indexes()
+    await TestimonialService(db).ensure_indexes()
+    await BookingInquiryService(db).ensure_indexes()
+    await ContactService(db).ensure_indexes()
+    await IdempotencyStore(db).ensure_indexes()
+    await StatusCheckService(db).ensure_indexes()
+    await PropertyActivityService(db).ensure_indexes()
+    await MediaService(db).ensure_indexes()
+
+@app.on_event("startup")
+async def start_slow_query_profiler():
+    await slow_query_profiler.start(db)
+
+@app.on_event("startup")
+async def start_rate_limit_sync():
+    await rate_limit_sync.start(db)
+
+@app.on_event("startup")
+async def start_write_behind_buffers():
+    await status_check_buffer.start(db)
+    await activity_buffer.start(db)
+
+@app.on_event("startup")
+async def start_status_rollups():
+    await status_rollup_task.start(db)
+
+@app.on_event("startup")
+async def start_popularity_refresh():
+    await popularity_task.start(db)
+
+@app.on_event("startup")
+async def start_media_variant_sync():
+    await media_variant_sync.start(db)
+
+@app.on_event("startup")
+async def start_similarity_index():
+    await similarity_index.start(db)
+
+@app.on_event("startup")
+async def start_job_workers():
+    # JOB_WORKERS=0 leaves job processing to a standalone worker.py process
+    if JOB_WORKERS > 0:
+        await job_workers.start()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await job_workers.stop()
+    await rate_limit_sync.stop()
+    await status_rollup_task.stop()
+    # Flush buffered writes before the client goes away
+    await status_check_buffer.stop()
+    await activity_buffer.stop()
+    await popularity_task.stop()
+    await similarity_index.stop()
+    await media_variant_sync.stop()
+    await slow_query_profiler.stop()
+    media_storage.shutdown_process_pool()
     client.close()
@@ -0,0 +1,33 @@
+import asyncio
+import os
+import signal
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+from pathlib import Path
+from core.jobs import JobQueue, JobWorkerPool, JOB_WORKERS
+import core.job_handlers  # registers job handlers
+
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+async def run_workers():
+    """Process queued jobs until interrupted"""
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    db = client[os.environ['DB_NAME']]
+    pool = JobWorkerPool(JobQueue(db), concurrency=max(JOB_WORKERS, 1))
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await pool.start()
+    print(f'Job workers running ({pool.concurrency}). Press Ctrl+C to stop.')
+    try:
+        await stop.wait()
+    finally:
+        await pool.stop()
+        client.close()
+
+if __name__ == '__main__':
+    asyncio.run(run_workers())
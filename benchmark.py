@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+VattavadaBooking Service Micro-benchmarks
+Times the service-layer hot paths against a local mongod seeded with
+deterministic synthetic data, stores results as a JSON baseline and compares
+runs.
+
+Usage:
+  python benchmark.py run --output benchmarks/baseline.json
+  python benchmark.py run --filter properties --output benchmarks/after.json
+  python benchmark.py compare benchmarks/baseline.json benchmarks/after.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from argparse import Namespace
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ['DB_NAME'] = os.getenv('BENCH_DB_NAME', 'vattavada_bench')
+# Benchmarks must not be skewed by background job processing
+os.environ.setdefault('JOB_WORKERS', '0')
+
+# Relative change in median time that counts as a regression/improvement
+DEFAULT_THRESHOLD = 0.10
+
+BENCH_SIZES = Namespace(properties=2000, experiences=60, testimonials=1000, days=730, skew=1.1)
+
+Benchmark = Callable[[], Awaitable[Any]]
+
+
+async def measure(func: Benchmark, warmup: int, min_rounds: int, min_time: float) -> Dict[str, Any]:
+    """Run func until both min_rounds and min_time are reached; returns timings in ms"""
+    for _ in range(warmup):
+        await func()
+    timings: List[float] = []
+    started = time.perf_counter()
+    while len(timings) < min_rounds or time.perf_counter() - started < min_time:
+        t0 = time.perf_counter()
+        await func()
+        timings.append((time.perf_counter() - t0) * 1000)
+    timings.sort()
+    return {
+        'rounds': len(timings),
+        'min_ms': round(timings[0], 4),
+        'median_ms': round(statistics.median(timings), 4),
+        'mean_ms': round(statistics.fmean(timings), 4),
+        'stdev_ms': round(statistics.stdev(timings), 4) if len(timings) > 1 else 0.0,
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 4),
+        'max_ms': round(timings[-1], 4),
+    }
+
+
+async def seed(db):
+    """Load deterministic synthetic data (same generators as generate_data.py)"""
+    import generate_data
+
+    await db.client.drop_database(db.name)
+    for collection, generator, size in (
+        ('properties', generate_data.gen_properties, BENCH_SIZES.properties),
+        ('experiences', generate_data.gen_experiences, BENCH_SIZES.experiences),
+        ('testimonials', generate_data.gen_testimonials, BENCH_SIZES.testimonials),
+    ):
+        docs = generator(generate_data.batch_rng(7, collection, 0), 0, size, BENCH_SIZES)
+        await db[collection].insert_many(docs, ordered=False)
+
+
+def build_benchmarks(db, app) -> Dict[str, Benchmark]:
+    import httpx
+    from core.cache import catalog_cache
+    from models.Property import Property, PropertyService
+    from models.BookingInquiry import BookingInquiryService, BookingInquiryCreate
+
+    properties = PropertyService(db)
+    inquiries = BookingInquiryService(db)
+    state = {'counter': 0, 'property_id': None, 'docs': None}
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://bench')
+
+    filter_combinations = {
+        'none': None,
+        'type': {'type': 'cottage'},
+        'price': {'min_price': 2000, 'max_price': 5000},
+        'type_price': {'type': 'Resort', 'min_price': 4000, 'max_price': 9000},
+        'capacity': {'capacity': 6},
+        'search': {'search': 'misty'},
+        'all': {'type': 'homestay', 'min_price': 1000, 'max_price': 6000, 'capacity': 4, 'search': 'valley'},
+    }
+
+    async def setup():
+        doc = await db.properties.find_one({'active': True}, {'_id': 1})
+        state['property_id'] = str(doc['_id'])
+        docs = await db.properties.find({'active': True}).to_list(None)
+        for d in docs:
+            d['_id'] = str(d['_id'])
+        state['docs'] = docs
+
+    benchmarks: Dict[str, Benchmark] = {}
+
+    for name, filters in filter_combinations.items():
+        benchmarks[f'properties.get_all_properties[{name}]'] = (
+            lambda filters=filters: properties.get_all_properties(filters)
+        )
+    benchmarks['properties.get_featured_properties'] = properties.get_featured_properties
+    benchmarks['properties.get_property_by_id'] = lambda: properties.get_property_by_id(state['property_id'])
+
+    async def create_inquiry():
+        state['counter'] += 1
+        await inquiries.create_inquiry(BookingInquiryCreate(
+            name='Bench Guest',
+            phone=f'+91-9{state["counter"]:09d}',
+            guests=2,
+            property_id=state['property_id'],
+            check_in_date='2026-12-24T00:00:00Z',
+            check_out_date='2026-12-27T00:00:00Z',
+        ))
+    benchmarks['bookings.create_inquiry'] = create_inquiry
+
+    async def model_conversion():
+        return [Property(**doc) for doc in state['docs']]
+    benchmarks['models.Property(**doc)[active]'] = model_conversion
+
+    async def model_serialization():
+        from core.cache import encode_content
+        return encode_content([Property(**doc) for doc in state['docs']])
+    benchmarks['models.Property.encode[active]'] = model_serialization
+
+    def endpoint(path: str, cached: bool):
+        async def run():
+            if not cached:
+                catalog_cache.invalidate()
+            response = await client.get(path)
+            response.raise_for_status()
+        return run
+
+    for path in ('/api/properties/', '/api/properties/featured', '/api/experiences/', '/api/testimonials/'):
+        benchmarks[f'e2e.GET {path}'] = endpoint(path, cached=False)
+        benchmarks[f'e2e.GET {path} (cached)'] = endpoint(path, cached=True)
+
+    benchmarks['_setup'] = setup
+    benchmarks['_teardown'] = client.aclose
+    return benchmarks
+
+
+async def run_benchmarks(args) -> Dict[str, Any]:
+    from core.database import client, db
+    from server import app
+
+    await seed(db)
+    await app.router.startup()
+    benchmarks = build_benchmarks(db, app)
+    setup, teardown = benchmarks.pop('_setup'), benchmarks.pop('_teardown')
+    results = {}
+    try:
+        await setup()
+        for name, func in benchmarks.items():
+            if args.filter and args.filter not in name:
+                continue
+            results[name] = await measure(func, args.warmup, args.rounds, args.min_time)
+            print(f"{name:<55} median {results[name]['median_ms']:>9.3f} ms  "
+                  f"p95 {results[name]['p95_ms']:>9.3f} ms  ({results[name]['rounds']} rounds)")
+    finally:
+        await teardown()
+        await app.router.shutdown()
+        if not args.keep_db:
+            await client.drop_database(db.name)
+        client.close()
+
+    return {
+        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'git_revision': git_revision(),
+        'python': sys.version.split()[0],
+        'config': {'warmup': args.warmup, 'rounds': args.rounds, 'min_time': args.min_time,
+                   'dataset': vars(BENCH_SIZES)},
+        'benchmarks': results,
+    }
+
+
+def git_revision() -> Optional[str]:
+    import subprocess
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except Exception:
+        return None
+
+
+def compare(baseline_path: str, current_path: str, threshold: float) -> bool:
+    """Print a per-benchmark comparison; returns False when anything regressed"""
+    baseline = json.loads(Path(baseline_path).read_text())['benchmarks']
+    current = json.loads(Path(current_path).read_text())['benchmarks']
+    regressions = 0
+    print(f"{'benchmark':<55} {'baseline':>10} {'current':>10} {'change':>9}")
+    for name in sorted(set(baseline) | set(current)):
+        if name not in baseline or name not in current:
+            print(f"{name:<55} {'-' if name not in baseline else baseline[name]['median_ms']:>10} "
+                  f"{'-' if name not in current else current[name]['median_ms']:>10}")
+            continue
+        before, after = baseline[name]['median_ms'], current[name]['median_ms']
+        change = (after - before) / before if before else 0.0
+        marker = ''
+        if change > threshold:
+            marker = '❌ slower'
+            regressions += 1
+        elif change < -threshold:
+            marker = '✅ faster'
+        print(f"{name:<55} {before:>10.3f} {after:>10.3f} {change:>+8.1%} {marker}")
+    print(f"\n{regressions} regression(s) beyond ±{threshold:.0%}")
+    return regressions == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Service-layer micro-benchmarks')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help='Run benchmarks and write a JSON result')
+    run.add_argument('--output', help='Where to write results (e.g. benchmarks/baseline.json)')
+    run.add_argument('--filter', help='Only run benchmarks whose name contains this')
+    run.add_argument('--warmup', type=int, default=5)
+    run.add_argument('--rounds', type=int, default=30, help='Minimum measured rounds')
+    run.add_argument('--min-time', type=float, default=1.0, help='Minimum seconds per benchmark')
+    run.add_argument('--keep-db', action='store_true', help='Keep the benchmark database afterwards')
+
+    cmp = sub.add_parser('compare', help='Compare two result files')
+    cmp.add_argument('baseline')
+    cmp.add_argument('current')
+    cmp.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+
+    args = parser.parse_args()
+    if args.command == 'compare':
+        sys.exit(0 if compare(args.baseline, args.current, args.threshold) else 1)
+
+    report = asyncio.run(run_benchmarks(args))
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"📄 Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
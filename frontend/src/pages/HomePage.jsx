@@ -25,7 +25,7 @@ import {
   Coffee,
   Campfire
 } from 'lucide-react';
-import { propertyService } from '../services/api';
+import { homeService } from '../services/api';
 import { mockTestimonials } from '../mock';
 import { format } from 'date-fns';
 import { toast } from 'sonner';
@@ -37,24 +37,31 @@ export const HomePage = () => {
   const [checkOutDate, setCheckOutDate] = useState();
   const [guests, setGuests] = useState(2);
   const [featuredProperties, setFeaturedProperties] = useState([]);
+  const [experiences, setExperiences] = useState([]);
+  const [testimonials, setTestimonials] = useState(mockTestimonials);
   const [loading, setLoading] = useState(true);
 
   // Fetch featured properties on component mount
   useEffect(() => {
-    const fetchFeaturedProperties = async () => {
+    // One round-trip for everything above the fold
+    const fetchHome = async () => {
       try {
         setLoading(true);
-        const properties = await propertyService.getFeatured();
-        setFeaturedProperties(properties);
+        const home = await homeService.get();
+        setFeaturedProperties(home.featured_properties);
+        setExperiences(home.experiences);
+        if (home.testimonials.length > 0) {
+          setTestimonials(home.testimonials);
+        }
       } catch (error) {
-        console.error('Error fetching featured properties:', error);
+        console.error('Error fetching home page:', error);
         toast.error('Failed to load featured properties');
       } finally {
         setLoading(false);
       }
     };
 
-    fetchFeaturedProperties();
+    fetchHome();
   }, []);
 
   const handleSearch = () => {
@@ -240,7 +247,10 @@ export const HomePage = () => {
                 }`}>
                   <div className="relative overflow-hidden rounded-t-lg">
                     <img
-                      src={property.image}
+                      src={property.image_set?.thumbnail || property.image}
+                      srcSet={property.image_set?.srcset?.webp}
+                      sizes={property.image_set?.sizes}
+                      loading="lazy"
                       alt={property.title}
                       className="w-full h-64 object-cover group-hover:scale-105 transition-transform duration-300"
                     />
@@ -342,6 +352,73 @@ export const HomePage = () => {
         </div>
       </section>
 
+      {/* Local Experiences */}
+      {experiences.length > 0 && (
+        <section className={`py-16 transition-colors duration-200 ${
+          isDarkMode ? 'bg-gray-900' : 'bg-white'
+        }`}>
+          <div className="container mx-auto px-4">
+            <div className="text-center mb-12">
+              <h2 className={`text-3xl md:text-4xl font-bold mb-4 transition-colors duration-200 ${
+                isDarkMode ? 'text-green-400' : 'text-green-800'
+              }`}>
+                Local Experiences
+              </h2>
+              <p className={`max-w-2xl mx-auto transition-colors duration-200 ${
+                isDarkMode ? 'text-green-300' : 'text-green-600'
+              }`}>
+                Guided treks, farm visits and campfires to round out your stay
+              </p>
+            </div>
+
+            <div className="grid grid-cols-1 md:grid-cols-3 gap-8">
+              {experiences.map((experience) => (
+                <Card key={experience._id || experience.id} className={`group hover:shadow-xl transition-all duration-300 ${
+                  isDarkMode ? 'border-gray-700 bg-gray-800' : 'border-green-100 bg-white'
+                }`}>
+                  <div className="relative overflow-hidden rounded-t-lg">
+                    <img
+                      src={experience.image_set?.thumbnail || experience.image}
+                      srcSet={experience.image_set?.srcset?.webp}
+                      sizes={experience.image_set?.sizes}
+                      loading="lazy"
+                      alt={experience.title}
+                      className="w-full h-48 object-cover group-hover:scale-105 transition-transform duration-300"
+                    />
+                  </div>
+                  <CardHeader className="pb-3">
+                    <CardTitle className={`text-xl transition-colors ${
+                      isDarkMode ? 'text-green-400' : 'text-green-800'
+                    }`}>
+                      {experience.title}
+                    </CardTitle>
+                    <CardDescription className={`flex items-center justify-between ${
+                      isDarkMode ? 'text-green-300' : 'text-green-600'
+                    }`}>
+                      <span>{experience.duration}</span>
+                      <span className="font-semibold">₹{experience.price.toLocaleString()}</span>
+                    </CardDescription>
+                  </CardHeader>
+                </Card>
+              ))}
+            </div>
+
+            <div className="text-center mt-12">
+              <Link to="/experiences">
+                <Button size="lg" variant="outline" className={`transition-colors duration-200 ${
+                  isDarkMode
+                    ? 'border-green-500 text-green-400 hover:bg-gray-800'
+                    : 'border-green-600 text-green-600 hover:bg-green-50'
+                }`}>
+                  View All Experiences
+                  <ChevronRight className="h-5 w-5 ml-2" />
+                </Button>
+              </Link>
+            </div>
+          </div>
+        </section>
+      )}
+
       {/* Why Book With Us */}
       <section className={`py-16 transition-colors duration-200 ${
         isDarkMode ? 'bg-gray-800' : 'bg-green-50'
@@ -431,8 +508,8 @@ export const HomePage = () => {
           </div>
           
           <div className="grid grid-cols-1 md:grid-cols-3 gap-8">
-            {mockTestimonials.map((testimonial) => (
-              <Card key={testimonial.id} className={`hover:shadow-lg transition-all duration-200 ${
+            {testimonials.map((testimonial) => (
+              <Card key={testimonial._id || testimonial.id} className={`hover:shadow-lg transition-all duration-200 ${
                 isDarkMode ? 'bg-gray-800 border-gray-700' : 'border-green-100'
               }`}>
                 <CardContent className="p-6">
@@ -446,7 +523,7 @@ export const HomePage = () => {
                   }`}>"{testimonial.text}"</p>
                   <div className="flex items-center space-x-3">
                     <img
-                      src={testimonial.image}
+                      src={testimonial.image_set?.thumbnail || testimonial.image}
                       alt={testimonial.name}
                       className="w-10 h-10 rounded-full object-cover"
                     />
@@ -334,7 +334,10 @@ export const PropertiesPage = () => {
                   }`}>
                     <div className="relative overflow-hidden rounded-t-lg">
                       <img
-                        src={property.image}
+                        src={property.image_set?.thumbnail || property.image}
+                        srcSet={property.image_set?.srcset?.webp}
+                        sizes={property.image_set?.sizes}
+                        loading="lazy"
                         alt={property.title}
                         className="w-full h-48 object-cover group-hover:scale-105 transition-transform duration-300"
                       />
@@ -36,6 +36,9 @@ export const PropertyDetailsPage = () => {
   const { isDarkMode } = useTheme();
   const { id } = useParams();
   const [property, setProperty] = useState(null);
+  const [similarProperties, setSimilarProperties] = useState([]);
+  const [experiences, setExperiences] = useState([]);
+  const [testimonials, setTestimonials] = useState([]);
   const [loading, setLoading] = useState(true);
   const [selectedImage, setSelectedImage] = useState(0);
   const [checkInDate, setCheckInDate] = useState();
@@ -54,8 +57,12 @@ export const PropertyDetailsPage = () => {
     const fetchProperty = async () => {
       try {
         setLoading(true);
-        const data = await propertyService.getById(id);
-        setProperty(data);
+        // The property and everything shown around it arrive together
+        const data = await propertyService.getFull(id);
+        setProperty(data.property);
+        setSimilarProperties(data.similar_properties);
+        setExperiences(data.experiences);
+        setTestimonials(data.testimonials);
       } catch (error) {
         console.error('Error fetching property:', error);
         toast.error('Failed to load property details.');
@@ -339,6 +346,105 @@ export const PropertyDetailsPage = () => {
                 ))}
               </div>
             </div>
+
+            {/* Experiences */}
+            {experiences.length > 0 && (
+              <div className="mb-8">
+                <h2 className={`text-2xl font-bold mb-4 transition-colors duration-200 ${
+                  isDarkMode ? 'text-green-400' : 'text-green-800'
+                }`}>Experiences Nearby</h2>
+                <div className="space-y-3">
+                  {experiences.map((experience) => (
+                    <Link key={experience._id || experience.id} to="/experiences" className={`flex items-center space-x-4 p-3 rounded-lg transition-colors duration-200 ${
+                      isDarkMode ? 'bg-gray-800 hover:bg-gray-700' : 'bg-green-50 hover:bg-green-100'
+                    }`}>
+                      <img
+                        src={experience.image_set?.thumbnail || experience.image}
+                        loading="lazy"
+                        alt={experience.title}
+                        className="w-16 h-16 rounded-lg object-cover"
+                      />
+                      <div className="flex-1">
+                        <p className={`font-medium transition-colors duration-200 ${
+                          isDarkMode ? 'text-gray-200' : 'text-green-800'
+                        }`}>{experience.title}</p>
+                        <p className={`text-sm transition-colors duration-200 ${
+                          isDarkMode ? 'text-gray-400' : 'text-green-600'
+                        }`}>{experience.duration} · ₹{experience.price.toLocaleString()}</p>
+                      </div>
+                    </Link>
+                  ))}
+                </div>
+              </div>
+            )}
+
+            {/* Guest Reviews */}
+            {testimonials.length > 0 && (
+              <div className="mb-8">
+                <h2 className={`text-2xl font-bold mb-4 transition-colors duration-200 ${
+                  isDarkMode ? 'text-green-400' : 'text-green-800'
+                }`}>What Guests Say</h2>
+                <div className="space-y-4">
+                  {testimonials.map((testimonial) => (
+                    <div key={testimonial._id || testimonial.id} className={`p-4 rounded-lg transition-colors duration-200 ${
+                      isDarkMode ? 'bg-gray-800' : 'bg-green-50'
+                    }`}>
+                      <div className="flex items-center space-x-1 mb-2">
+                        {[...Array(testimonial.rating)].map((_, i) => (
+                          <Star key={i} className="h-4 w-4 fill-yellow-400 text-yellow-400" />
+                        ))}
+                      </div>
+                      <p className={`italic mb-2 transition-colors duration-200 ${
+                        isDarkMode ? 'text-gray-200' : 'text-green-800'
+                      }`}>"{testimonial.text}"</p>
+                      <p className={`text-sm transition-colors duration-200 ${
+                        isDarkMode ? 'text-gray-400' : 'text-green-600'
+                      }`}>{testimonial.name}, {testimonial.location}</p>
+                    </div>
+                  ))}
+                </div>
+              </div>
+            )}
+
+            {/* Similar Properties */}
+            {similarProperties.length > 0 && (
+              <div className="mb-8">
+                <h2 className={`text-2xl font-bold mb-4 transition-colors duration-200 ${
+                  isDarkMode ? 'text-green-400' : 'text-green-800'
+                }`}>You May Also Like</h2>
+                <div className="grid grid-cols-1 sm:grid-cols-3 gap-4">
+                  {similarProperties.map((similar) => (
+                    <Link key={similar._id || similar.id} to={`/property/${similar._id || similar.id}`}>
+                      <Card className={`group h-full hover:shadow-lg transition-all duration-300 ${
+                        isDarkMode ? 'bg-gray-800 border-gray-700' : 'border-green-100'
+                      }`}>
+                        <div className="relative overflow-hidden rounded-t-lg">
+                          <img
+                            src={similar.image_set?.thumbnail || similar.image}
+                            srcSet={similar.image_set?.srcset?.webp}
+                            sizes={similar.image_set?.sizes}
+                            loading="lazy"
+                            alt={similar.title}
+                            className="w-full h-32 object-cover group-hover:scale-105 transition-transform duration-300"
+                          />
+                          <Badge className="absolute top-2 left-2 bg-green-600 text-white">
+                            {similar.type}
+                          </Badge>
+                        </div>
+                        <CardContent className="p-3">
+                          <p className={`font-semibold truncate transition-colors duration-200 ${
+                            isDarkMode ? 'text-green-400' : 'text-green-800'
+                          }`}>{similar.title}</p>
+                          <p className={`text-sm transition-colors duration-200 ${
+                            isDarkMode ? 'text-gray-300' : 'text-gray-600'
+                          }`}>₹{similar.price.toLocaleString()}/night</p>
+                        </CardContent>
+                      </Card>
+                    </Link>
+                  ))}
+                </div>
+              </div>
+            )}
           </div>
 
           {/* Booking Sidebar */}
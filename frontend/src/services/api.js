@@ -59,6 +59,16 @@ export const propertyService = {
     return await apiRequest(`/properties/${id}`);
   },
 
+  // Get a property with similar listings, experiences and testimonials in one request
+  getFull: async (id) => {
+    return await apiRequest(`/properties/${id}/full`);
+  },
+
+  // Get properties similar to this one
+  getSimilar: async (id, limit = 3) => {
+    return await apiRequest(`/properties/${id}/similar?limit=${limit}`);
+  },
+
   // Get featured properties
   getFeatured: async () => {
     return await apiRequest('/properties/featured');
@@ -157,6 +167,17 @@ export const testimonialService = {
   }
 };
 
+// Home page bundle
+export const homeService = {
+  // Featured properties, experiences and testimonials in one request
+  get: async (limits = {}) => {
+    const params = new URLSearchParams();
+    Object.entries(limits).forEach(([section, limit]) => params.append(section, limit));
+    const query = params.toString();
+    return await apiRequest(`/home${query ? `?${query}` : ''}`);
+  }
+};
+
 // WhatsApp integration
 export const whatsappService = {
   // Generate WhatsApp URL for booking inquiry
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+VattavadaBooking Load Test Harness
+Replays a realistic traffic mix against the API (in-process, a local uvicorn,
+or any base URL) and reports throughput and p50/p95/p99 latency per endpoint
+as JSON so runs can be compared over time.
+
+Usage:
+  python load_test.py --mode inprocess --rate 50 --duration 30
+  python load_test.py --mode uvicorn --rate 200 --output results/run.json
+  python load_test.py --base-url http://localhost:8001 --rate 100
+
+Inquiries come from simulated visitors, each with its own email, phone and
+X-Forwarded-For address, so the per-visitor rate limits do not turn the write
+path into 429s. The inprocess and uvicorn modes start the API with
+TRUSTED_PROXIES=1 so it uses that address; run a --base-url target the same
+way (local runs only), or expect inquiry_submit to report mostly 429s.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = Path(__file__).parent / 'backend'
+
+SEARCH_TERMS = ['mountain', 'cottage', 'tent', 'munnar', 'farm', 'view', 'village']
+PROPERTY_TYPES = ['cottage', 'resort', 'homestay', 'tent', 'farmstay']
+# Lets the API see each simulated visitor's X-Forwarded-For address as the client address
+LOAD_TEST_ENV = {'TRUSTED_PROXIES': '1'}
+
+# Endpoint name -> relative weight in the traffic mix
+DEFAULT_MIX = {
+    'browse': 30,
+    'featured': 15,
+    'experiences': 8,
+    'testimonials': 7,
+    'search': 15,
+    'detail': 18,
+    'inquiry_submit': 4,
+    'admin_triage': 3,
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class LoadTester:
+    def __init__(self, client: httpx.AsyncClient, rate: float, duration: float,
+                 concurrency: int, mix: Dict[str, int], seed: int):
+        self.client = client
+        self.rate = rate
+        self.duration = duration
+        self.concurrency = concurrency
+        self.mix = mix
+        self.rng = random.Random(seed)
+        self.property_ids: List[str] = []
+        self.inquiry_ids: List[str] = []
+        self.latencies: Dict[str, List[float]] = {name: [] for name in mix}
+        self.errors: Dict[str, Dict[str, int]] = {name: {} for name in mix}
+        self.dropped = 0
+
+    async def prime(self):
+        """Learn real ids so detail and triage requests hit existing documents"""
+        response = await self.client.get('/api/properties/')
+        response.raise_for_status()
+        self.property_ids = [p.get('_id') or p.get('id') for p in response.json()]
+        response = await self.client.get('/api/bookings/inquiries', params={'limit': 50})
+        if response.status_code == 200:
+            self.inquiry_ids = [i.get('_id') or i.get('id') for i in response.json()]
+        print(f"🔍 Primed with {len(self.property_ids)} properties, {len(self.inquiry_ids)} inquiries")
+
+    # Traffic scenarios
+
+    async def browse(self):
+        return await self.client.get('/api/properties/')
+
+    async def featured(self):
+        return await self.client.get('/api/properties/featured')
+
+    async def experiences(self):
+        return await self.client.get('/api/experiences/')
+
+    async def testimonials(self):
+        return await self.client.get('/api/testimonials/')
+
+    async def search(self):
+        params = self.rng.choice([
+            {'search': self.rng.choice(SEARCH_TERMS)},
+            {'type': self.rng.choice(PROPERTY_TYPES)},
+            {'min_price': 2000, 'max_price': self.rng.choice([4000, 6000, 10000])},
+            {'capacity': self.rng.randint(2, 8)},
+        ])
+        return await self.client.get('/api/properties/', params=params)
+
+    async def detail(self):
+        if not self.property_ids:
+            return await self.browse()
+        return await self.client.get(f"/api/properties/{self.rng.choice(self.property_ids)}")
+
+    async def inquiry_submit(self):
+        check_in = datetime.utcnow() + timedelta(days=self.rng.randint(3, 120))
+        # A fresh visitor per inquiry keeps the per-email, per-phone and per-IP limits out of the way
+        visitor = self.rng.randint(1, 10**9)
+        payload = {
+            'name': f'Load Test {visitor}',
+            'phone': f'+91-9{self.rng.randint(100000000, 999999999)}',
+            'email': f'loadtest{visitor}@example.com',
+            'guests': self.rng.randint(1, 8),
+            'message': 'Load test inquiry',
+            'property_id': self.rng.choice(self.property_ids) if self.property_ids else None,
+            'check_in_date': check_in.isoformat() + 'Z',
+            'check_out_date': (check_in + timedelta(days=self.rng.randint(1, 5))).isoformat() + 'Z',
+        }
+        ip = '10.{}.{}.{}'.format(*(self.rng.randint(0, 255) for _ in range(3)))
+        return await self.client.post('/api/bookings/inquiry', json=payload, headers={'X-Forwarded-For': ip})
+
+    async def admin_triage(self):
+        if self.inquiry_ids and self.rng.random() < 0.3:
+            return await self.client.put(
+                f"/api/bookings/inquiries/{self.rng.choice(self.inquiry_ids)}/status",
+                params={'status': self.rng.choice(['contacted', 'confirmed'])},
+            )
+        return await self.client.get('/api/bookings/inquiries', params={'limit': 100})
+
+    async def execute(self, name: str, semaphore: asyncio.Semaphore):
+        try:
+            start = time.perf_counter()
+            try:
+                response = await getattr(self, name)()
+                outcome = None if response.status_code < 400 else str(response.status_code)
+            except httpx.HTTPError as e:
+                outcome = type(e).__name__
+            elapsed = time.perf_counter() - start
+            if outcome is None:
+                self.latencies[name].append(elapsed)
+            else:
+                self.errors[name][outcome] = self.errors[name].get(outcome, 0) + 1
+        finally:
+            semaphore.release()
+
+    async def run(self) -> Dict[str, Any]:
+        """Open-loop run: Poisson arrivals at the target rate, bounded by concurrency"""
+        names = list(self.mix)
+        weights = [self.mix[n] for n in names]
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+
+        print(f"🚀 {self.rate} req/s for {self.duration}s (max {self.concurrency} in flight)")
+        started = time.perf_counter()
+        next_at = started
+        while next_at - started < self.duration:
+            await asyncio.sleep(max(0, next_at - time.perf_counter()))
+            next_at += self.rng.expovariate(self.rate)
+            if semaphore.locked():
+                # Client is saturated; count it instead of silently queueing
+                self.dropped += 1
+                continue
+            await semaphore.acquire()
+            task = asyncio.create_task(self.execute(self.rng.choices(names, weights)[0], semaphore))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+        return self.report(time.perf_counter() - started)
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        endpoints = {}
+        all_latencies = []
+        for name in self.mix:
+            values = sorted(self.latencies[name])
+            all_latencies.extend(values)
+            endpoints[name] = self.summarize(values, self.errors[name], elapsed)
+        all_errors = {}
+        for errors in self.errors.values():
+            for key, count in errors.items():
+                all_errors[key] = all_errors.get(key, 0) + count
+        return {
+            'elapsed_s': round(elapsed, 3),
+            'dropped': self.dropped,
+            'total': self.summarize(sorted(all_latencies), all_errors, elapsed),
+            'endpoints': endpoints,
+        }
+
+    @staticmethod
+    def summarize(values: List[float], errors: Dict[str, int], elapsed: float) -> Dict[str, Any]:
+        def ms(value):
+            return None if value is None else round(value * 1000, 3)
+
+        return {
+            'requests': len(values),
+            'errors': errors,
+            'throughput_rps': round(len(values) / elapsed, 2) if elapsed else 0,
+            'p50_ms': ms(percentile(values, 50)),
+            'p95_ms': ms(percentile(values, 95)),
+            'p99_ms': ms(percentile(values, 99)),
+            'max_ms': ms(values[-1] if values else None),
+        }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get('/api/')).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError(f"API at {base_url} did not become ready")
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except Exception:
+        return None
+
+
+async def run_load_test(args) -> Dict[str, Any]:
+    mix = dict(DEFAULT_MIX)
+    for item in args.mix or []:
+        name, _, weight = item.partition('=')
+        if name not in DEFAULT_MIX:
+            raise SystemExit(f"Unknown scenario {name}; choose from {', '.join(DEFAULT_MIX)}")
+        mix[name] = int(weight)
+    mix = {name: weight for name, weight in mix.items() if weight > 0}
+
+    server = None
+    app = None
+    if args.base_url:
+        base_url = args.base_url
+        transport = None
+    elif args.mode == 'uvicorn':
+        port = free_port()
+        base_url = f'http://127.0.0.1:{port}'
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'server:app', '--port', str(port),
+             '--workers', str(args.workers), '--log-level', 'warning'],
+            cwd=BACKEND_DIR,
+            env={**os.environ, **LOAD_TEST_ENV},
+        )
+        transport = None
+    else:
+        sys.path.insert(0, str(BACKEND_DIR))
+        # Settings are read at import time
+        os.environ.update(LOAD_TEST_ENV)
+        from server import app
+        base_url = 'http://loadtest'
+        transport = httpx.ASGITransport(app=app)
+
+    try:
+        if app is not None:
+            await app.router.startup()
+        elif server is not None:
+            await wait_until_ready(base_url)
+
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, transport=transport, limits=limits,
+                                     timeout=args.timeout) as client:
+            tester = LoadTester(client, args.rate, args.duration, args.concurrency, mix, args.seed)
+            await tester.prime()
+            if args.warmup:
+                warmup = LoadTester(client, args.rate, args.warmup, args.concurrency, mix, args.seed + 1)
+                warmup.property_ids, warmup.inquiry_ids = tester.property_ids, tester.inquiry_ids
+                await warmup.run()
+            results = await tester.run()
+    finally:
+        if app is not None:
+            await app.router.shutdown()
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    return {
+        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'git_revision': git_revision(),
+        'config': {
+            'mode': 'remote' if args.base_url else args.mode,
+            'base_url': args.base_url,
+            'rate': args.rate,
+            'duration': args.duration,
+            'concurrency': args.concurrency,
+            'seed': args.seed,
+            'mix': mix,
+        },
+        'results': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the VattavadaBooking API')
+    parser.add_argument('--mode', choices=['inprocess', 'uvicorn'], default='inprocess')
+    parser.add_argument('--base-url', help='Target an already running API instead of booting one')
+    parser.add_argument('--workers', type=int, default=1, help='uvicorn workers in uvicorn mode')
+    parser.add_argument('--rate', type=float, default=50, help='Target requests per second')
+    parser.add_argument('--duration', type=float, default=30, help='Measured seconds')
+    parser.add_argument('--warmup', type=float, default=5, help='Unmeasured warmup seconds')
+    parser.add_argument('--concurrency', type=int, default=100, help='Max requests in flight')
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--mix', action='append', metavar='NAME=WEIGHT', help='Override a scenario weight')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load_test(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(output)
+        print(f"📄 Report written to {args.output}")
+    print(output)
+
+    total = report['results']['total']
+    print(f"\n✅ {total['requests']} ok, {sum(total['errors'].values())} errors, "
+          f"p50 {total['p50_ms']}ms p95 {total['p95_ms']}ms p99 {total['p99_ms']}ms")
+
+
+if __name__ == '__main__':
+    main()
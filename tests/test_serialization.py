@@ -0,0 +1,138 @@
+"""Golden tests: FastJSONResponse must render exactly the bytes JSONResponse did"""
+import sys
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from core.cache import encode_content  # noqa: E402
+from core.serialization import FastJSONResponse, MongoModel, dumps  # noqa: E402
+from models.Property import Property  # noqa: E402
+from models.Testimonial import Testimonial as TestimonialModel  # noqa: E402
+
+
+class Quote(MongoModel):
+    id: ObjectId
+    amount: Decimal
+    discount: Optional[Decimal] = None
+    issued_at: datetime
+    note: Optional[str] = None
+
+    model_config = {**MongoModel.model_config, "arbitrary_types_allowed": True}
+
+
+PROPERTIES = [
+    Property(
+        _id=str(ObjectId("64b7f0c2a1b2c3d4e5f60718")),
+        title="Tea Garden Cottage – Vattavada",
+        type="Cottage",
+        price=4500,
+        capacity="4 guests",
+        rating=4.8,
+        image="https://images.example.com/cottage.jpg",
+        gallery=["https://images.example.com/cottage-2.jpg"],
+        description="Misty mornings, ☕ fresh tea and views of the Western Ghats. Café: «ഇവിടെ».",
+        location="Vattavada, Kerala",
+        amenities=["WiFi", "Bonfire"],
+        created_at=datetime(2024, 3, 1, 9, 30, 15, 123456),
+        updated_at=datetime(2024, 3, 2),
+    ),
+    Property(
+        _id=str(ObjectId("64b7f0c2a1b2c3d4e5f60719")),
+        title="Riverside Tent",
+        type="Tent",
+        price=1800,
+        capacity="2 guests",
+        image="/media/tent.jpg",
+        description="No frills",
+        location="Kovilur",
+        created_at=datetime(2023, 12, 31, 23, 59, 59),
+        updated_at=datetime(2023, 12, 31, 23, 59, 59),
+    ),
+]
+
+TESTIMONIAL = TestimonialModel(
+    _id=str(ObjectId("64b7f0c2a1b2c3d4e5f6071a")),
+    name="Ananya & Kiran",
+    location="Kochi",
+    rating=5,
+    text="Beautiful — \"perfect\" stay\nwith a new line",
+    image=None,
+    approved=True,
+    created_at=datetime(2024, 1, 5, 7, 0),
+)
+
+QUOTES = [
+    Quote(id=ObjectId("64b7f0c2a1b2c3d4e5f6071b"), amount=Decimal("4500"), discount=Decimal("12.50"),
+          issued_at=datetime(2024, 5, 6, 7, 8, 9, 10), note="Réduction"),
+    Quote(id=ObjectId("64b7f0c2a1b2c3d4e5f6071c"), amount=Decimal("1E+3"), issued_at=datetime(2024, 1, 1)),
+]
+
+
+def expected(content):
+    """What the stock JSONResponse rendered after FastAPI's jsonable_encoder"""
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def make_app(response_class):
+    app = FastAPI(default_response_class=response_class)
+
+    @app.get("/properties", response_model=List[Property])
+    async def properties():
+        return PROPERTIES
+
+    @app.get("/properties/detail", response_model=Property)
+    async def detail():
+        return PROPERTIES[0]
+
+    @app.get("/testimonials/detail", response_model=TestimonialModel)
+    async def testimonial():
+        return TESTIMONIAL
+
+    return app
+
+
+@pytest.mark.parametrize("path", ["/properties", "/properties/detail", "/testimonials/detail"])
+def test_routes_render_identically(path):
+    stock = TestClient(make_app(JSONResponse)).get(path)
+    fast = TestClient(make_app(FastJSONResponse)).get(path)
+    assert fast.status_code == stock.status_code == 200
+    assert fast.content == stock.content
+
+
+@pytest.mark.parametrize("content", [PROPERTIES, PROPERTIES[0], [TESTIMONIAL], TESTIMONIAL])
+def test_cached_responses_match_stock_encoding(content):
+    # Catalog routes serve bytes from encode_content rather than going through response_model
+    assert encode_content(content) == expected(content)
+
+
+def test_encoders_for_raw_documents():
+    document = {
+        "_id": ObjectId("64b7f0c2a1b2c3d4e5f6071d"),
+        "created_at": datetime(2024, 2, 29, 12, 0, 0, 500),
+        "price": Decimal("4500"),
+        "rating": Decimal("4.75"),
+        "note": None,
+        "title": "ചായ Cottage",
+    }
+    assert FastJSONResponse(document).body == JSONResponse(
+        jsonable_encoder(document, custom_encoder={ObjectId: str})).body
+
+
+def test_decimal_models():
+    for quote in QUOTES:
+        assert dumps(quote.model_dump(mode="json")) == expected(quote)
+    assert dumps([q.model_dump(mode="json") for q in QUOTES]) == expected(QUOTES)
+
+
+def test_non_ascii_is_not_escaped():
+    assert dumps({"text": "ഇവിടെ ☕"}) == "{\"text\":\"ഇവിടെ ☕\"}".encode()